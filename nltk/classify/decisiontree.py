@@ -14,6 +14,7 @@ from __future__ import print_function, unicode_literals, division
 
 from collections import defaultdict
 
+from nltk.internals import process_imap
 from nltk.probability import FreqDist, MLEProbDist, entropy
 from nltk.classify.api import ClassifierI
 from nltk.compat import python_2_unicode_compatible
@@ -129,19 +130,17 @@ class DecisionTreeClassifier(ClassifierI):
     @staticmethod
     def train(labeled_featuresets, entropy_cutoff=0.05, depth_cutoff=100,
               support_cutoff=10, binary=False, feature_values=None,
-              verbose=False):
+              verbose=False, workers=1):
         """
         :param binary: If true, then treat all feature/value pairs as
             individual binary features, rather than using a single n-way
             branch for each feature.
+        :param workers: If greater than 1, then train subtrees in a pool
+            of this many worker processes.  The top of the tree is grown
+            in this process, until there are enough subtrees left to
+            keep the workers busy.
         """
-        # Collect a list of all feature names.
-        feature_names = set()
-        for featureset, label in labeled_featuresets:
-            for fname in featureset:
-                feature_names.add(fname)
-
-        # Collect a list of the values each feature can take.
+        # Collect the values each feature can take.
         if feature_values is None and binary:
             feature_values = defaultdict(set)
             for featureset, label in labeled_featuresets:
@@ -149,20 +148,36 @@ class DecisionTreeClassifier(ClassifierI):
                     feature_values[fname].add(fval)
 
         # Start with a stump.
-        if not binary:
-            tree = DecisionTreeClassifier.best_stump(
-                feature_names, labeled_featuresets, verbose)
-        else:
-            tree = DecisionTreeClassifier.best_binary_stump(
-                feature_names, labeled_featuresets, feature_values, verbose)
+        tree = DecisionTreeClassifier._train_stump(
+            labeled_featuresets, binary, feature_values, verbose)
 
         # Refine the stump.
-        tree.refine(labeled_featuresets, entropy_cutoff, depth_cutoff-1,
-                    support_cutoff, binary, feature_values, verbose)
+        if workers > 1:
+            _refine_parallel(tree, labeled_featuresets, entropy_cutoff,
+                             depth_cutoff-1, support_cutoff, binary,
+                             feature_values, verbose, workers)
+        else:
+            tree.refine(labeled_featuresets, entropy_cutoff, depth_cutoff-1,
+                        support_cutoff, binary, feature_values, verbose)
 
         # Return it
         return tree
 
+    @staticmethod
+    def _train_stump(labeled_featuresets, binary, feature_values, verbose):
+        # Collect a list of all feature names.
+        feature_names = set()
+        for featureset, label in labeled_featuresets:
+            for fname in featureset:
+                feature_names.add(fname)
+
+        if not binary:
+            return DecisionTreeClassifier.best_stump(
+                feature_names, labeled_featuresets, verbose)
+        else:
+            return DecisionTreeClassifier.best_binary_stump(
+                feature_names, labeled_featuresets, feature_values, verbose)
+
     @staticmethod
     def leaf(labeled_featuresets):
         label = FreqDist(label for (featureset, label)
@@ -187,42 +202,74 @@ class DecisionTreeClassifier(ClassifierI):
     def refine(self, labeled_featuresets, entropy_cutoff, depth_cutoff,
                support_cutoff, binary=False, feature_values=None,
                verbose=False):
+        for fval, subtree_featuresets in self._subtrees(
+                labeled_featuresets, entropy_cutoff, depth_cutoff,
+                support_cutoff):
+            self._set_subtree(fval, DecisionTreeClassifier.train(
+                subtree_featuresets, entropy_cutoff, depth_cutoff,
+                support_cutoff, binary, feature_values, verbose))
+
+    def _subtrees(self, labeled_featuresets, entropy_cutoff, depth_cutoff,
+                  support_cutoff):
+        """
+        Generate a ``(fval, featuresets)`` pair for each child of this
+        stump that ``refine()`` should replace with a decision tree
+        trained on ``featuresets``, where ``fval`` is ``_DEFAULT`` for
+        the default child.
+        """
         if len(labeled_featuresets) <= support_cutoff: return
         if self._fname is None: return
         if depth_cutoff <= 0: return
-        for fval in self._decisions:
-            fval_featuresets = [(featureset, label) for (featureset, label)
-                                in labeled_featuresets
-                                if featureset.get(self._fname) == fval]
 
+        # Split the featuresets between the children in a single pass.
+        fval_featuresets = dict((fval, []) for fval in self._decisions)
+        default_featuresets = []
+        for featureset, label in labeled_featuresets:
+            fval = featureset.get(self._fname)
+            if fval in fval_featuresets:
+                fval_featuresets[fval].append((featureset, label))
+            else:
+                default_featuresets.append((featureset, label))
+
+        for fval in self._decisions:
             label_freqs = FreqDist(label for (featureset, label)
-                                   in fval_featuresets)
+                                   in fval_featuresets[fval])
             if entropy(MLEProbDist(label_freqs)) > entropy_cutoff:
-                self._decisions[fval] = DecisionTreeClassifier.train(
-                    fval_featuresets, entropy_cutoff, depth_cutoff,
-                    support_cutoff, binary, feature_values, verbose)
+                yield fval, fval_featuresets[fval]
         if self._default is not None:
-            default_featuresets = [(featureset, label) for (featureset, label)
-                                   in labeled_featuresets
-                                   if featureset.get(self._fname) not in
-                                   self._decisions]
             label_freqs = FreqDist(label for (featureset, label)
                                    in default_featuresets)
             if entropy(MLEProbDist(label_freqs)) > entropy_cutoff:
-                self._default = DecisionTreeClassifier.train(
-                    default_featuresets, entropy_cutoff, depth_cutoff,
-                    support_cutoff, binary, feature_values, verbose)
+                yield _DEFAULT, default_featuresets
+
+    def _set_subtree(self, fval, tree):
+        if fval is _DEFAULT:
+            self._default = tree
+        else:
+            self._decisions[fval] = tree
 
     @staticmethod
     def best_stump(feature_names, labeled_featuresets, verbose=False):
-        best_stump = DecisionTreeClassifier.leaf(labeled_featuresets)
-        best_error = best_stump.error(labeled_featuresets)
+        # Score each stump by its number of errors, counted from the
+        # contingency tables rather than by classifying the featuresets.
+        label_freqs, value_freqs = _contingency_tables(labeled_featuresets)
+        best_fname = None
+        best_errors = len(labeled_featuresets) - max(label_freqs.values())
         for fname in feature_names:
-            stump = DecisionTreeClassifier.stump(fname, labeled_featuresets)
-            stump_error = stump.error(labeled_featuresets)
-            if stump_error < best_error:
-                best_error = stump_error
-                best_stump = stump
+            freqs = value_freqs.get(fname, {})
+            correct = max(_unset_freqs(label_freqs, freqs).values() or [0])
+            for fval_freqs in freqs.values():
+                correct += max(fval_freqs.values())
+            stump_errors = len(labeled_featuresets) - correct
+            if stump_errors < best_errors:
+                best_errors = stump_errors
+                best_fname = fname
+        if best_fname is None:
+            best_stump = DecisionTreeClassifier.leaf(labeled_featuresets)
+        else:
+            best_stump = DecisionTreeClassifier.stump(best_fname,
+                                                      labeled_featuresets)
+        best_error = best_errors/len(labeled_featuresets)
         if verbose:
             print(('best stump for {:6d} toks uses {:20} err={:6.4f}'.format \
                    (len(labeled_featuresets), best_stump._fname, best_error)))
@@ -256,16 +303,33 @@ class DecisionTreeClassifier(ClassifierI):
     @staticmethod
     def best_binary_stump(feature_names, labeled_featuresets, feature_values,
                           verbose=False):
-        best_stump = DecisionTreeClassifier.leaf(labeled_featuresets)
-        best_error = best_stump.error(labeled_featuresets)
+        # Score each stump by its number of errors, counted from the
+        # contingency tables rather than by classifying the featuresets.
+        label_freqs, value_freqs = _contingency_tables(labeled_featuresets)
+        best_fname = best_fval = None
+        best_errors = len(labeled_featuresets) - max(label_freqs.values())
         for fname in feature_names:
+            freqs = value_freqs.get(fname, {})
             for fval in feature_values[fname]:
-                stump = DecisionTreeClassifier.binary_stump(
-                    fname, fval, labeled_featuresets)
-                stump_error = stump.error(labeled_featuresets)
-                if stump_error < best_error:
-                    best_error = stump_error
-                    best_stump = stump
+                if fval is None:
+                    pos_freqs = _unset_freqs(label_freqs, freqs)
+                else:
+                    pos_freqs = freqs.get(fval, {})
+                if not pos_freqs:
+                    continue # the same errors as the leaf.
+                neg_correct = max([count - pos_freqs.get(label, 0)
+                                   for label, count in label_freqs.items()])
+                stump_errors = (len(labeled_featuresets) - neg_correct -
+                                max(pos_freqs.values()))
+                if stump_errors < best_errors:
+                    best_errors = stump_errors
+                    best_fname, best_fval = fname, fval
+        if best_fname is None:
+            best_stump = DecisionTreeClassifier.leaf(labeled_featuresets)
+        else:
+            best_stump = DecisionTreeClassifier.binary_stump(
+                best_fname, best_fval, labeled_featuresets)
+        best_error = best_errors/len(labeled_featuresets)
         if best_stump._decisions:
             descr = '{0}={1}'.format(best_stump._fname,
                                list(best_stump._decisions.keys())[0])
@@ -276,6 +340,80 @@ class DecisionTreeClassifier(ClassifierI):
                    (len(labeled_featuresets), descr, best_error)))
         return best_stump
 
+#: The key of the default child of a decision tree, in ``_subtrees()``.
+_DEFAULT = object()
+
+def _contingency_tables(labeled_featuresets):
+    """
+    Count the labels of ``labeled_featuresets``, and the labels for each
+    value of each feature, in a single pass.  Features whose value is
+    None are not counted, as ``featureset.get()`` cannot tell them from
+    missing features; see ``_unset_freqs()``.
+
+    :return: A dictionary from labels to counts, and a dictionary from
+        feature names to dictionaries from feature values to
+        dictionaries from labels to counts.
+    """
+    label_freqs = defaultdict(int)
+    value_freqs = defaultdict(dict)
+    for featureset, label in labeled_featuresets:
+        label_freqs[label] += 1
+        for fname, fval in featureset.items():
+            if fval is None:
+                continue
+            fval_freqs = value_freqs[fname].get(fval)
+            if fval_freqs is None:
+                fval_freqs = value_freqs[fname][fval] = defaultdict(int)
+            fval_freqs[label] += 1
+    return label_freqs, value_freqs
+
+def _unset_freqs(label_freqs, freqs):
+    """
+    Return the label counts of the featuresets for which a feature is
+    missing or None, given the counts ``freqs`` for its other values.
+    """
+    unset = dict(label_freqs)
+    for fval_freqs in freqs.values():
+        for label, count in fval_freqs.items():
+            unset[label] -= count
+    return dict((label, count) for label, count in unset.items() if count)
+
+def _train_subtree(args):
+    return DecisionTreeClassifier.train(*args)
+
+def _refine_parallel(tree, labeled_featuresets, entropy_cutoff, depth_cutoff,
+                     support_cutoff, binary, feature_values, verbose, workers):
+    """
+    Refine the stump ``tree`` like ``tree.refine()``, training its
+    subtrees in a pool of ``workers`` processes.  Until there are at
+    least ``2 * workers`` subtrees to train, the largest one is split
+    further in this process, so that the workers get similar amounts of
+    work.
+    """
+    subtrees = [(tree, fval, featuresets, depth_cutoff)
+                for fval, featuresets in tree._subtrees(
+                    labeled_featuresets, entropy_cutoff, depth_cutoff,
+                    support_cutoff)]
+    while 0 < len(subtrees) < 2 * workers:
+        largest = max(range(len(subtrees)), key=lambda i: len(subtrees[i][2]))
+        parent, fval, featuresets, depth = subtrees.pop(largest)
+        subtree = DecisionTreeClassifier._train_stump(
+            featuresets, binary, feature_values, verbose)
+        parent._set_subtree(fval, subtree)
+        subtrees.extend((subtree, subtree_fval, subtree_featuresets, depth-1)
+                        for subtree_fval, subtree_featuresets
+                        in subtree._subtrees(featuresets, entropy_cutoff,
+                                             depth-1, support_cutoff))
+    if not subtrees:
+        return
+
+    tasks = ((featuresets, entropy_cutoff, depth, support_cutoff, binary,
+              feature_values, verbose)
+             for parent, fval, featuresets, depth in subtrees)
+    for (parent, fval, featuresets, depth), subtree in zip(
+            subtrees, process_imap(_train_subtree, tasks, workers)):
+        parent._set_subtree(fval, subtree)
+
 ##//////////////////////////////////////////////////////
 ##  Demo
 ##//////////////////////////////////////////////////////
@@ -221,7 +221,7 @@ class MaxentClassifier(ClassifierI):
 
     #: A list of the algorithm names that are accepted for the
     #: ``train()`` method's ``algorithm`` parameter.
-    ALGORITHMS = ['GIS', 'IIS', 'MEGAM', 'TADM']
+    ALGORITHMS = ['GIS', 'IIS', 'LBFGS', 'MEGAM', 'TADM']
 
     @classmethod
     def train(cls, train_toks, algorithm=None, trace=3, encoding=None,
@@ -247,6 +247,8 @@ class MaxentClassifier(ClassifierI):
 
             - Iterative Scaling Methods: Generalized Iterative Scaling (``'GIS'``),
               Improved Iterative Scaling (``'IIS'``)
+            - Quasi-Newton Methods: limited-memory BFGS (``'LBFGS'``),
+              with optional L1 and L2 penalties
             - External Libraries (requiring megam):
               LM-BFGS algorithm, with training performed by Megam (``'megam'``)
 
@@ -266,7 +268,8 @@ class MaxentClassifier(ClassifierI):
             used instead.
         :param gaussian_prior_sigma: The sigma value for a gaussian
             prior on model weights.  Currently, this is supported by
-            ``megam``. For other algorithms, its value is ignored.
+            ``megam`` and ``'LBFGS'``. For other algorithms, its value
+            is ignored.
         :param cutoffs: Arguments specifying various conditions under
             which the training should be halted.  (Some of the cutoff
             conditions are not supported by some algorithms.)
@@ -276,21 +279,34 @@ class MaxentClassifier(ClassifierI):
               log-likelihood drops under ``v``.
             - ``min_lldelta=v``: Terminate if a single iteration improves
               log likelihood by less than ``v``.
+
+            The ``'LBFGS'`` algorithm also accepts ``l1_penalty=v`` and
+            ``l2_penalty=v``, the weights of the L1 and L2 penalties on
+            the model weights; the other algorithms do not support them.
         """
         if algorithm is None:
             algorithm = 'iis'
         for key in cutoffs:
             if key not in ('max_iter', 'min_ll', 'min_lldelta',
                            'max_acc', 'min_accdelta', 'count_cutoff',
-                           'norm', 'explicit', 'bernoulli'):
+                           'norm', 'explicit', 'bernoulli',
+                           'l1_penalty', 'l2_penalty'):
                 raise TypeError('Unexpected keyword arg %r' % key)
         algorithm = algorithm.lower()
+        for key in ('l1_penalty', 'l2_penalty'):
+            if key in cutoffs and algorithm != 'lbfgs':
+                raise TypeError('%r is only supported by the LBFGS '
+                                'algorithm' % key)
         if algorithm == 'iis':
             return train_maxent_classifier_with_iis(
                 train_toks, trace, encoding, labels, **cutoffs)
         elif algorithm == 'gis':
             return train_maxent_classifier_with_gis(
                 train_toks, trace, encoding, labels, **cutoffs)
+        elif algorithm == 'lbfgs':
+            return train_maxent_classifier_with_lbfgs(
+                train_toks, trace, encoding, labels,
+                gaussian_prior_sigma, **cutoffs)
         elif algorithm == 'megam':
             return train_maxent_classifier_with_megam(
                 train_toks, trace, encoding, labels,
@@ -1327,6 +1343,235 @@ def calculate_deltas(train_toks, classifier, unattested, ffreq_empirical,
 
     return deltas
 
+######################################################################
+#{ Classifier Trainer: L-BFGS
+######################################################################
+
+def train_maxent_classifier_with_lbfgs(train_toks, trace=3, encoding=None,
+                                       labels=None, gaussian_prior_sigma=0,
+                                       l1_penalty=0, l2_penalty=0, memory=10,
+                                       **cutoffs):
+    """
+    Train a new ``ConditionalExponentialClassifier``, using the given
+    training samples, using the limited-memory BFGS algorithm to
+    minimize the negative log likelihood of ``train_toks``.  The
+    featuresets are encoded only once, into a sparse matrix of joint
+    features, so each iteration takes a few vectorized operations over
+    that matrix, and no external library is needed.
+
+    The weights can be regularized with an L2 penalty of
+    ``l2_penalty * sum(w**2) / 2`` (a ``gaussian_prior_sigma`` adds
+    ``1 / gaussian_prior_sigma**2`` to ``l2_penalty``, as for megam),
+    and with an L1 penalty of ``l1_penalty * sum(abs(w))``, which sets
+    the weights of uninformative features to zero.  With an L1
+    penalty, the orthant-wise variant of L-BFGS (OWL-QN) is used.
+    Penalties apply to the natural-log weights, summed over
+    ``train_toks``.
+
+    :see: ``train_maxent_classifier()`` for parameter descriptions.
+    :param memory: The number of previous updates that are used to
+        approximate the inverse Hessian.
+    """
+    cutoffs.setdefault('max_iter', 100)
+    cutoffchecker = CutoffChecker(cutoffs)
+
+    # Construct an encoding from the training data.
+    if encoding is None:
+        encoding = BinaryMaxentFeatureEncoding.train(
+            train_toks, cutoffs.get('count_cutoff', 0), labels=labels,
+            alwayson_features=True)
+    elif labels is not None:
+        raise ValueError('Specify encoding or labels, not both')
+
+    if gaussian_prior_sigma:
+        l2_penalty += 1.0 / gaussian_prior_sigma**2
+
+    # Encode the training data, and count how many times each feature
+    # occurs in it.
+    rows, fids, fvals, gold = encode_joint_features(train_toks, encoding)
+    num_labels = len(encoding.labels())
+    is_gold = numpy.arange(num_labels) == gold[:, numpy.newaxis]
+    empirical_fcount = numpy.bincount(
+        fids, fvals * is_gold.ravel()[rows], minlength=encoding.length())
+
+    def evaluate(weights):
+        # Return the penalized negative log likelihood (base e) of the
+        # training data, its gradient, and the label probabilities.
+        scores = numpy.bincount(rows, fvals * weights[fids],
+                                minlength=is_gold.size)
+        scores = scores.reshape(is_gold.shape)
+        scores -= scores.max(axis=1)[:, numpy.newaxis]
+        log_z = numpy.log(numpy.exp(scores).sum(axis=1))
+        scores -= log_z[:, numpy.newaxis]
+        probs = numpy.exp(scores)
+        estimated_fcount = numpy.bincount(fids, fvals * probs.ravel()[rows],
+                                          minlength=len(weights))
+        loss = -scores[is_gold].sum() + l2_penalty * weights.dot(weights) / 2
+        gradient = estimated_fcount - empirical_fcount + l2_penalty * weights
+        return loss, gradient, probs
+
+    def objective(loss, weights):
+        return loss + l1_penalty * numpy.abs(weights).sum()
+
+    def ll_and_acc(probs):
+        # The same measures as log_likelihood() and accuracy().
+        ll = numpy.log(probs[is_gold].mean())
+        acc = (probs.argmax(axis=1) == gold).mean()
+        return ll, acc
+
+    # Build the classifier.  Start with weight=0 for each feature.
+    weights = numpy.zeros(encoding.length(), 'd')
+    loss, gradient, probs = evaluate(weights)
+    classifier = ConditionalExponentialClassifier(encoding, weights.copy())
+    history = []
+
+    if trace > 0:
+        print('  ==> Training (%d iterations)' % cutoffs['max_iter'])
+    if trace > 2:
+        print()
+        print('      Iteration    Log Likelihood    Accuracy')
+        print('      ---------------------------------------')
+
+    # Train the classifier.
+    try:
+        while True:
+            if trace > 2:
+                ll, acc = ll_and_acc(probs)
+                iternum = cutoffchecker.iter
+                print('     %9d    %14.5f    %9.3f' % (iternum, ll, acc))
+
+            # Find a descent direction.
+            pseudo_gradient = _pseudo_gradient(weights, gradient, l1_penalty)
+            if not pseudo_gradient.any():
+                break # converged.
+            direction = -_lbfgs_direction(pseudo_gradient, history)
+            if l1_penalty:
+                direction[direction * pseudo_gradient >= 0] = 0
+            if direction.dot(pseudo_gradient) >= 0:
+                del history[:]
+                direction = -pseudo_gradient
+            orthant = numpy.where(weights != 0, numpy.sign(weights),
+                                  -numpy.sign(pseudo_gradient))
+
+            # Backtrack along it until the objective decreases enough.
+            if history:
+                step = 1.0
+            else:
+                step = 1.0 / numpy.sqrt(pseudo_gradient.dot(pseudo_gradient))
+            old_objective = objective(loss, weights)
+            for i in range(LBFGS_MAX_BACKTRACK):
+                new_weights = weights + step * direction
+                if l1_penalty:
+                    new_weights[numpy.sign(new_weights) != orthant] = 0
+                new_loss, new_gradient, new_probs = evaluate(new_weights)
+                decrease = pseudo_gradient.dot(new_weights - weights)
+                if (objective(new_loss, new_weights) <=
+                        old_objective + 1e-4 * decrease):
+                    break
+                step /= 2
+            else:
+                break # no further progress is possible.
+
+            # Update the inverse Hessian approximation.
+            s = new_weights - weights
+            y = new_gradient - gradient
+            if s.dot(y) > 1e-10:
+                history.append((s, y, 1.0 / s.dot(y)))
+                if len(history) > memory:
+                    del history[0]
+
+            # Update the classifier weights
+            weights, loss, gradient, probs = (new_weights, new_loss,
+                                              new_gradient, new_probs)
+            classifier.set_weights(weights * numpy.log2(numpy.e))
+
+            # Check the log-likelihood & accuracy cutoffs.
+            ll, acc = ll_and_acc(probs)
+            if cutoffchecker.check(classifier, train_toks, ll, acc):
+                break
+
+    except KeyboardInterrupt:
+        print('      Training stopped: keyboard interrupt')
+    except:
+        raise
+
+    # Convert from base-e to base-2 weights.
+    classifier.set_weights(weights * numpy.log2(numpy.e))
+
+    if trace > 2:
+        ll, acc = ll_and_acc(probs)
+        print('         Final    %14.5f    %9.3f' % (ll, acc))
+
+    # Return the classifier.
+    return classifier
+
+#: The maximum number of times that the L-BFGS line search halves its
+#: step before giving up.
+LBFGS_MAX_BACKTRACK = 40
+
+def encode_joint_features(train_toks, encoding):
+    """
+    Encode each featureset in ``train_toks`` with each of the
+    encoding's labels, and return the joint-feature vectors as a
+    sparse matrix in coordinate form, i.e. as three arrays: row
+    indices, feature ids and feature values.  Row ``i*L+j`` is the
+    vector of the ``i``th featureset with the ``j``th label of
+    ``encoding.labels()``, ``L`` being the number of labels.  Also
+    return an array with the label index of each training sample.
+
+    :rtype: tuple(array, array, array, array)
+    """
+    labels = list(encoding.labels())
+    label_index = dict((label, j) for j, label in enumerate(labels))
+    rows, fids, fvals, gold = [], [], [], []
+    row = 0
+    for tok, label in train_toks:
+        if label not in label_index:
+            raise ValueError('Unknown label %r' % (label,))
+        gold.append(label_index[label])
+        for joint_label in labels:
+            for (fid, fval) in encoding.encode(tok, joint_label):
+                rows.append(row)
+                fids.append(fid)
+                fvals.append(fval)
+            row += 1
+    return (numpy.array(rows, dtype=int), numpy.array(fids, dtype=int),
+            numpy.array(fvals, dtype='d'), numpy.array(gold, dtype=int))
+
+def _pseudo_gradient(weights, gradient, l1_penalty):
+    """
+    Return the gradient of the objective with an L1 penalty, using the
+    one-sided derivative that points downhill at weights of zero.
+    """
+    if not l1_penalty:
+        return gradient
+    pseudo_gradient = gradient + l1_penalty * numpy.sign(weights)
+    at_zero = (weights == 0)
+    pseudo_gradient[at_zero] = numpy.where(
+        gradient[at_zero] + l1_penalty < 0, gradient[at_zero] + l1_penalty,
+        numpy.maximum(gradient[at_zero] - l1_penalty, 0))
+    return pseudo_gradient
+
+def _lbfgs_direction(gradient, history):
+    """
+    Return the product of the L-BFGS approximation of the inverse
+    Hessian and ``gradient``, using the two-loop recursion over the
+    ``(s, y, 1/s.y)`` updates in ``history``.
+    """
+    q = gradient.copy()
+    alphas = []
+    for s, y, rho in reversed(history):
+        alpha = rho * s.dot(q)
+        q -= alpha * y
+        alphas.append(alpha)
+    if history:
+        s, y, rho = history[-1]
+        q /= rho * y.dot(y)
+    for (s, y, rho), alpha in zip(history, reversed(alphas)):
+        beta = rho * y.dot(q)
+        q += (alpha - beta) * s
+    return q
+
 ######################################################################
 #{ Classifier Trainer: megam
 ######################################################################
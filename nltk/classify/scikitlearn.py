@@ -29,15 +29,28 @@ best 1000 features:
 ...                      ('chi2', SelectKBest(chi2, k=1000)),
 ...                      ('nb', MultinomialNB())])
 >>> classif = SklearnClassifier(pipeline)
+
+Training sets too large to fit in memory can be used with an estimator that
+supports incremental training (``partial_fit``). Features are then hashed
+into a fixed number of columns, rather than numbered by a vocabulary built
+from the whole training set, and ``train_stream`` trains the estimator on an
+iterator of labeled featuresets, one mini-batch at a time:
+
+>>> from sklearn.linear_model import SGDClassifier
+>>> classif = SklearnClassifier(SGDClassifier(), n_features=2**20)
+>>> classif.train_stream(labeled_featuresets, labels=['pos', 'neg']) # doctest: +SKIP
 """
 from __future__ import print_function, unicode_literals
 
+from itertools import islice
+
 from nltk.classify.api import ClassifierI
 from nltk.probability import DictionaryProbDist
 from nltk import compat
 
 try:
-    from sklearn.feature_extraction import DictVectorizer
+    import numpy as np
+    from sklearn.feature_extraction import DictVectorizer, FeatureHasher
     from sklearn.preprocessing import LabelEncoder
 except ImportError:
     pass
@@ -49,7 +62,7 @@ __all__ = ['SklearnClassifier']
 class SklearnClassifier(ClassifierI):
     """Wrapper for scikit-learn classifiers."""
 
-    def __init__(self, estimator, dtype=float, sparse=True):
+    def __init__(self, estimator, dtype=float, sparse=True, n_features=None):
         """
         :param estimator: scikit-learn classifier object.
 
@@ -64,10 +77,27 @@ class SklearnClassifier(ClassifierI):
             involve sparse feature sets. Setting this to False may take a
             great amount of memory.
         :type sparse: boolean.
+
+        :param n_features: If given, hash the features into this many
+            columns with a ``FeatureHasher``, instead of building a
+            vocabulary of features with a ``DictVectorizer``. This is
+            required by ``train_stream``. Distinct features may share a
+            column, which is unlikely if ``n_features`` is much larger than
+            the number of distinct features. The values of features that
+            share a column are added, not given alternating signs, so that
+            the columns stay non-negative for estimators such as
+            ``MultinomialNB`` and ``chi2`` feature selection.
+        :type n_features: int
         """
         self._clf = estimator
         self._encoder = LabelEncoder()
-        self._vectorizer = DictVectorizer(dtype=dtype, sparse=sparse)
+        self._sparse = sparse
+        if n_features is None:
+            self._vectorizer = DictVectorizer(dtype=dtype, sparse=sparse)
+        else:
+            self._vectorizer = FeatureHasher(n_features=n_features,
+                                             input_type='dict', dtype=dtype,
+                                             alternate_sign=False)
 
     def __repr__(self):
         return "<SklearnClassifier(%r)>" % self._clf
@@ -80,7 +110,7 @@ class SklearnClassifier(ClassifierI):
         :return: The predicted class label for each input sample.
         :rtype: list
         """
-        X = self._vectorizer.transform(featuresets)
+        X = self._transform(featuresets)
         classes = self._encoder.classes_
         return [classes[i] for i in self._clf.predict(X)]
 
@@ -91,7 +121,7 @@ class SklearnClassifier(ClassifierI):
             strings to either numbers, booleans or strings.
         :rtype: list of ``ProbDistI``
         """
-        X = self._vectorizer.transform(featuresets)
+        X = self._transform(featuresets)
         y_proba_list = self._clf.predict_proba(X)
         return [self._make_probdist(y_proba) for y_proba in y_proba_list]
 
@@ -113,11 +143,70 @@ class SklearnClassifier(ClassifierI):
 
         X, y = list(compat.izip(*labeled_featuresets))
         X = self._vectorizer.fit_transform(X)
+        if not self._sparse and self._hashing():
+            X = X.toarray()
         y = self._encoder.fit_transform(y)
         self._clf.fit(X, y)
 
         return self
 
+    def train_stream(self, labeled_featuresets, labels=None, batch_size=1000):
+        """
+        Train the scikit-learn estimator incrementally, by calling its
+        ``partial_fit`` method on one mini-batch of featuresets at a time,
+        so that only a mini-batch is held in memory. Calling this method
+        again continues the training. This requires a classifier that was
+        constructed with ``n_features``.
+
+        :param labeled_featuresets: An iterable over ``(featureset, label)``
+            pairs, where each ``featureset`` is a dict mapping strings to
+            either numbers, booleans or strings.
+        :param labels: All the class labels, which must be given the first
+            time the classifier is trained, as the estimator needs them
+            before it has seen all the training data. Later calls may
+            omit them, or give the same labels.
+        :param batch_size: The number of featuresets in each mini-batch.
+        """
+        if not self._hashing():
+            raise ValueError('Streaming training requires a hashed feature '
+                             'space; construct the classifier with '
+                             'n_features')
+        if not hasattr(self._clf, 'partial_fit'):
+            raise ValueError('%r does not support incremental training '
+                             '(partial_fit)' % self._clf)
+        if labels is not None:
+            labels = list(labels)
+            if not hasattr(self._encoder, 'classes_'):
+                self._encoder.fit(labels)
+            elif set(labels) != set(self._encoder.classes_):
+                raise ValueError('The labels cannot change once the '
+                                 'classifier has been trained')
+        elif not hasattr(self._encoder, 'classes_'):
+            raise ValueError('The labels must be given the first time the '
+                             'classifier is trained')
+        classes = np.arange(len(self._encoder.classes_))
+
+        labeled_featuresets = iter(labeled_featuresets)
+        while True:
+            batch = list(islice(labeled_featuresets, batch_size))
+            if not batch:
+                break
+            X, y = list(compat.izip(*batch))
+            X = self._transform(X)
+            y = self._encoder.transform(y)
+            self._clf.partial_fit(X, y, classes=classes)
+
+        return self
+
+    def _hashing(self):
+        return isinstance(self._vectorizer, FeatureHasher)
+
+    def _transform(self, featuresets):
+        X = self._vectorizer.transform(featuresets)
+        if not self._sparse and self._hashing():
+            X = X.toarray()
+        return X
+
     def _make_probdist(self, y_proba):
         classes = self._encoder.classes_
         return DictionaryProbDist(dict((classes[i], p)
@@ -11,7 +11,16 @@ Utility functions and classes for classifiers.
 """
 from __future__ import print_function, division
 
+import hashlib
+import json
 import math
+import os
+import re
+import sqlite3
+import types
+import zlib
+
+from nltk.compat import string_types, integer_types
 
 #from nltk.util import Deprecated
 import nltk.classify.util # for accuracy & log_likelihood
@@ -25,7 +34,7 @@ from nltk.util import LazyMap
 # alternative name possibility: 'detect_features()'?
 # alternative name possibility: 'map_featuredetect()'?
 # or.. just have users use LazyMap directly?
-def apply_features(feature_func, toks, labeled=None):
+def apply_features(feature_func, toks, labeled=None, cache=None):
     """
     Use the ``LazyMap`` class to construct a lazy list-like
     object that is analogous to ``map(feature_func, toks)``.  In
@@ -57,7 +66,20 @@ def apply_features(feature_func, toks, labeled=None):
     :param labeled: If true, then ``toks`` contains labeled tokens --
         i.e., tuples of the form ``(tok, label)``.  (Default:
         auto-detect based on types.)
+    :param cache: If given, then the featuresets are stored on disk, and
+        reused by later passes over the list, and by later runs and
+        other processes that apply the same feature extractor to the
+        same tokens.  Either a ``FeatureCache`` for ``feature_func``,
+        the directory of one, or True to use ``FEATURE_CACHE_DIR``.
     """
+    if cache is not None and cache is not False:
+        if not isinstance(cache, FeatureCache):
+            cache = FeatureCache(feature_func,
+                                 None if cache is True else cache)
+        elif cache.feature_func != feature_func:
+            raise ValueError('The feature cache is for another feature '
+                             'extractor')
+        feature_func = cache
     if labeled is None:
         labeled = toks and isinstance(toks[0], (tuple, list))
     if labeled:
@@ -109,13 +131,21 @@ class CutoffChecker(object):
         self.acc = None
         self.iter = 1
 
-    def check(self, classifier, train_toks):
+    def check(self, classifier, train_toks, ll=None, acc=None):
+        """
+        Return true if training should stop.  A trainer that already
+        knows the log likelihood or accuracy of ``classifier`` on
+        ``train_toks`` can give them as ``ll`` and ``acc``, so that
+        they are not computed again.
+        """
         cutoffs = self.cutoffs
         self.iter += 1
         if 'max_iter' in cutoffs and self.iter >= cutoffs['max_iter']:
             return True # iteration cutoff.
 
-        new_ll = nltk.classify.util.log_likelihood(classifier, train_toks)
+        if ll is None:
+            ll = nltk.classify.util.log_likelihood(classifier, train_toks)
+        new_ll = ll
         if math.isnan(new_ll):
             return True
 
@@ -128,17 +158,341 @@ class CutoffChecker(object):
             self.ll = new_ll
 
         if 'max_acc' in cutoffs or 'min_accdelta' in cutoffs:
-            new_acc = nltk.classify.util.log_likelihood(
-                classifier, train_toks)
+            new_acc = acc
+            if new_acc is None:
+                new_acc = nltk.classify.util.accuracy(classifier, train_toks)
             if 'max_acc' in cutoffs and new_acc >= cutoffs['max_acc']:
-                return True # log likelihood cutoff
+                return True # accuracy cutoff
             if ('min_accdelta' in cutoffs and self.acc and
                 ((new_acc - self.acc) <= abs(cutoffs['min_accdelta']))):
-                return True # log likelihood delta cutoff
+                return True # accuracy delta cutoff
             self.acc = new_acc
 
             return False # no cutoff reached.
 
+######################################################################
+#{ Feature Cache
+######################################################################
+
+#: The default directory of feature caches, used by
+#: ``apply_features(..., cache=True)``.
+FEATURE_CACHE_DIR = os.environ.get('NLTK_FEATURE_CACHE_DIR')
+
+class FeatureCache(object):
+    """
+    A feature extractor that stores the featuresets computed by another
+    feature extractor on disk, and reuses them in later calls, runs and
+    processes.  Featuresets are stored in a SQLite database in the
+    cache directory, with one database per feature extractor, keyed by
+    the MD5 digest of each token and compressed with zlib.
+
+    Tokens and featuresets are stored as JSON, so that reading a cache
+    never runs code.  They may be made of ``None``, booleans, numbers,
+    strings, and tuples, lists, sets, frozensets and dicts of them.  A
+    token's digest is computed from a canonical form, with the items of
+    its sets and dicts sorted, so that it is the same in every run.
+    Other tokens and featuresets are not cached.
+
+    The cache is keyed by the identity of the feature extractor: its
+    name and a digest of its code, default arguments and closure
+    variables, and of the code of the functions and the values of the
+    simple global variables that it refers to.  When any of those
+    change, the stored featuresets are discarded.  Anything else that
+    the featuresets depend on, such as the version of a lexicon, can be
+    given as ``version``.
+
+    Since the cache is only an optimization, errors while reading or
+    writing it are ignored, and the featuresets are computed instead.
+
+    :param feature_func: The feature extractor.
+    :param directory: The directory of the cache, by default
+        ``FEATURE_CACHE_DIR``.
+    :param version: A string identifying the version of anything else
+        that the featuresets depend on.
+    :param batch_size: The number of new featuresets to hold in memory
+        before writing them to the cache.  Call ``flush()`` to write
+        them sooner.
+    """
+    def __init__(self, feature_func, directory=None, version=None,
+                 batch_size=1000):
+        if directory is None:
+            directory = FEATURE_CACHE_DIR
+        if directory is None:
+            raise ValueError('No feature cache directory given, and '
+                             'NLTK_FEATURE_CACHE_DIR is not set')
+        self.feature_func = feature_func
+        self.batch_size = batch_size
+        self._name = _feature_func_name(feature_func)
+        self._signature = _feature_func_signature(feature_func, version)
+        self._path = os.path.join(directory, '%s.sqlite' % re.sub(
+            r'[^\w.-]', '_', self._name))
+        self._connection = None
+        self._pid = None
+        self._pending = {}
+        self.hits = self.misses = 0
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_connection'] = None
+        state['_pending'] = {}
+        return state
+
+    def __call__(self, tok):
+        key = _token_digest(tok)
+        if key is not None:
+            featureset = self._lookup(key)
+            if featureset is not None:
+                self.hits += 1
+                return featureset
+        self.misses += 1
+        featureset = self.feature_func(tok)
+        if key is not None:
+            self._pending[key] = featureset
+            if len(self._pending) >= self.batch_size:
+                self.flush()
+        return featureset
+
+    def _connect(self):
+        """
+        Return a connection to the database of this cache, opening it
+        (again) if it is not open in this process.  Clear the database
+        if it was made for another version of the feature extractor.
+        """
+        if self._connection is not None and self._pid == os.getpid():
+            return self._connection
+        directory = os.path.dirname(self._path)
+        if directory and not os.path.isdir(directory):
+            try:
+                os.makedirs(directory)
+            except OSError:
+                if not os.path.isdir(directory):
+                    raise
+        connection = sqlite3.connect(self._path, timeout=60)
+        connection.text_factory = bytes
+        with connection:
+            connection.execute('CREATE TABLE IF NOT EXISTS signature '
+                               '(signature TEXT)')
+            connection.execute('CREATE TABLE IF NOT EXISTS featuresets '
+                               '(key BLOB PRIMARY KEY, featureset BLOB)')
+            row = connection.execute('SELECT signature FROM signature'
+                                     ).fetchone()
+            if row is None or row[0].decode('ascii') != self._signature:
+                connection.execute('DELETE FROM featuresets')
+                connection.execute('DELETE FROM signature')
+                connection.execute('INSERT INTO signature VALUES (?)',
+                                   (self._signature,))
+        self._connection, self._pid = connection, os.getpid()
+        return connection
+
+    def _lookup(self, key):
+        if key in self._pending:
+            return self._pending[key]
+        try:
+            row = self._connect().execute(
+                'SELECT featureset FROM featuresets WHERE key = ?',
+                (_blob(key),)).fetchone()
+            if row is not None:
+                return _decode_value(json.loads(
+                    zlib.decompress(bytes(row[0])).decode('utf8')))
+        except Exception:
+            pass
+        return None
+
+    def flush(self):
+        """
+        Write the new featuresets held in memory to the cache.
+        """
+        pending, self._pending = self._pending, {}
+        rows = []
+        for key, featureset in pending.items():
+            try:
+                data = json.dumps(_encode_value(featureset)).encode('utf8')
+            except (TypeError, ValueError):
+                continue # not a featureset that can be stored
+            rows.append((_blob(key), _blob(zlib.compress(data))))
+        if not rows:
+            return
+        try:
+            connection = self._connect()
+            with connection:
+                connection.executemany(
+                    'INSERT OR REPLACE INTO featuresets VALUES (?, ?)', rows)
+        except Exception:
+            pass
+
+    def close(self):
+        """
+        Write the new featuresets to the cache, and close its database.
+        """
+        self.flush()
+        if self._connection is not None and self._pid == os.getpid():
+            self._connection.close()
+        self._connection = None
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+
+    def __repr__(self):
+        return '<FeatureCache for %s in %r>' % (self._name, self._path)
+
+def _blob(data):
+    if str is bytes: # Python 2
+        return buffer(data)
+    return data
+
+def _token_digest(tok):
+    """
+    Return the MD5 digest of the canonical JSON form of the token, or
+    None if it cannot be encoded.
+    """
+    try:
+        data = json.dumps(_encode_value(tok, canonical=True))
+    except (TypeError, ValueError):
+        return None
+    return hashlib.md5(data.encode('utf8')).digest()
+
+#: The tags of the JSON arrays that encode containers, for
+#: ``_encode_value()`` and ``_decode_value()``.
+_CONTAINER_TAGS = [('t', tuple), ('l', list), ('f', frozenset), ('s', set)]
+
+def _encode_value(value, canonical=False):
+    """
+    Return a JSON-serializable form of a value made of None, booleans,
+    numbers, strings, and tuples, lists, sets, frozensets and dicts of
+    them.  Each container becomes an array whose first item is a tag
+    for its type; the items of a dict are given as ``[key, value]``
+    pairs, since its keys need not be strings.  If ``canonical`` is
+    true, the items of sets and dicts are sorted.
+
+    :raise TypeError: If the value contains anything else.
+    """
+    if value is None or isinstance(value, string_types + integer_types +
+                                   (bool, float)):
+        return value
+    if isinstance(value, dict):
+        items = [[_encode_value(key, canonical),
+                  _encode_value(item, canonical)]
+                 for key, item in value.items()]
+        if canonical:
+            items.sort(key=json.dumps)
+        return ['d'] + items
+    for tag, container in _CONTAINER_TAGS:
+        if isinstance(value, container):
+            items = [_encode_value(item, canonical) for item in value]
+            if canonical and tag in 'fs':
+                items.sort(key=json.dumps)
+            return [tag] + items
+    raise TypeError('Cannot encode %r' % type(value).__name__)
+
+def _decode_value(value):
+    """
+    Return the value encoded by ``_encode_value()``.
+    """
+    if not isinstance(value, list):
+        return value
+    tag, items = value[0], value[1:]
+    if tag == 'd':
+        return dict((_decode_value(key), _decode_value(item))
+                    for key, item in items)
+    return dict(_CONTAINER_TAGS)[tag](_decode_value(item) for item in items)
+
+def _feature_func_name(feature_func):
+    func = getattr(feature_func, '__func__', feature_func)
+    if not hasattr(func, '__code__') and hasattr(func, '__call__'):
+        func = type(func)
+    return '%s.%s' % (getattr(func, '__module__', None),
+                      getattr(func, '__qualname__',
+                              getattr(func, '__name__', type(func).__name__)))
+
+def _feature_func_signature(feature_func, version=None):
+    """
+    Return a digest of the code and configuration of a feature
+    extractor, which changes whenever the extractor does.
+    """
+    md5 = hashlib.md5()
+    md5.update(('%s|%s|' % (_feature_func_name(feature_func), version)
+                ).encode('utf8'))
+    _update_signature(md5, feature_func, set())
+    return md5.hexdigest()
+
+def _update_signature(md5, value, seen):
+    if value is None or isinstance(value, string_types + (int, float, bool)):
+        md5.update(repr(value).encode('utf8'))
+        return
+    if id(value) in seen:
+        return
+    seen.add(id(value))
+    if isinstance(value, (tuple, list, set, frozenset)):
+        if isinstance(value, (set, frozenset)):
+            value = sorted(value, key=repr)
+        md5.update(('(%d' % len(value)).encode('utf8'))
+        for item in value:
+            _update_signature(md5, item, seen)
+        md5.update(b')')
+    elif isinstance(value, dict):
+        md5.update(('{%d' % len(value)).encode('utf8'))
+        for key in sorted(value, key=repr):
+            _update_signature(md5, key, seen)
+            _update_signature(md5, value[key], seen)
+        md5.update(b'}')
+    elif hasattr(value, 'pattern') and hasattr(value, 'flags'):
+        # A compiled regular expression.
+        md5.update(('re(%r, %d)' % (value.pattern, value.flags)).encode('utf8'))
+    elif hasattr(getattr(value, '__func__', value), '__code__'):
+        # A function, or a bound method.
+        owner = getattr(value, '__self__', None)
+        if owner is not None and not isinstance(owner, types.ModuleType):
+            _update_signature(md5, owner, seen)
+        func = getattr(value, '__func__', value)
+        _update_code_signature(md5, func.__code__, func.__globals__, seen)
+        _update_signature(md5, func.__defaults__, seen)
+        for cell in func.__closure__ or ():
+            try:
+                contents = cell.cell_contents
+            except ValueError: # an empty cell
+                continue
+            _update_signature(md5, contents, seen)
+    else:
+        # Another object: its class, the code of its __call__ method,
+        # and its simple attributes.  Other attributes are skipped, as
+        # they are often large or created lazily.
+        md5.update(_feature_func_name(type(value)).encode('utf8'))
+        call = getattr(type(value), '__call__', None)
+        if hasattr(call, '__code__'):
+            _update_code_signature(md5, call.__code__, call.__globals__, seen)
+        attrs = getattr(value, '__dict__', None)
+        if isinstance(attrs, dict):
+            for name in sorted(attrs):
+                if attrs[name] is None or isinstance(
+                        attrs[name], string_types + (int, float, bool)):
+                    md5.update(('%s=%r' % (name, attrs[name])).encode('utf8'))
+
+def _update_code_signature(md5, code, globals_, seen):
+    md5.update(code.co_code)
+    _update_signature(md5, code.co_names, seen)
+    for const in code.co_consts:
+        if hasattr(const, 'co_code'):
+            _update_code_signature(md5, const, globals_, seen)
+        else:
+            _update_signature(md5, const, seen)
+    # The global variables that the code refers to, except for modules,
+    # classes, and functions and objects defined in other modules.
+    module = globals_.get('__name__')
+    for name in code.co_names:
+        value = globals_.get(name)
+        if value is None or isinstance(value, (types.ModuleType, type)):
+            continue
+        if hasattr(value, '__code__'):
+            if value.__module__ != module:
+                continue
+        elif hasattr(value, '__dict__'):
+            if type(value).__module__ != module:
+                continue
+        _update_signature(md5, value, seen)
+
 ######################################################################
 #{ Demos
 ######################################################################
@@ -15,7 +15,7 @@ import bisect
 import os
 
 from itertools import islice, chain, combinations
-from collections import defaultdict, deque, Counter
+from collections import defaultdict, deque, Counter, namedtuple
 
 from nltk.internals import slice_bounds, raise_unorderable_types
 from nltk.compat import (class_types, text_type, string_types, total_ordering,
@@ -249,6 +249,28 @@ class AbstractLazySequence(object):
                          self.__class__.__name__)
 
 
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'maxsize', 'currsize'])
+"""
+The statistics of a cache, as returned by the ``cache_info()`` method of
+lazy sequences and cached stemmers: the number of lookups that were
+answered by the cache (``hits``) or had to be computed or read
+(``misses``), the maximum number of entries cached, and the number of
+entries currently cached.
+"""
+
+def sum_cache_info(sequences):
+    """
+    Return the total ``CacheInfo`` of those of ``sequences`` that have a
+    ``cache_info()`` method.
+    """
+    totals = [0, 0, 0, 0]
+    for sequence in sequences:
+        if hasattr(sequence, 'cache_info'):
+            for i, value in enumerate(sequence.cache_info()):
+                totals[i] += value
+    return CacheInfo(*totals)
+
+
 class LazySubsequence(AbstractLazySequence):
     """
     A subsequence produced by slicing a lazy sequence.  This slice
@@ -301,6 +323,16 @@ class LazyConcatenation(AbstractLazySequence):
         self._list = list_of_lists
         self._offsets = [0]
 
+    def cache_info(self):
+        """
+        Return the block cache statistics of the underlying list of
+        lists (see ``CacheInfo``), if it is a corpus view; or, otherwise,
+        the total statistics of those sublists that are.
+        """
+        if hasattr(self._list, 'cache_info'):
+            return self._list.cache_info()
+        return sum_cache_info(self._list)
+
     def __len__(self):
         if len(self._offsets) <= len(self._list):
             for tok in self.iterate_from(self._offsets[-1]): pass
@@ -17,6 +17,7 @@ from collections import defaultdict
 from itertools import chain
 
 from nltk import compat
+from nltk.internals import process_imap, pool_shared
 from nltk.data import PathPointer, FileSystemPathPointer, ZipFilePathPointer
 
 from nltk.corpus.reader.util import *
@@ -222,6 +223,46 @@ class CorpusReader(object):
         else:
             return self._encoding
 
+    def iter_parallel(self, method, fileids=None, workers=None,
+                      ordered=True, **kwargs):
+        """
+        Read the given fileids in a pool of worker processes, and
+        generate the items that ``getattr(self, method)(fileid, **kwargs)``
+        returns for each of them.  For example,
+        ``reader.iter_parallel('tagged_sents', workers=4)`` generates the
+        same tagged sentences as ``reader.tagged_sents()``, but reads and
+        parses up to four files at a time.
+
+        Each file is read and tokenized in a worker, and its complete
+        list of items is sent back to this process.  Where the platform
+        supports it, the workers are forked from this process, so the
+        reader (and any models it has loaded, such as a sentence
+        tokenizer) is shared with them rather than pickled.  At most
+        ``2 * workers`` files are read ahead of the consumer, so memory
+        use is bounded by the size of the files being read, not of the
+        corpus.
+
+        :param method: The name of the reader method to call, such as
+            ``'words'`` or ``'tagged_sents'``.  It must take the fileids
+            to read as its first argument.
+        :param fileids: The fileids to read.  Defaults to all fileids.
+        :param workers: The number of worker processes.  Defaults to the
+            number of CPUs.
+        :param ordered: If true, generate the items in the order of
+            ``fileids``; otherwise generate each file's items as soon as
+            they are read.
+        :param kwargs: Further keyword arguments for the method.
+        """
+        if fileids is None:
+            fileids = self._fileids
+        elif isinstance(fileids, compat.string_types):
+            fileids = [fileids]
+        tasks = ((method, fileid, kwargs) for fileid in fileids)
+        for items in process_imap(_read_fileid, tasks, workers, self,
+                                  ordered):
+            for item in items:
+                yield item
+
     def _get_root(self): return self._root
     root = property(_get_root, doc="""
         The directory where this corpus is stored.
@@ -229,6 +270,14 @@ class CorpusReader(object):
         :type: PathPointer""")
 
 
+def _read_fileid(task):
+    method, fileid, kwargs = task
+    result = getattr(pool_shared(), method)(fileid, **kwargs)
+    if isinstance(result, compat.string_types):
+        return [result]
+    return list(result)
+
+
 ######################################################################
 #{ Corpora containing categorized items
 ######################################################################
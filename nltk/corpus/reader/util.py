@@ -9,8 +9,11 @@
 import os
 import bisect
 import re
+import hashlib
+import json
 import tempfile
 from functools import reduce
+from collections import OrderedDict
 try:
     import cPickle as pickle
 except ImportError:
@@ -20,17 +23,25 @@ except ImportError:
 try: from xml.etree import cElementTree as ElementTree
 except ImportError: from xml.etree import ElementTree
 
-from nltk.compat import string_types, text_type
+from nltk.compat import string_types, text_type, integer_types
 from nltk.tokenize import wordpunct_tokenize
 from nltk.internals import slice_bounds
 from nltk.data import PathPointer, FileSystemPathPointer, ZipFilePathPointer
 from nltk.data import SeekableUnicodeStreamReader
 from nltk.util import AbstractLazySequence, LazySubsequence, LazyConcatenation, py25
+from nltk.collections import CacheInfo, sum_cache_info
 
 ######################################################################
 #{ Corpus View
 ######################################################################
 
+#: The directory in which corpus views save the block index of each file
+#: they have read to the end, so that later processes opening the same
+#: file can reuse it (see ``StreamBackedCorpusView``).  Saving block
+#: indexes is disabled if this is None.  Defaults to the value of the
+#: ``NLTK_CORPUS_INDEX_DIR`` environment variable.
+BLOCK_INDEX_DIR = os.environ.get('NLTK_CORPUS_INDEX_DIR')
+
 class StreamBackedCorpusView(AbstractLazySequence):
     """
     A 'view' of a corpus file, which acts like a sequence of tokens:
@@ -78,8 +89,24 @@ class StreamBackedCorpusView(AbstractLazySequence):
     map has one entry per block.)
 
     In order to increase efficiency for random access patterns that
-    have high degrees of locality, the corpus view may cache one or
-    more blocks.
+    have high degrees of locality, the corpus view caches the
+    ``cache_size`` most recently used blocks (by default, just one).
+    If ``read_ahead`` is set, then whenever a block has to be read from
+    the file, the following ``read_ahead`` blocks are read into the
+    cache as well.  Both can be set on a view, or for all views through
+    the class attributes ``CACHE_SIZE`` and ``READ_AHEAD``.  The
+    number of cache hits and misses is reported by ``cache_info()``.
+
+    If ``BLOCK_INDEX_DIR`` is set, then once a view has read its file to
+    the end, it saves the complete toknum/filepos mapping and the file
+    length to a JSON index file in that directory.  Views opened later on
+    the same file, by any process, load the saved mapping on first
+    access, so that ``len()`` is immediate and any token can be reached
+    by reading a single block.  A saved index is only used if the size
+    and modification time of the file, the start position, the encoding
+    and the block reader (including the simple configuration attributes
+    of the object it is bound to) all match, and if re-reading the last
+    block agrees with it.
 
     :note: Each ``CorpusView`` object internally maintains an open file
         object for its underlying corpus file.  This file should be
@@ -117,12 +144,25 @@ class StreamBackedCorpusView(AbstractLazySequence):
     :ivar _eofpos: The character position of the last character in the
         file.  This is calculated when the corpus view is initialized,
         and is used to decide when the end of file has been reached.
-    :ivar _cache: A cache of the most recently read block.  It
+    :ivar _cache: The most recently read block.  It
        is encoded as a tuple (start_toknum, end_toknum, tokens), where
        start_toknum is the token index of the first token in the block;
        end_toknum is the token index of the first token not in the
        block; and tokens is a list of the tokens in the block.
+    :ivar _block_cache: An LRU cache of up to ``cache_size`` blocks,
+       mapping the file position of each block to a tuple
+       (tokens, end_filepos), where end_filepos is the file position
+       following the block.
+    :ivar cache_size: The maximum number of blocks to cache.
+    :ivar read_ahead: The number of blocks following a block that is
+       read from the file to read into the cache with it.
     """
+    CACHE_SIZE = 1
+    """The default number of blocks cached by each view."""
+
+    READ_AHEAD = 0
+    """The default number of blocks read ahead by each view."""
+
     def __init__(self, fileid, block_reader=None, startpos=0,
                  encoding='utf8'):
         """
@@ -179,9 +219,19 @@ class StreamBackedCorpusView(AbstractLazySequence):
             raise ValueError('Unable to open or access %r -- %s' %
                              (fileid, exc))
 
-        # Maintain a cache of the most recently read block, to
-        # increase efficiency of random access.
+        # Maintain a cache of the most recently read block, and an LRU
+        # cache of recently read blocks, to increase efficiency of
+        # random access.
         self._cache = (-1, -1, None)
+        self._block_cache = OrderedDict()
+        self.cache_size = self.CACHE_SIZE
+        self.read_ahead = self.READ_AHEAD
+        self._cache_hits = 0
+        self._cache_misses = 0
+
+        # The key of the saved block index for this view; see
+        # _block_index_key().  False until it has been looked up.
+        self._index_key = False
 
     fileid = property(lambda self: self._fileid, doc="""
         The fileid of the file that is accessed by this view.
@@ -226,7 +276,90 @@ class StreamBackedCorpusView(AbstractLazySequence):
             self._stream.close()
         self._stream = None
 
+    def _block_index_key(self):
+        """
+        Return a tuple identifying the file contents, start position,
+        encoding and block reader that this view's toknum/filepos mapping
+        depends on; or None if the mapping should not be saved.
+        """
+        if BLOCK_INDEX_DIR is None:
+            return None
+        fileid = self._fileid
+        try:
+            if isinstance(fileid, FileSystemPathPointer):
+                path, entry = fileid.path, ''
+            elif isinstance(fileid, ZipFilePathPointer):
+                path, entry = fileid.zipfile.filename, fileid.entry
+            elif isinstance(fileid, string_types):
+                path, entry = fileid, ''
+            else:
+                return None
+            stat = os.stat(path)
+        except (OSError, AttributeError, TypeError):
+            return None
+        return (os.path.abspath(path), entry, stat.st_size, stat.st_mtime,
+                self._eofpos, self._filepos[0], self._encoding,
+                _block_reader_key(self.read_block))
+
+    def _index_path(self):
+        digest = hashlib.md5(repr(self._index_key).encode('utf8')).hexdigest()
+        return os.path.join(BLOCK_INDEX_DIR, digest + '.json')
+
+    def _load_block_index(self):
+        """
+        Look up the saved block index for this view, and if there is a
+        valid one, use it as the toknum/filepos mapping.
+        """
+        self._index_key = self._block_index_key()
+        if self._index_key is None or self._len is not None:
+            return
+        try:
+            with open(self._index_path(), 'rb') as infile:
+                index = json.loads(infile.read().decode('ascii'))
+            key = tuple(index['key'])
+            toknum, filepos = index['toknum'], index['filepos']
+        except Exception:
+            return
+        if key != self._index_key or not _is_offset_list(toknum) or \
+           not _is_offset_list(filepos) or len(toknum) < 2 or \
+           len(filepos) != len(toknum) or filepos[-1] != self._eofpos:
+            return
+        # Check the saved index against the last block of the file.
+        if self._stream is None:
+            self._open()
+        self._stream.seek(filepos[-2])
+        self._current_toknum = toknum[-2]
+        self._current_blocknum = len(toknum) - 2
+        tokens = self.read_block(self._stream)
+        if (len(tokens) != toknum[-1] - toknum[-2] or
+            self._stream.tell() != filepos[-1]):
+            return
+        self._toknum = toknum
+        self._filepos = filepos
+        self._len = toknum[-1]
+
+    def _save_block_index(self):
+        """
+        Save the (complete) toknum/filepos mapping to ``BLOCK_INDEX_DIR``.
+        The index is written as JSON, so that loading an index file can
+        never run code.  Failures are ignored, since the index is only an
+        optimization.
+        """
+        index = {'key': self._index_key, 'toknum': self._toknum,
+                 'filepos': self._filepos}
+        try:
+            if not os.path.isdir(BLOCK_INDEX_DIR):
+                os.makedirs(BLOCK_INDEX_DIR)
+            fd, tmp = tempfile.mkstemp(dir=BLOCK_INDEX_DIR, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as outfile:
+                outfile.write(json.dumps(index).encode('ascii'))
+            os.rename(tmp, self._index_path())
+        except Exception:
+            pass
+
     def __len__(self):
+        if self._index_key is False:
+            self._load_block_index()
         if self._len is None:
             # iterate_from() sets self._len when it reaches the end
             # of the file:
@@ -259,6 +392,9 @@ class StreamBackedCorpusView(AbstractLazySequence):
     # If we wanted to be thread-safe, then this method would need to
     # do some locking.
     def iterate_from(self, start_tok):
+        if self._index_key is False:
+            self._load_block_index()
+
         # Start by feeding from the cache, if possible.
         if self._cache[0] <= start_tok < self._cache[1]:
             for tok in self._cache[2][start_tok-self._cache[0]:]:
@@ -277,34 +413,33 @@ class StreamBackedCorpusView(AbstractLazySequence):
             toknum = self._toknum[-1]
             filepos = self._filepos[-1]
 
-        # Open the stream, if it's not open already.
-        if self._stream is None:
-            self._open()
-        
         # If the file is empty, the while loop will never run.
         # This *seems* to be all the state we need to set:
         if self._eofpos == 0:
             self._len = 0
-            
+
         # Each iteration through this loop, we read a single block
-        # from the stream.
+        # from the block cache or from the stream.
         while filepos < self._eofpos:
-            # Read the next block.
-            self._stream.seek(filepos)
-            self._current_toknum = toknum
-            self._current_blocknum = block_index
-            tokens = self.read_block(self._stream)
-            assert isinstance(tokens, (tuple, list, AbstractLazySequence)), (
-                'block reader %s() should return list or tuple.' %
-                self.read_block.__name__)
+            cached = self._block_cache.get(filepos)
+            if cached is not None:
+                self._cache_hits += 1
+                tokens, new_filepos = cached
+                # Mark the block as most recently used.
+                del self._block_cache[filepos]
+                self._block_cache[filepos] = cached
+            else:
+                self._cache_misses += 1
+                tokens, new_filepos = self._read_block_at(filepos, toknum,
+                                                          block_index)
+                self._cache_block(filepos, tokens, new_filepos)
+                # Blocks without tokens do not get an entry in the mapping.
+                self._read_ahead(new_filepos, toknum + len(tokens),
+                                 block_index + 1 if tokens else block_index)
             num_toks = len(tokens)
-            new_filepos = self._stream.tell()
-            assert new_filepos > filepos, (
-                'block reader %s() should consume at least 1 byte (filepos=%d)' %
-                (self.read_block.__name__, filepos))
 
             # Update our cache.
-            self._cache = (toknum, toknum+num_toks, list(tokens))
+            self._cache = (toknum, toknum+num_toks, tokens)
 
             # Update our mapping.
             assert toknum <= self._toknum[-1]
@@ -321,9 +456,13 @@ class StreamBackedCorpusView(AbstractLazySequence):
                     assert toknum+num_toks == self._toknum[block_index], (
                         'inconsistent block reader (num tokens returned)')
 
-            # If we reached the end of the file, then update self._len
+            # If we reached the end of the file, then update self._len,
+            # and save the now complete mapping if it is new.
             if new_filepos == self._eofpos:
+                complete = self._len is None
                 self._len = toknum + num_toks
+                if complete and self._index_key:
+                    self._save_block_index()
             # Generate the tokens in this block (but skip any tokens
             # before start_tok).  Note that between yields, our state
             # may be modified.
@@ -343,6 +482,75 @@ class StreamBackedCorpusView(AbstractLazySequence):
         # We should have reached EOF once we're out of the while loop.
         self.close()
 
+    def _read_block_at(self, filepos, toknum, block_index):
+        """
+        Read the block at ``filepos`` from the stream, and return its
+        tokens as a list and the file position following it.
+        """
+        # Open the stream, if it's not open already.
+        if self._stream is None:
+            self._open()
+        self._stream.seek(filepos)
+        self._current_toknum = toknum
+        self._current_blocknum = block_index
+        tokens = self.read_block(self._stream)
+        assert isinstance(tokens, (tuple, list, AbstractLazySequence)), (
+            'block reader %s() should return list or tuple.' %
+            self.read_block.__name__)
+        new_filepos = self._stream.tell()
+        assert new_filepos > filepos, (
+            'block reader %s() should consume at least 1 byte (filepos=%d)' %
+            (self.read_block.__name__, filepos))
+        return list(tokens), new_filepos
+
+    def _cache_block(self, filepos, tokens, new_filepos):
+        """
+        Add a block to the LRU block cache, evicting the least recently
+        used blocks if the cache is full.
+        """
+        if self.cache_size < 1:
+            return
+        self._block_cache[filepos] = (tokens, new_filepos)
+        while len(self._block_cache) > self.cache_size:
+            self._block_cache.popitem(last=False)
+
+    def _read_ahead(self, filepos, toknum, block_index):
+        """
+        Read up to ``read_ahead`` blocks starting at ``filepos`` into the
+        block cache.
+        """
+        for i in range(min(self.read_ahead, self.cache_size - 1)):
+            if filepos >= self._eofpos or filepos in self._block_cache:
+                break
+            tokens, new_filepos = self._read_block_at(filepos, toknum,
+                                                      block_index)
+            self._cache_block(filepos, tokens, new_filepos)
+            filepos, toknum = new_filepos, toknum + len(tokens)
+            if tokens:
+                block_index += 1
+
+    def cache_info(self):
+        """
+        Return the hit and miss counts and the size of this view's block
+        cache, as a ``CacheInfo``.  A hit is a block that was found in
+        the cache, and a miss is a block that had to be read from the
+        file (not counting blocks that were read ahead).  Tokens that are
+        served from the most recently used block, without a lookup in
+        the block cache, are not counted.
+
+        :rtype: CacheInfo
+        """
+        return CacheInfo(self._cache_hits, self._cache_misses,
+                         self.cache_size, len(self._block_cache))
+
+    def clear_cache(self):
+        """
+        Discard the cached blocks and reset the cache statistics.
+        """
+        self._cache = (-1, -1, None)
+        self._block_cache.clear()
+        self._cache_hits = self._cache_misses = 0
+
     # Use concat for these, so we can use a ConcatenatedCorpusView
     # when possible.
     def __add__(self, other):
@@ -354,6 +562,55 @@ class StreamBackedCorpusView(AbstractLazySequence):
     def __rmul__(self, count):
         return concat([self] * count)
 
+# Attributes of StreamBackedCorpusView that hold its reading state, rather
+# than configuration of its block reader.
+_VIEW_STATE_ATTRIBUTES = frozenset(['_toknum', '_filepos', '_len', '_stream',
+    '_cache', '_current_toknum', '_current_blocknum', '_index_key',
+    '_block_cache', '_cache_hits', '_cache_misses', 'cache_size',
+    'read_ahead'])
+
+def _block_reader_key(read_block):
+    """
+    Return a string identifying a block reader, for the key of a saved
+    block index.  If the block reader is a bound method, the key includes
+    the class and attributes of the object it is bound to.  Attributes
+    that are objects contribute their class and those of their own
+    attributes that are strings, numbers or booleans; other attributes
+    of theirs are skipped, since they are often created lazily.
+    """
+    func = getattr(read_block, '__func__', read_block)
+    parts = [getattr(func, '__module__', None),
+             getattr(func, '__name__', type(func).__name__)]
+    owner = getattr(read_block, '__self__', None)
+    if owner is not None:
+        parts.append(_class_name(owner))
+        for name, value in sorted(getattr(owner, '__dict__', {}).items()):
+            if name not in _VIEW_STATE_ATTRIBUTES:
+                parts.append('%s=%s' % (name, _config_key(value)))
+    return '|'.join('%s' % part for part in parts)
+
+def _is_offset_list(value):
+    return isinstance(value, list) and all(
+        isinstance(n, integer_types) and not isinstance(n, bool) and n >= 0
+        for n in value)
+
+def _class_name(value):
+    return type(value).__module__ + '.' + type(value).__name__
+
+def _is_simple(value):
+    return isinstance(value, string_types + (int, float, bool))
+
+def _config_key(value):
+    if value is None or _is_simple(value):
+        return repr(value)
+    attrs = getattr(value, '__dict__', None)
+    if not isinstance(attrs, dict):
+        return _class_name(value)
+    return '%s(%s)' % (_class_name(value),
+                       ', '.join('%s=%r' % (name, attr)
+                                 for name, attr in sorted(attrs.items())
+                                 if _is_simple(attr)))
+
 class ConcatenatedCorpusView(AbstractLazySequence):
     """
     A 'view' of a corpus file that joins together one or more
@@ -385,6 +642,16 @@ class ConcatenatedCorpusView(AbstractLazySequence):
         for piece in self._pieces:
             piece.close()
 
+    def cache_info(self):
+        """
+        Return the total block cache statistics of the subviews, as a
+        ``CacheInfo``.  Each subview keeps its own cache, which is kept
+        when the subview's file is closed.
+
+        :rtype: CacheInfo
+        """
+        return sum_cache_info(self._pieces)
+
     def iterate_from(self, start_tok):
         piecenum = bisect.bisect_right(self._offsets, start_tok)-1
 
@@ -33,11 +33,17 @@ from __future__ import print_function, unicode_literals
 
 import math
 import re
+import os
+import mmap
+import struct
+import hashlib
+import tempfile
 from itertools import islice, chain
 from operator import itemgetter, attrgetter
 from collections import defaultdict, deque
 
 from nltk.corpus.reader import CorpusReader
+from nltk.data import FileSystemPathPointer, ZipFilePathPointer
 from nltk.util import binary_search_file as _binary_search_file
 from nltk.probability import FreqDist
 from nltk.compat import (iteritems, python_2_unicode_compatible,
@@ -52,6 +58,7 @@ from nltk.compat import (iteritems, python_2_unicode_compatible,
 ##   - Lemma
 ##   - Synset
 ## - WordNet Corpus Reader
+## - Compiled WordNet Index
 ## - WordNet Information Content Corpus Reader
 ## - Similarity Metrics
 ## - Demo
@@ -110,6 +117,13 @@ VERB_FRAME_STRINGS = (
 
 SENSENUM_RE = re.compile(r'\.\d\d\.')
 
+#: The directory in which compiled WordNet indexes are kept.  If it is
+#: set (by default, from the ``NLTK_WORDNET_INDEX_DIR`` environment
+#: variable), then WordNet corpus readers compile their index the first
+#: time they are loaded, and memory-map it afterwards.  See
+#: ``WordNetCorpusReader.compile_index()``.
+WORDNET_INDEX_DIR = os.environ.get('NLTK_WORDNET_INDEX_DIR')
+
 ######################################################################
 ## Data Classes
 ######################################################################
@@ -645,26 +659,40 @@ class Synset(_WordNetObject):
         if self._name == '*ROOT*':
             return {self: 0}
 
-        queue = deque([(self, 0)])
-        path = {}
-
-        while queue:
-            s, depth = queue.popleft()
-            if s in path:
-                continue
-            path[s] = depth
-
-            depth += 1
-            queue.extend((hyp, depth) for hyp in s._hypernyms())
-            queue.extend((hyp, depth) for hyp in s._instance_hypernyms())
+        path = self._hypernym_depths()
 
         if simulate_root:
+            path = dict(path)
             fake_synset = Synset(None)
             fake_synset._name = '*ROOT*'
             path[fake_synset] = max(path.values()) + 1
 
         return path
 
+    def _hypernym_depths(self):
+        """
+        :return: A dictionary mapping this synset and each of its
+        (instance) hypernyms to the length of the shortest hypernym path
+        that leads to it.  The dictionary is computed once and cached, so
+        it must not be modified.
+        """
+        if "_hypernym_depth_map" not in self.__dict__:
+            queue = deque([(self, 0)])
+            path = {}
+
+            while queue:
+                s, depth = queue.popleft()
+                if s in path:
+                    continue
+                path[s] = depth
+
+                depth += 1
+                queue.extend((hyp, depth) for hyp in s._hypernyms())
+                queue.extend((hyp, depth) for hyp in s._instance_hypernyms())
+
+            self._hypernym_depth_map = path
+        return self._hypernym_depth_map
+
     def shortest_path_distance(self, other, simulate_root=False):
         """
         Returns the distance of the shortest path linking the two synsets (if
@@ -1051,11 +1079,16 @@ class WordNetCorpusReader(CorpusReader):
             assert int(index) == i
             self._lexnames.append(lexname)
 
-        # Load the indices for lemmas and synset offsets
-        self._load_lemma_pos_offset_map()
-
-        # load the exception file data into memory
-        self._load_exception_map()
+        # Load the indices for lemmas and synset offsets, and the
+        # exception file data, from the compiled index if there is one
+        if not self._load_compiled_index():
+            self._load_lemma_pos_offset_map()
+            self._load_exception_map()
+            if WORDNET_INDEX_DIR is not None:
+                try:
+                    self.compile_index()
+                except (IOError, OSError):
+                    pass
 
 # Open Multilingual WordNet functions, contributed by
 # Nasruddin A’aidil Shari, Sim Wei Ying Geraldine, and Soe Lynn
@@ -1157,6 +1190,100 @@ class WordNetCorpusReader(CorpusReader):
                 self._exception_map[pos][terms[0]] = terms[1:]
         self._exception_map[ADJ_SAT] = self._exception_map[ADJ]
 
+    def compile_index(self, path=None):
+        """
+        Compile the lemma index and the exception lists of this WordNet
+        into a binary file, which later readers of the same WordNet
+        memory-map instead of parsing the ``index.*`` and ``*.exc``
+        files.  Looking up lemmas in the compiled index takes a binary
+        search rather than a dictionary lookup, but loading it takes
+        no time, and its pages are shared by all the processes that use
+        it.  This reader switches to the compiled index as well.
+
+        :param path: The file to write the index to.  Defaults to a file
+            in ``WORDNET_INDEX_DIR``, if it is set, or else in the
+            WordNet corpus directory.
+        :return: The path of the compiled index.
+        """
+        if path is None:
+            path = self._compiled_index_path()
+            if path is None:
+                raise WordNetError('WordNet is not in a directory; a path '
+                                   'for the compiled index must be given')
+        if isinstance(self._lemma_pos_offset_map, _CompiledLemmaIndex):
+            self._lemma_pos_offset_map = defaultdict(dict)
+            self._exception_map = {}
+            self._load_lemma_pos_offset_map()
+            self._load_exception_map()
+
+        lemma_index = [(lemma, ';'.join('%s %s' % (pos, ' '.join(map(str, offsets)))
+                                        for pos, offsets in pos_offsets.items()
+                                        if pos != ADJ_SAT))
+                       for lemma, pos_offsets in self._lemma_pos_offset_map.items()]
+        tables = [lemma_index]
+        for pos in POS_LIST:
+            tables.append([(form, ' '.join(lemmas)) for form, lemmas
+                           in self._exception_map[pos].items()])
+
+        directory = os.path.dirname(os.path.abspath(path))
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+        fd, tmp = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as outfile:
+            _write_compiled_index(outfile, self._index_signature(), tables)
+        os.rename(tmp, path)
+        self._load_compiled_index(path)
+        return path
+
+    def _compiled_index_path(self):
+        """
+        Return the path of the compiled index of this WordNet, or None if
+        it has no default location.
+        """
+        root = self._root
+        if WORDNET_INDEX_DIR is not None:
+            name = hashlib.md5(repr(root).encode('utf8')).hexdigest()
+            return os.path.join(WORDNET_INDEX_DIR, 'wordnet-%s.idx' % name)
+        if isinstance(root, FileSystemPathPointer):
+            return os.path.join(root.path, 'index.compiled')
+        return None
+
+    def _index_signature(self):
+        """
+        Return a string that identifies the version of the index and
+        exception files that a compiled index was built from: the size
+        of each, and its modification time, or its CRC if it is in a
+        zip file.
+        """
+        fileids = (['index.%s' % suffix for suffix in sorted(self._FILEMAP.values())] +
+                   ['%s.exc' % suffix for suffix in sorted(self._FILEMAP.values())])
+        return ' '.join('%s:%s' % (fileid, _file_version(self._root.join(fileid)))
+                        for fileid in fileids)
+
+    def _load_compiled_index(self, path=None):
+        """
+        Memory-map the compiled index at ``path`` (by default, at its
+        default location), if it exists and is up to date, and use it for
+        the lemma index and the exception lists.  Return true if the
+        compiled index was loaded.
+        """
+        if path is None:
+            path = self._compiled_index_path()
+        if path is None or not os.path.exists(path):
+            return False
+        try:
+            tables = _open_compiled_index(path, self._index_signature())
+        except (IOError, OSError, ValueError, struct.error):
+            return False
+        if tables is None:
+            return False
+        self._lemma_pos_offset_map = _CompiledLemmaIndex(*tables[0])
+        self._exception_map = dict(
+            (pos, _CompiledExceptions(*table))
+            for pos, table in zip(POS_LIST, tables[1:]))
+        self._exception_map[ADJ_SAT] = self._exception_map[ADJ]
+        return True
+
     def _compute_max_depth(self, pos, simulate_root):
         """
         Compute the max depth for the given part of speech.  This is
@@ -1626,6 +1753,176 @@ class WordNetCorpusReader(CorpusReader):
         return synset1.lin_similarity(synset2, ic, verbose)
     lin_similarity.__doc__ = Synset.lin_similarity.__doc__
 
+    def pairwise_similarity(self, synsets1, synsets2=None, metric='path',
+                            ic=None, simulate_root=True):
+        """
+        Return a matrix of the similarity of each synset in ``synsets1``
+        to each synset in ``synsets2``, by one of the similarity measures
+        ``'path'``, ``'lch'``, ``'wup'``, ``'res'``, ``'jcn'`` or ``'lin'``.
+        Entry ``[i, j]`` is the score that ``synsets1[i].<metric>_similarity
+        (synsets2[j])`` returns, except that it is NaN where that method
+        returns None or raises a ``WordNetError`` (such as for synsets of
+        different parts of speech).
+
+        Rather than searching the hypernym hierarchy for each pair, the
+        hypernym distances of every synset are computed (once, and then
+        cached), and laid out as the rows of a matrix over the union of
+        their ancestors.  Shortest paths, common subsumers and their
+        information content are then found for all pairs at once with
+        array operations.
+
+        :param synsets1: The synsets for the rows of the matrix.
+        :type synsets1: list(Synset)
+        :param synsets2: The synsets for the columns of the matrix.
+            Defaults to ``synsets1``.
+        :type synsets2: list(Synset)
+        :param metric: The name of the similarity measure.
+        :param ic: An information content object (as returned by
+            ``nltk.corpus.wordnet_ic.ic()``), for the ``'res'``, ``'jcn'``
+            and ``'lin'`` measures.
+        :param simulate_root: See ``Synset.path_similarity()``.
+        :rtype: numpy.ndarray
+        """
+        import numpy
+
+        if synsets2 is None:
+            synsets2 = synsets1
+        synsets1, synsets2 = list(synsets1), list(synsets2)
+        if metric not in ('path', 'lch', 'wup', 'res', 'jcn', 'lin'):
+            raise ValueError('Unknown similarity measure %r' % metric)
+        if metric in ('res', 'jcn', 'lin') and ic is None:
+            raise ValueError('The %r similarity measure requires an '
+                             'information content object' % metric)
+        result = numpy.empty((len(synsets1), len(synsets2)))
+        result.fill(numpy.nan)
+        if not synsets1 or not synsets2:
+            return result
+
+        # Number the synsets and all their hypernyms; the last column
+        # stands for the fake root that connects all the taxonomies.
+        columns = {}
+        for synset in chain(synsets1, synsets2):
+            for ancestor in synset._hypernym_depths():
+                columns.setdefault(ancestor, len(columns))
+        ancestors = sorted(columns, key=columns.get)
+        root = len(ancestors)
+
+        def distances(synsets):
+            matrix = numpy.empty((len(synsets), root + 1))
+            matrix.fill(numpy.inf)
+            for i, synset in enumerate(synsets):
+                depths = synset._hypernym_depths()
+                for ancestor, depth in iteritems(depths):
+                    matrix[i, columns[ancestor]] = depth
+                matrix[i, root] = max(depths.values()) + 1
+            return matrix
+
+        # dist1[i, k] is the distance from synsets1[i] to ancestor k, if
+        # it is one.  Each row of synsets1 decides whether the fake root
+        # is used for its pairs, as the Synset methods do.
+        dist1 = distances(synsets1)
+        dist2 = distances(synsets2)
+        dist2_no_root = dist2.copy()
+        dist2_no_root[:, root] = numpy.inf
+        need_root = {}
+        for i, synset in enumerate(synsets1):
+            if synset._pos not in need_root:
+                need_root[synset._pos] = bool(simulate_root and
+                                              synset._needs_root())
+            if not need_root[synset._pos]:
+                dist1[i, root] = numpy.inf
+
+        pos2 = numpy.array([synset._pos for synset in synsets2])
+
+        if metric in ('path', 'lch'):
+            for i, synset in enumerate(synsets1):
+                dist2_i = dist2 if need_root[synset._pos] else dist2_no_root
+                path = (dist1[i] + dist2_i).min(axis=1)
+                if metric == 'path':
+                    scores = 1.0 / (path + 1)
+                else:
+                    if synset._pos not in self._max_depth:
+                        self._compute_max_depth(synset._pos,
+                                                synset._needs_root())
+                    depth = self._max_depth[synset._pos]
+                    if depth == 0:
+                        continue
+                    scores = -numpy.log((path + 1) / (2.0 * depth))
+                    scores[pos2 != synset._pos] = numpy.nan
+                scores[numpy.isinf(path)] = numpy.nan
+                result[i] = scores
+
+        elif metric == 'wup':
+            # The subsumer of a pair is the common hypernym with the
+            # greatest min_depth (and then the first name), as chosen by
+            # Synset.lowest_common_hypernyms(use_min_depth=True).
+            min_depths = [s.min_depth() for s in ancestors] + [0]
+            max_depths = numpy.array([s.max_depth() for s in ancestors] + [0])
+            names = [s._name for s in ancestors] + ['*ROOT*']
+            order = sorted(range(root + 1),
+                           key=lambda k: (-min_depths[k], names[k]))
+            priority = numpy.empty(root + 1)
+            priority[order] = numpy.arange(root + 1)
+            # The distances from each ancestor to its own hypernyms.
+            dist_anc = distances(ancestors)
+            dist_anc = numpy.vstack([dist_anc, numpy.empty(root + 1)])
+            dist_anc[root] = numpy.inf
+            dist_anc[root, root] = 0
+            dist_anc_no_root = dist_anc.copy()
+            dist_anc_no_root[:, root] = numpy.inf
+            dist_anc_no_root[root, root] = 0
+
+            for i, synset in enumerate(synsets1):
+                if need_root[synset._pos]:
+                    dist2_i, dist_anc_i = dist2, dist_anc
+                else:
+                    dist2_i, dist_anc_i = dist2_no_root, dist_anc_no_root
+                common = numpy.isfinite(dist1[i]) & numpy.isfinite(dist2_i)
+                found = common.any(axis=1)
+                subsumers = numpy.where(common, priority,
+                                        numpy.inf).argmin(axis=1)
+                dist_sub = dist_anc_i[subsumers]
+                depth = max_depths[subsumers] + 1
+                len1 = (dist1[i] + dist_sub).min(axis=1) + depth
+                len2 = (dist2_i + dist_sub).min(axis=1) + depth
+                scores = (2.0 * depth) / (len1 + len2)
+                scores[~found | numpy.isinf(len1) | numpy.isinf(len2)] = numpy.nan
+                result[i] = scores
+
+        else:
+            def content(synset):
+                try:
+                    return information_content(synset, ic)
+                except WordNetError:
+                    return numpy.nan
+            ancestor_ic = numpy.array([content(s) for s in ancestors])
+            ic1 = numpy.array([content(s) for s in synsets1])
+            ic2 = numpy.array([content(s) for s in synsets2])
+            finite2 = numpy.isfinite(dist2[:, :root])
+
+            for i, synset in enumerate(synsets1):
+                common = numpy.isfinite(dist1[i, :root]) & finite2
+                lcs_ic = numpy.where(common, ancestor_ic, -numpy.inf).max(axis=1)
+                lcs_ic[~common.any(axis=1)] = 0
+                with numpy.errstate(divide='ignore', invalid='ignore'):
+                    if metric == 'res':
+                        scores = lcs_ic
+                    elif metric == 'lin':
+                        scores = (2.0 * lcs_ic) / (ic1[i] + ic2)
+                    else:
+                        difference = ic1[i] + ic2 - 2 * lcs_ic
+                        scores = 1 / difference
+                        scores[difference == 0] = _INF
+                        scores[(ic1[i] == 0) | (ic2 == 0)] = 0
+                scores[numpy.isnan(ic1[i]) | numpy.isnan(ic2) |
+                       (pos2 != synset._pos)] = numpy.nan
+                if metric == 'jcn':
+                    scores[numpy.array([synset == other
+                                        for other in synsets2])] = _INF
+                result[i] = scores
+
+        return result
+
     #////////////////////////////////////////////////////////////
     # Morphy
     #////////////////////////////////////////////////////////////
@@ -1785,6 +2082,174 @@ class WordNetCorpusReader(CorpusReader):
         return ic
 
 
+######################################################################
+## Compiled WordNet Index
+######################################################################
+
+# A compiled index file consists of the magic string, the length of the
+# signature of the source files, the signature, the number of tables, and
+# the file position of each table.  A table of n entries consists of n,
+# followed by 2n+1 file positions p, such that the key of the i-th entry
+# is data[p[2i]:p[2i+1]] and its value is data[p[2i+1]:p[2i+2]].  Keys and
+# values are utf8-encoded, and the entries are sorted by key.
+
+_COMPILED_INDEX_MAGIC = b'NLTKWN01'
+
+def _file_version(pointer):
+    """
+    Return a string that changes whenever the file at the path pointer
+    ``pointer`` does: its size, and its modification time, or the CRC
+    of its contents if it is in a zip file.
+    """
+    if isinstance(pointer, FileSystemPathPointer):
+        stat = os.stat(pointer.path)
+        return '%d:%r' % (stat.st_size, stat.st_mtime)
+    if isinstance(pointer, ZipFilePathPointer):
+        info = pointer.zipfile.getinfo(pointer.entry)
+        return '%d:%08x' % (info.file_size, info.CRC)
+    return '%d' % pointer.file_size()
+
+def _write_compiled_index(outfile, signature, tables):
+    """
+    Write the tables, each a list of (key, value) string pairs, to
+    ``outfile`` as a compiled index.
+    """
+    signature = signature.encode('utf8')
+    header = (_COMPILED_INDEX_MAGIC + struct.pack('<I', len(signature)) +
+              signature + struct.pack('<I', len(tables)))
+    pos = len(header) + 4 * len(tables)
+    chunks = []
+    table_positions = []
+    for table in tables:
+        entries = sorted((key.encode('utf8'), value.encode('utf8'))
+                         for key, value in table)
+        table_positions.append(pos)
+        data_pos = pos + 4 + 4 * (2 * len(entries) + 1)
+        positions = [data_pos]
+        for key, value in entries:
+            positions.append(positions[-1] + len(key))
+            positions.append(positions[-1] + len(value))
+        chunks.append(struct.pack('<I', len(entries)))
+        chunks.append(struct.pack('<%dI' % len(positions), *positions))
+        for key, value in entries:
+            chunks.append(key)
+            chunks.append(value)
+        pos = positions[-1]
+    outfile.write(header)
+    outfile.write(struct.pack('<%dI' % len(tables), *table_positions))
+    for chunk in chunks:
+        outfile.write(chunk)
+
+def _open_compiled_index(path, signature):
+    """
+    Memory-map the compiled index at ``path``, and return a list of
+    ``(data, position)`` pairs for its tables; or None if it was not
+    compiled from source files with the given signature.
+    """
+    with open(path, 'rb') as infile:
+        data = mmap.mmap(infile.fileno(), 0, access=mmap.ACCESS_READ)
+    magic_len = len(_COMPILED_INDEX_MAGIC)
+    if data[:magic_len] != _COMPILED_INDEX_MAGIC:
+        return None
+    pos = magic_len + 4
+    signature_len, = struct.unpack_from('<I', data, magic_len)
+    if data[pos:pos+signature_len].decode('utf8') != signature:
+        return None
+    pos += signature_len
+    n_tables, = struct.unpack_from('<I', data, pos)
+    table_positions = struct.unpack_from('<%dI' % n_tables, data, pos + 4)
+    return [(data, table_pos) for table_pos in table_positions]
+
+class _CompiledTable(object):
+    """
+    A read-only dictionary from strings to strings, backed by a table
+    of a memory-mapped compiled index.
+    """
+    def __init__(self, data, pos):
+        self._data = data
+        self._size, = struct.unpack_from('<I', data, pos)
+        self._positions = pos + 4
+
+    def _entry(self, i):
+        return struct.unpack_from('<3I', self._data, self._positions + 8*i)
+
+    def _key(self, i):
+        start, end, _ = self._entry(i)
+        return self._data[start:end]
+
+    def _find(self, key):
+        """Return the index of the entry for ``key``, or -1."""
+        key = key.encode('utf8')
+        lo, hi = 0, self._size
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._key(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self._size and self._key(lo) == key:
+            return lo
+        return -1
+
+    def _decode(self, value):
+        return value
+
+    def __getitem__(self, key):
+        i = self._find(key)
+        if i < 0:
+            raise KeyError(key)
+        _, start, end = self._entry(i)
+        return self._decode(self._data[start:end].decode('utf8'))
+
+    def get(self, key, default=None):
+        if key in self:
+            return self[key]
+        return default
+
+    def __contains__(self, key):
+        return self._find(key) >= 0
+
+    def __len__(self):
+        return self._size
+
+    def __iter__(self):
+        for i in xrange(self._size):
+            yield self._key(i).decode('utf8')
+
+    def keys(self):
+        return list(self)
+
+    def items(self):
+        return [(key, self[key]) for key in self]
+
+class _CompiledLemmaIndex(_CompiledTable):
+    """
+    A compiled map from lemma -> pos -> synset_index -> offset.
+    """
+    def _decode(self, value):
+        pos_offsets = {}
+        for part in value.split(';'):
+            fields = part.split()
+            pos_offsets[fields[0]] = [int(offset) for offset in fields[1:]]
+        if ADJ in pos_offsets:
+            pos_offsets[ADJ_SAT] = pos_offsets[ADJ]
+        return pos_offsets
+
+    def __getitem__(self, key):
+        # Like the defaultdict it replaces, return {} for unknown lemmas.
+        i = self._find(key)
+        if i < 0:
+            return {}
+        _, start, end = self._entry(i)
+        return self._decode(self._data[start:end].decode('utf8'))
+
+class _CompiledExceptions(_CompiledTable):
+    """
+    A compiled map from an inflected form to its base forms.
+    """
+    def _decode(self, value):
+        return value.split()
+
 ######################################################################
 ## WordNet Information Content Corpus Reader
 ######################################################################
@@ -1870,6 +2335,18 @@ def lin_similarity(synset1, synset2, ic, verbose=False):
 lin_similarity.__doc__ = Synset.lin_similarity.__doc__
 
 
+def pairwise_similarity(synsets1, synsets2=None, metric='path', ic=None,
+                        simulate_root=True):
+    synsets1 = list(synsets1)
+    if not synsets1:
+        import numpy
+        return numpy.empty((0, len(list(synsets2 or []))))
+    reader = synsets1[0]._wordnet_corpus_reader
+    return reader.pairwise_similarity(synsets1, synsets2, metric, ic,
+                                      simulate_root)
+pairwise_similarity.__doc__ = WordNetCorpusReader.pairwise_similarity.__doc__
+
+
 def _lcs_ic(synset1, synset2, ic, verbose=False):
     """
     Get the information content of the least common subsumer that has
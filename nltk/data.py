@@ -701,6 +701,8 @@ FORMATS = {
             "nltk.sem.logic.LogicParser.  Requires an additional logic_parser "
             "parameter",
     'val': "A semantic valuation, parsed by nltk.sem.Valuation.fromstring.",
+    'punkt': "A Punkt sentence tokenizer, stored by "
+            "nltk.tokenize.punkt.save_punkt.",
     'raw': "The raw (byte string) contents of a file.",
     'text': "The raw (unicode string) contents of a file. "
 }
@@ -718,6 +720,7 @@ AUTO_FORMATS = {
     'fol': 'fol',
     'logic': 'logic',
     'val': 'val',
+    'punkt': 'punkt',
     'txt': 'text',
     'text': 'text',
 }
@@ -738,6 +741,7 @@ def load(resource_url, format='auto', cache=True, verbose=False,
       - ``fol`` (formulas of First Order Logic)
       - ``logic`` (Logical formulas to be parsed by the given logic_parser)
       - ``val`` (valuation of First Order Logic model)
+      - ``punkt`` (Punkt sentence tokenizers)
       - ``text`` (the file contents as a unicode string)
       - ``raw`` (the raw file contents as a byte string)
 
@@ -745,7 +749,8 @@ def load(resource_url, format='auto', cache=True, verbose=False,
     format based on the resource name's file extension.  If that
     fails, ``load()`` will raise a ``ValueError`` exception.
 
-    For all text formats (everything except ``pickle``, ``json``, ``yaml`` and ``raw``),
+    For all text formats (everything except ``pickle``, ``json``, ``yaml``,
+    ``punkt`` and ``raw``),
     it tries to decode the raw contents using UTF-8, and if that doesn't
     work, it tries with ISO-8859-1 (Latin-1), unless the ``encoding``
     is specified.
@@ -823,6 +828,9 @@ def load(resource_url, format='auto', cache=True, verbose=False,
     elif format == 'yaml':
         import yaml
         resource_val = yaml.load(opened_resource)
+    elif format == 'punkt':
+        from nltk.tokenize.punkt import load_punkt
+        resource_val = load_punkt(opened_resource)
     else:
         # The resource is a text format.
         binary_data = opened_resource.read()
@@ -18,6 +18,9 @@ import types
 import sys
 import stat
 import locale
+import gc
+import threading
+from contextlib import contextmanager
 
 # Use the c version of ElementTree, which is faster, if possible:
 try:
@@ -972,6 +975,120 @@ def is_writable(path):
     # [xx] should we do other checks on other platforms?
     return True
 
+######################################################################
+# Multiprocessing
+######################################################################
+
+def fork_context():
+    """
+    Return a multiprocessing context whose workers are forked from the
+    current process, or None if the platform cannot fork.
+    """
+    import multiprocessing
+    if not hasattr(multiprocessing, 'get_context'):
+        # Python 2 always forks on POSIX platforms.
+        return multiprocessing if os.name == 'posix' else None
+    if 'fork' in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context('fork')
+    return None
+
+# The object that the current worker process of ``process_pool()`` shares.
+_pool_shared = None
+
+def _init_pool_worker(shared):
+    global _pool_shared
+    _pool_shared = shared
+
+def pool_shared():
+    """
+    Return the object shared with the current worker process of
+    ``process_pool()``.
+    """
+    return _pool_shared
+
+@contextmanager
+def process_pool(workers=None, shared=None):
+    """
+    Return a context manager for a multiprocessing pool of *workers*
+    processes, in which ``pool_shared()`` returns *shared*.  The pool is
+    terminated on exit.
+
+    Where the platform supports it, the workers are forked from the
+    current process, so *shared* (such as a loaded model) is shared
+    with them through copy-on-write memory rather than pickled; the
+    garbage collector is frozen across the fork so that it does not
+    touch, and so copy, the shared pages.  Elsewhere *shared* is
+    pickled once per worker.
+
+    :param workers: The number of worker processes.  Defaults to the
+        number of CPUs.
+    :type workers: int
+    """
+    import multiprocessing
+    context = fork_context() or multiprocessing
+    frozen = context is not multiprocessing and hasattr(gc, 'freeze')
+    if frozen:
+        gc.freeze()
+    try:
+        pool = context.Pool(workers, _init_pool_worker, (shared,))
+    finally:
+        if frozen:
+            gc.unfreeze()
+    try:
+        yield pool
+    finally:
+        pool.terminate()
+        pool.join()
+
+def process_imap(func, tasks, workers=None, shared=None, ordered=True):
+    """
+    Generate the results of applying *func* to each of *tasks* in a
+    ``process_pool()`` of *workers* processes that share *shared*: in
+    the order of *tasks* if *ordered*, and otherwise as soon as they are
+    ready.  *tasks* is read lazily, and at most ``2 * workers`` tasks are
+    sent to the pool ahead of the consumer, so it may be an iterable of
+    any size.  *func* must be a module-level function, and may read
+    *shared* with ``pool_shared()``.
+    """
+    if workers is None:
+        import multiprocessing
+        workers = multiprocessing.cpu_count()
+    semaphore = threading.Semaphore(2 * workers)
+    stopped = []
+
+    def throttled():
+        for task in tasks:
+            semaphore.acquire()
+            if stopped:
+                return
+            yield task
+
+    with process_pool(workers, shared) as pool:
+        imap = pool.imap if ordered else pool.imap_unordered
+        try:
+            for result in imap(func, throttled()):
+                semaphore.release()
+                yield result
+        finally:
+            # Wake the pool's task thread if it is waiting for a slot,
+            # so that the pool can be terminated.
+            stopped.append(True)
+            semaphore.release()
+
+def iter_chunks(iterable, size):
+    """
+    Generate the consecutive lists of *size* items of *iterable*; the
+    last one may be shorter.
+    """
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
 ######################################################################
 # NLTK Error reporting
 ######################################################################
@@ -43,6 +43,10 @@ import math
 import random
 import warnings
 import array
+import heapq
+import hashlib
+import itertools
+import struct
 from operator import itemgetter
 from collections import defaultdict
 from functools import reduce
@@ -389,6 +393,305 @@ class FreqDist(Counter):
         return '<FreqDist with %d samples and %d outcomes>' % (len(self), self.N())
 
 
+@compat.python_2_unicode_compatible
+class SketchFreqDist(object):
+    """
+    A frequency distribution that uses a fixed amount of memory, however
+    many samples it counts.  Counts are stored in a Count-Min sketch
+    (Cormode and Muthukrishnan, 2005): ``depth`` rows of ``width``
+    counters, where each sample increments one counter per row, chosen
+    by a hash of the sample.  The count of a sample is estimated as the
+    smallest of its counters.  Estimates never undercount, and with
+    probability ``confidence`` they overcount by at most
+    ``error * N()``; see ``error_bound()``.
+
+    Since the sketch does not store the samples themselves, the
+    ``top`` samples with the highest estimated counts are tracked
+    separately, and are the samples reported by ``most_common()``
+    and ``max()``.  ``B()`` is estimated from the number of counters
+    that are still zero.
+
+        >>> from nltk.probability import SketchFreqDist
+        >>> fdist = SketchFreqDist('abracadabra', error=0.01, top=3)
+        >>> fdist['a'], fdist.N()
+        (5, 11)
+        >>> fdist['z'] += 2
+        >>> fdist['z']
+        2
+        >>> fdist.most_common(1)
+        [('a', 5)]
+
+    Sketches with the same ``error``, ``confidence`` and ``seed``
+    can be merged with ``+`` or ``merge()``, so that partial counts
+    made by separate processes can be combined.  The samples are
+    hashed with MD5 of their text (or their ``repr()``), so the
+    counters do not depend on Python's per-process hash seed.
+
+    :param samples: The samples to count.
+    :type samples: Sequence or dict
+    :param error: The overcount, as a fraction of ``N()``, which
+        estimates are unlikely to exceed.  Memory use is proportional
+        to ``1 / error``.
+    :type error: float
+    :param confidence: The probability that an estimate is within the
+        error bound.  Memory use is proportional to
+        ``log(1 / (1 - confidence))``.
+    :type confidence: float
+    :param top: The number of most frequent samples to track.
+    :type top: int
+    :param seed: Selects the hash functions.
+    :type seed: int
+    """
+
+    def __init__(self, samples=None, error=0.0001, confidence=0.999,
+                 top=1000, seed=0):
+        self._error = error
+        self._confidence = confidence
+        self._width = int(math.ceil(math.e / error))
+        self._depth = int(math.ceil(math.log(1 / (1 - confidence))))
+        self._top_size = top
+        self._seed = compat.text_type(seed).encode('utf-8')
+        self._tables = [array.array(str('q'), [0] * self._width)
+                        for i in range(self._depth)]
+        self._zeros = [self._width] * self._depth
+        self._N = 0
+        self._top = {}
+        self._heap = []
+        self._ticks = itertools.count()
+        if samples is not None:
+            self.update(samples)
+
+    def _cells(self, sample):
+        """
+        Return the index of the counter for ``sample`` in each row.
+        """
+        if isinstance(sample, compat.text_type):
+            data = sample.encode('utf-8')
+        elif isinstance(sample, bytes):
+            data = sample
+        else:
+            data = repr(sample).encode('utf-8')
+        h1, h2 = struct.unpack('<QQ', hashlib.md5(self._seed + data).digest())
+        return [(h1 + i * h2) % self._width for i in range(self._depth)]
+
+    def _estimate(self, cells):
+        return min(table[j] for table, j in zip(self._tables, cells))
+
+    def increment(self, sample, count=1):
+        """
+        Record ``count`` more outcomes of ``sample``.
+
+        :param sample: The sample to count.
+        :param count: The number of outcomes, which must not be negative.
+        :type count: int
+        """
+        if count < 0:
+            raise ValueError('A SketchFreqDist cannot decrease counts.')
+        if not count:
+            return
+        cells = self._cells(sample)
+        for i, (table, j) in enumerate(zip(self._tables, cells)):
+            if not table[j]:
+                self._zeros[i] -= 1
+            table[j] += count
+        self._N += count
+        self._track(sample, self._estimate(cells))
+
+    def _track(self, sample, estimate):
+        """
+        Update the tracked most frequent samples with a new estimate for
+        ``sample``.  The heap of (estimate, tick, sample) entries is
+        cleaned lazily: an entry is stale if its estimate is no longer the
+        one recorded for its sample in ``self._top``.
+        """
+        heap = self._heap
+        if sample not in self._top and len(self._top) >= self._top_size:
+            while heap and self._top.get(heap[0][2]) != heap[0][0]:
+                heapq.heappop(heap)
+            if not heap or estimate <= heap[0][0]:
+                return
+            del self._top[heapq.heappop(heap)[2]]
+        self._top[sample] = estimate
+        heapq.heappush(heap, (estimate, next(self._ticks), sample))
+        if len(heap) > 2 * self._top_size + 64:
+            self._heap = [(est, next(self._ticks), s)
+                          for s, est in self._top.items()]
+            heapq.heapify(self._heap)
+
+    def update(self, samples):
+        """
+        Count each of ``samples``; or, if ``samples`` is a dict, add the
+        counts it maps each sample to.
+
+        :type samples: Sequence or dict
+        """
+        if hasattr(samples, 'items'):
+            for sample, count in samples.items():
+                self.increment(sample, count)
+        else:
+            for sample in samples:
+                self.increment(sample)
+
+    def __getitem__(self, sample):
+        return self._estimate(self._cells(sample))
+
+    def __setitem__(self, sample, count):
+        # Supports ``fdist[sample] += n``, which sets the estimate plus n.
+        self.increment(sample, count - self[sample])
+
+    def __contains__(self, sample):
+        return self[sample] > 0
+
+    def __len__(self):
+        return self.B()
+
+    def N(self):
+        """
+        Return the total number of sample outcomes that have been
+        recorded.  This count is exact.
+
+        :rtype: int
+        """
+        return self._N
+
+    def B(self):
+        """
+        Return an estimate of the number of sample values with counts
+        greater than zero, from the fraction of counters in each row that
+        are still zero (linear counting).  The estimate degrades once the
+        number of distinct samples is several times the sketch width.
+
+        :rtype: int
+        """
+        width = self._width
+        estimates = [-width * math.log(max(zeros, 1) / width)
+                     for zeros in self._zeros]
+        return int(round(sum(estimates) / len(estimates)))
+
+    def freq(self, sample):
+        """
+        Return the estimated frequency of a given sample, its estimated
+        count divided by ``N()``.
+
+        :rtype: float
+        """
+        if self._N == 0:
+            return 0
+        return self[sample] / self._N
+
+    def error_bound(self):
+        """
+        Return the amount by which an estimated count may exceed the
+        true count.  Any single estimate is within this bound with
+        probability ``confidence``.
+
+        :rtype: float
+        """
+        return self._error * self._N
+
+    def most_common(self, n=None):
+        """
+        Return the ``n`` most frequent of the tracked samples (all of
+        them by default), with their estimated counts, most frequent
+        first.
+
+        :rtype: list(tuple)
+        """
+        items = sorted(((sample, self[sample]) for sample in self._top),
+                       key=itemgetter(1), reverse=True)
+        return items if n is None else items[:n]
+
+    def max(self):
+        """
+        Return the sample with the greatest estimated count.
+
+        :rtype: any
+        """
+        if not self._top:
+            raise ValueError('A SketchFreqDist must have at least one sample before max is defined.')
+        return self.most_common(1)[0][0]
+
+    def merge(self, other):
+        """
+        Add the counts recorded by another ``SketchFreqDist`` with the
+        same parameters to this one.  The merged sketch is identical to
+        one that had counted both sets of samples, except that the
+        tracked samples are chosen from those tracked by either.
+
+        :type other: SketchFreqDist
+        """
+        if (self._width, self._depth, self._seed) != \
+           (other._width, other._depth, other._seed):
+            raise ValueError('Only SketchFreqDists with the same error, '
+                             'confidence and seed can be merged.')
+        for table, other_table in zip(self._tables, other._tables):
+            for j, count in enumerate(other_table):
+                if count:
+                    table[j] += count
+        self._zeros = [table.count(0) for table in self._tables]
+        self._N += other._N
+        candidates = set(self._top) | set(other._top)
+        self._top = {}
+        self._heap = []
+        for sample in candidates:
+            self._track(sample, self[sample])
+
+    def copy(self):
+        """
+        Create a copy of this frequency distribution.
+
+        :rtype: SketchFreqDist
+        """
+        result = SketchFreqDist(error=self._error, confidence=self._confidence,
+                                top=self._top_size)
+        result._seed = self._seed
+        result.merge(self)
+        return result
+
+    def __add__(self, other):
+        """
+        Add counts from two sketches.  See ``merge()``.
+        """
+        result = self.copy()
+        result.merge(other)
+        return result
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_heap'], state['_ticks']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._ticks = itertools.count()
+        self._heap = [(est, next(self._ticks), s) for s, est in self._top.items()]
+        heapq.heapify(self._heap)
+
+    _cumulative_frequencies = FreqDist.__dict__['_cumulative_frequencies']
+    tabulate = FreqDist.__dict__['tabulate']
+    plot = FreqDist.__dict__['plot']
+    pprint = FreqDist.__dict__['pprint']
+
+    def pformat(self, maxlen=10):
+        """
+        Return a string representation of this SketchFreqDist.
+
+        :param maxlen: The maximum number of items to display
+        :type maxlen: int
+        :rtype: string
+        """
+        items = ['{0!r}: {1!r}'.format(*item) for item in self.most_common(maxlen)]
+        if len(self._top) > maxlen:
+            items.append('...')
+        return 'SketchFreqDist({{{0}}})'.format(', '.join(items))
+
+    def __repr__(self):
+        return self.pformat()
+
+    def __str__(self):
+        return '<SketchFreqDist with ~%d samples and %d outcomes>' % (self.B(), self.N())
+
+
 ##//////////////////////////////////////////////////////
 ##  Probability Distributions
 ##//////////////////////////////////////////////////////
@@ -1961,6 +2264,137 @@ class ConditionalFreqDist(defaultdict):
         return '<ConditionalFreqDist with %d conditions>' % len(self)
 
 
+class SketchConditionalFreqDist(object):
+    """
+    A conditional frequency distribution that uses a fixed amount of
+    memory, however many conditions and samples it counts.  All the
+    (condition, sample) pairs share a single ``SketchFreqDist``, and the
+    total count for each condition is kept in a second one, so that
+    ``cfdist[condition].freq(sample)`` can be estimated.  Indexing with a
+    condition returns a view with the ``FreqDist`` counting interface,
+    whose ``most_common()`` lists the tracked (condition, sample) pairs
+    for that condition.
+
+        >>> from nltk.probability import SketchConditionalFreqDist
+        >>> cfdist = SketchConditionalFreqDist(
+        ...     (len(word), word) for word in 'the the the dog dog cat a'.split())
+        >>> cfdist[3]['the'], cfdist[3].N(), cfdist[3].freq('dog')
+        (3, 6, 0.3333333333333333)
+
+    The keyword arguments are passed on to both ``SketchFreqDist``
+    instances.  Distributions created with the same arguments can be
+    merged with ``+`` or ``merge()``.
+
+    :param cond_samples: The samples to initialize the conditional
+        frequency distribution with
+    :type cond_samples: Sequence of (condition, sample) tuples
+    """
+    def __init__(self, cond_samples=None, **kwargs):
+        self._joint = SketchFreqDist(**kwargs)
+        self._marginal = SketchFreqDist(**kwargs)
+        if cond_samples:
+            for (cond, sample) in cond_samples:
+                self.increment(cond, sample)
+
+    def increment(self, condition, sample, count=1):
+        """
+        Record ``count`` more outcomes of ``sample`` under ``condition``.
+        """
+        self._joint.increment((condition, sample), count)
+        self._marginal.increment(condition, count)
+
+    def __getitem__(self, condition):
+        return _SketchConditionView(self, condition)
+
+    def conditions(self):
+        """
+        Return the most frequent conditions, which are the only ones
+        that are tracked.
+
+        :rtype: list
+        """
+        return [cond for cond, count in self._marginal.most_common()]
+
+    def N(self):
+        """
+        Return the total number of sample outcomes that have been
+        recorded by this ``SketchConditionalFreqDist``.
+
+        :rtype: int
+        """
+        return self._marginal.N()
+
+    def error_bound(self):
+        """
+        Return the amount by which an estimated count may exceed the
+        true count; see ``SketchFreqDist.error_bound()``.
+
+        :rtype: float
+        """
+        return self._joint.error_bound()
+
+    def merge(self, other):
+        """
+        Add the counts recorded by another ``SketchConditionalFreqDist``
+        with the same parameters to this one.
+        """
+        self._joint.merge(other._joint)
+        self._marginal.merge(other._marginal)
+
+    def __add__(self, other):
+        """
+        Add counts from two ``SketchConditionalFreqDist``.
+        """
+        result = SketchConditionalFreqDist()
+        result._joint = self._joint + other._joint
+        result._marginal = self._marginal + other._marginal
+        return result
+
+    def __repr__(self):
+        return '<SketchConditionalFreqDist with %d outcomes>' % self.N()
+
+
+class _SketchConditionView(object):
+    """
+    The frequency distribution for one condition of a
+    ``SketchConditionalFreqDist``.
+    """
+    def __init__(self, cfdist, condition):
+        self._cfdist = cfdist
+        self._condition = condition
+
+    def __getitem__(self, sample):
+        return self._cfdist._joint[(self._condition, sample)]
+
+    def __setitem__(self, sample, count):
+        # Supports ``cfdist[condition][sample] += n``.
+        self._cfdist.increment(self._condition, sample, count - self[sample])
+
+    def N(self):
+        return self._cfdist._marginal[self._condition]
+
+    def freq(self, sample):
+        n = self.N()
+        if n == 0:
+            return 0
+        return self[sample] / n
+
+    def most_common(self, n=None):
+        items = [(sample, count) for (cond, sample), count
+                 in self._cfdist._joint.most_common()
+                 if cond == self._condition]
+        return items if n is None else items[:n]
+
+    def max(self):
+        items = self.most_common(1)
+        if not items:
+            raise ValueError('No tracked samples for condition %r.' % (self._condition,))
+        return items[0][0]
+
+    def __repr__(self):
+        return '<SketchFreqDist view for condition %r>' % (self._condition,)
+
+
 @compat.python_2_unicode_compatible
 class ConditionalProbDistI(dict):
     """
@@ -2352,5 +2786,5 @@ __all__ = ['ConditionalFreqDist', 'ConditionalProbDist',
            'FreqDist', 'SimpleGoodTuringProbDist', 'HeldoutProbDist',
            'ImmutableProbabilisticMixIn', 'LaplaceProbDist', 'LidstoneProbDist',
            'MLEProbDist', 'MutableProbDist', 'KneserNeyProbDist', 'ProbDistI', 'ProbabilisticMixIn',
-           'UniformProbDist', 'WittenBellProbDist', 'add_logs',
+           'SketchConditionalFreqDist', 'SketchFreqDist', 'UniformProbDist', 'WittenBellProbDist', 'add_logs',
            'log_likelihood', 'sum_logs', 'entropy']
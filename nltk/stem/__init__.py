@@ -21,7 +21,7 @@ morphological rules, and part-of-speech and sense ambiguities
 StemmerI defines a standard interface for stemmers.
 """
 
-from nltk.stem.api import StemmerI
+from nltk.stem.api import StemmerI, CachedStemmer, CachedLemmatizer
 from nltk.stem.regexp import RegexpStemmer
 from nltk.stem.lancaster import LancasterStemmer
 from nltk.stem.isri import ISRIStemmer
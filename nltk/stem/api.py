@@ -7,6 +7,10 @@
 # URL: <http://nltk.org/>
 # For license information, see LICENSE.TXT
 
+from collections import OrderedDict
+
+from nltk.collections import CacheInfo
+
 class StemmerI(object):
     """
     A processing interface for removing morphological affixes from
@@ -22,4 +26,166 @@ class StemmerI(object):
         """
         raise NotImplementedError()
 
+    def stem_many(self, tokens):
+        """
+        Return the stems of *tokens*, stemming each distinct token only
+        once, so that stemming a corpus costs the number of its types
+        rather than of its tokens.
+
+        :param tokens: The tokens that should be stemmed.
+        :type tokens: iter(str)
+        :rtype: list(str)
+        """
+        return _apply_many(self.stem, tokens)
+
+
+def _apply_many(function, items):
+    """
+    Return ``[function(item) for item in items]``, calling ``function``
+    only once for each distinct item.
+    """
+    items = list(items)
+    results = dict((item, None) for item in items)
+    for item in results:
+        results[item] = function(item)
+    return [results[item] for item in items]
+
+
+class _LRUCache(object):
+    """
+    A mapping from the arguments of a function to its results, which
+    keeps the ``maxsize`` most recently used results.
+    """
+    def __init__(self, function, maxsize):
+        self._function = function
+        self._results = OrderedDict()
+        self.maxsize = maxsize
+        self.hits = self.misses = 0
+
+    def __call__(self, *args):
+        if args in self._results:
+            result = self._results.pop(args)
+            self.hits += 1
+        else:
+            result = self._function(*args)
+            self.misses += 1
+            if self.maxsize < 1:
+                return result
+            while len(self._results) >= self.maxsize:
+                self._results.popitem(last=False)
+        self._results[args] = result
+        return result
+
+    def info(self):
+        return CacheInfo(self.hits, self.misses, self.maxsize,
+                         len(self._results))
+
+    def clear(self):
+        self._results.clear()
+        self.hits = self.misses = 0
+
+
+class CachedStemmer(StemmerI):
+    """
+    A stemmer that remembers the stems of the words it stemmed most
+    recently, and only passes other words on to a given stemmer.  As
+    word frequencies are skewed, a cache of a few thousand words answers
+    most lookups of a typical text.
+
+        >>> from nltk.stem import CachedStemmer, PorterStemmer
+        >>> stemmer = CachedStemmer(PorterStemmer(), maxsize=1000)
+        >>> stemmer.stem_many(['running', 'runs', 'running', 'ran'])
+        ['run', 'run', 'run', 'ran']
+        >>> stemmer.stem('runs')
+        'run'
+        >>> stemmer.cache_info()
+        CacheInfo(hits=1, misses=3, maxsize=1000, currsize=3)
+    """
+    def __init__(self, stemmer, maxsize=10000):
+        """
+        :param stemmer: The stemmer whose stems should be cached.
+        :type stemmer: StemmerI
+        :param maxsize: The maximum number of stems to cache.
+        :type maxsize: int
+        """
+        self._stemmer = stemmer
+        self._cache = _LRUCache(stemmer.stem, maxsize)
+
+    def stem(self, token):
+        return self._cache(token)
+
+    def cache_info(self):
+        """
+        Return the hit and miss counts and the size of the cache, as a
+        ``CacheInfo``.
+
+        :rtype: CacheInfo
+        """
+        return self._cache.info()
+
+    def clear_cache(self):
+        """
+        Discard the cached stems and reset the cache statistics.
+        """
+        self._cache.clear()
+
+    def __repr__(self):
+        return 'CachedStemmer(%r, maxsize=%d)' % (self._stemmer,
+                                                  self._cache.maxsize)
+
+
+class CachedLemmatizer(object):
+    """
+    A lemmatizer that remembers the lemmas of the words it lemmatized
+    most recently, and only passes other words on to a given lemmatizer,
+    such as a ``WordNetLemmatizer``.
+    """
+    def __init__(self, lemmatizer, maxsize=10000):
+        """
+        :param lemmatizer: The lemmatizer whose lemmas should be cached.
+        :param maxsize: The maximum number of lemmas to cache.
+        :type maxsize: int
+        """
+        self._lemmatizer = lemmatizer
+        self._cache = _LRUCache(self._lemmatize, maxsize)
+
+    def _lemmatize(self, word, pos):
+        if pos is None:
+            return self._lemmatizer.lemmatize(word)
+        return self._lemmatizer.lemmatize(word, pos)
+
+    def lemmatize(self, word, pos=None):
+        """
+        Return the lemma of *word*; if *pos* is None, the lemmatizer's
+        default part of speech is used.
+        """
+        return self._cache(word, pos)
+
+    def lemmatize_many(self, words, pos=None):
+        """
+        Return the lemmas of *words*, lemmatizing each distinct word only
+        once.
+
+        :type words: iter(str)
+        :rtype: list(str)
+        """
+        return _apply_many(lambda word: self._cache(word, pos), words)
+
+    def cache_info(self):
+        """
+        Return the hit and miss counts and the size of the cache, as a
+        ``CacheInfo``.
+
+        :rtype: CacheInfo
+        """
+        return self._cache.info()
+
+    def clear_cache(self):
+        """
+        Discard the cached lemmas and reset the cache statistics.
+        """
+        self._cache.clear()
 
+    def __repr__(self):
+        return 'CachedLemmatizer(%r, maxsize=%d)' % (self._lemmatizer,
+                                                     self._cache.maxsize)
@@ -10,6 +10,7 @@ from __future__ import unicode_literals
 from nltk.corpus.reader.wordnet import NOUN
 from nltk.corpus import wordnet
 from nltk.compat import python_2_unicode_compatible
+from nltk.stem.api import _apply_many
 
 @python_2_unicode_compatible
 class WordNetLemmatizer(object):
@@ -40,6 +41,16 @@ class WordNetLemmatizer(object):
         lemmas = wordnet._morphy(word, pos)
         return min(lemmas, key=len) if lemmas else word
 
+    def lemmatize_many(self, words, pos=NOUN):
+        """
+        Return the lemmas of *words*, lemmatizing each distinct word only
+        once.
+
+        :type words: iter(str)
+        :rtype: list(str)
+        """
+        return _apply_many(lambda word: self.lemmatize(word, pos), words)
+
     def __repr__(self):
         return '<WordNetLemmatizer>'
 
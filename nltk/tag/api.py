@@ -12,7 +12,7 @@ information, such as its part of speech.
 """
 from itertools import chain
 
-from nltk.internals import overridden
+from nltk.internals import overridden, process_imap, pool_shared, iter_chunks
 from nltk.metrics import accuracy
 
 from nltk.tag.util import untag
@@ -44,12 +44,23 @@ class TaggerI(object):
         else:
             raise NotImplementedError()
 
-    def tag_sents(self, sentences):
+    def tag_sents(self, sentences, workers=1, chunksize=100):
         """
         Apply ``self.tag()`` to each element of *sentences*.  I.e.:
 
             return [self.tag(sent) for sent in sentences]
+
+        If *workers* is greater than 1, the sentences are split into
+        chunks of *chunksize* sentences and tagged by a pool of worker
+        processes; see ``parallel_tag_sents()``.
+
+        :param workers: The number of worker processes to use.
+        :type workers: int
+        :param chunksize: The number of sentences sent to a worker at a time.
+        :type chunksize: int
         """
+        if workers > 1:
+            return parallel_tag_sents(self, sentences, workers, chunksize)
         return [self.tag(sent) for sent in sentences]
 
     def evaluate(self, gold):
@@ -72,6 +83,39 @@ class TaggerI(object):
         if (train and model) or (not train and not model):
             raise ValueError('Must specify either training data or trained model.')
 
+def _tag_chunk(chunk_and_kwargs):
+    chunk, kwargs = chunk_and_kwargs
+    return pool_shared().tag_sents(chunk, **kwargs)
+
+def parallel_tag_sents(tagger, sentences, workers, chunksize=100, **kwargs):
+    """
+    Tag *sentences* with *tagger* in a pool of *workers* processes, and
+    return the tagged sentences in their original order.  Each task is a
+    chunk of *chunksize* sentences, tagged in the worker with
+    ``tagger.tag_sents(chunk, **kwargs)``.
+
+    The pool is a ``nltk.internals.process_pool()``: where the platform
+    supports it, the workers are forked after the tagger has been
+    loaded, so they share its model through copy-on-write memory instead
+    of receiving a pickled copy with every task.  At most ``2 * workers``
+    chunks are queued at any time, so *sentences* may be a lazy iterable
+    of any size.
+
+    :param tagger: The tagger to apply.
+    :type tagger: TaggerI
+    :param sentences: The sentences to tag.
+    :type sentences: iter(list(str))
+    :param workers: The number of worker processes.
+    :type workers: int
+    :param chunksize: The number of sentences sent to a worker at a time.
+    :type chunksize: int
+    :param kwargs: Further keyword arguments for ``tagger.tag_sents()``.
+    :rtype: list(list(tuple(str, str)))
+    """
+    tasks = ((chunk, kwargs) for chunk in iter_chunks(sentences, chunksize))
+    return list(chain.from_iterable(
+        process_imap(_tag_chunk, tasks, workers, tagger)))
+
 class FeaturesetTaggerI(TaggerI):
     """
     A tagger that requires tokens to be ``featuresets``.  A featureset
@@ -86,7 +86,7 @@ from nltk.probability import (FreqDist, ConditionalFreqDist,
 from nltk.metrics import accuracy
 from nltk.util import LazyMap, unique_list
 from nltk.compat import python_2_unicode_compatible, izip, imap
-from nltk.tag.api import TaggerI
+from nltk.tag.api import TaggerI, parallel_tag_sents
 
 
 _TEXT = 0  # index of text in a tuple
@@ -139,6 +139,7 @@ class HiddenMarkovModelTagger(TaggerI):
         self._outputs = outputs
         self._priors = priors
         self._cache = None
+        self._tables = None
         self._transform = transform
 
     @classmethod
@@ -349,6 +350,46 @@ class HiddenMarkovModelTagger(TaggerI):
 
     def reset_cache(self):
         self._cache = None
+        self._tables = None
+
+    def _log_tables(self, symbols=()):
+        """
+        Return the float64 log probability tables used by the batched
+        forward-backward algorithms.  These are laid out like the cache
+        (see ``_create_cache``) as a tuple (P, O, X, S), where the symbol
+        mapping S interns the model's symbols followed by any new
+        *symbols*.  Unlike the cache, new symbols are not added to the
+        model's own symbol list.
+        """
+        if self._tables is None:
+            N = len(self._states)
+            P = np.fromiter((self._priors.logprob(si) for si in self._states),
+                            np.float64, N)
+            X = self._transitions_matrix().T
+            self._tables = (P, np.zeros((N, 0), np.float64), X, {})
+            symbols = itertools.chain(self._symbols, symbols)
+        P, O, X, S = self._tables
+        new = [symbol for symbol in unique_list(symbols) if symbol not in S]
+        if new:
+            O = np.hstack([O, np.array([self._outputs_vector(symbol)
+                                        for symbol in new]).T])
+            for symbol in new:
+                S[symbol] = len(S)
+            self._tables = (P, O, X, S)
+        return self._tables
+
+    def _encode_batch(self, sequences, S):
+        """
+        Return the symbols of a batch of sequences as a B by T array of
+        symbol numbers from the mapping *S*, padded with zeros after the end
+        of each sequence, and an array of the sequence lengths.
+        """
+        lengths = np.array([len(sequence) for sequence in sequences], int)
+        T = lengths.max() if len(sequences) else 0
+        symbols = np.zeros((len(sequences), T), int)
+        for b, sequence in enumerate(sequences):
+            symbols[b, :len(sequence)] = [S[symbol] for symbol in sequence]
+        return symbols, lengths
 
     def best_path(self, unlabeled_sequence):
         """
@@ -392,6 +433,88 @@ class HiddenMarkovModelTagger(TaggerI):
         sequence.reverse()
         return list(map(self._states.__getitem__, sequence))
 
+    def best_paths(self, unlabeled_sequences):
+        """
+        Returns the optimal state sequence for each of a batch of symbol
+        sequences.  This runs the same Viterbi algorithm as ``best_path()``,
+        but over all the sequences at once: the sequences are padded to a
+        common length and each time step is computed for the whole batch
+        with a single array operation.  The result is identical to calling
+        ``best_path()`` on each sequence.
+
+        :return: the state sequences
+        :rtype: list(list)
+        :param unlabeled_sequences: the sequences of unlabeled symbols
+        :type unlabeled_sequences: list(list)
+        """
+        unlabeled_sequences = [self._transform(sequence)
+                               for sequence in unlabeled_sequences]
+        return self._best_paths(unlabeled_sequences)
+
+    def _best_paths(self, unlabeled_sequences):
+        self._create_cache()
+        symbols = unique_list(itertools.chain(*unlabeled_sequences))
+        self._update_cache([symbol for symbol in symbols
+                            if symbol not in self._cache[3]])
+        P, O, X, S = self._cache
+        ids, lengths = self._encode_batch(unlabeled_sequences, S)
+        B, T = ids.shape
+        N = len(self._states)
+        if not T:
+            return [[] for sequence in unlabeled_sequences]
+
+        V = np.zeros((B, N), np.float32)
+        backpointers = np.zeros((B, T, N), int)
+        last = np.zeros((B, N), np.float32)
+
+        V[:] = P + O[:, ids[:, 0]].T
+        ends = lengths == 1
+        last[ends] = V[ends]
+        for t in range(1, T):
+            vs = V[:, :, np.newaxis] + X
+            best = vs.argmax(axis=1)
+            backpointers[:, t] = best
+            V = vs.max(axis=1) + O[:, ids[:, t]].T
+            ends = lengths == t + 1
+            last[ends] = V[ends]
+
+        paths = []
+        for b, length in enumerate(lengths):
+            if not length:
+                paths.append([])
+                continue
+            current = np.argmax(last[b])
+            sequence = [current]
+            for t in range(length - 1, 0, -1):
+                current = backpointers[b, t, current]
+                sequence.append(current)
+            sequence.reverse()
+            paths.append(list(map(self._states.__getitem__, sequence)))
+        return paths
+
+    def tag_sents(self, sentences, workers=1, chunksize=100):
+        """
+        Tags each of a list of sequences with its highest probability state
+        sequence, running the Viterbi algorithm over the whole batch at once
+        (see ``best_paths()``).
+
+        :return: a list of labelled sequences of symbols
+        :rtype: list(list)
+        :param sentences: the sequences of unlabeled symbols
+        :type sentences: list(list)
+        :param workers: the number of worker processes to use, see
+            ``nltk.tag.api.parallel_tag_sents()``
+        :type workers: int
+        :param chunksize: the number of sequences sent to a worker at a time
+        :type chunksize: int
+        """
+        if workers > 1:
+            return parallel_tag_sents(self, sentences, workers, chunksize)
+        sentences = [self._transform(sentence) for sentence in sentences]
+        paths = self._best_paths(sentences)
+        return [list(izip(sentence, path))
+                for sentence, path in izip(sentences, paths)]
+
     def best_path_simple(self, unlabeled_sequence):
         """
         Returns the state sequence of the optimal (most probable) path through
@@ -757,6 +880,81 @@ class HiddenMarkovModelTagger(TaggerI):
 
         return beta
 
+    def _forward_backward_batch(self, symbols, lengths, tables,
+                                backward=True):
+        """
+        Compute the forward (and, unless *backward* is false, the backward)
+        probabilities of a padded batch of sequences, as B by T by N arrays
+        of log-probabilities.  Entries past the end of a sequence are -inf.
+
+        :param symbols: the B by T array of symbol numbers
+        :param lengths: the length of each sequence
+        :param tables: the tables returned by ``_log_tables()``
+        """
+        P, O, X, S = tables
+        B, T = symbols.shape
+        N = len(self._states)
+        # outputs[b, t, i] = log P(symbol[b, t] | state i)
+        outputs = O.T[symbols]
+        valid = np.arange(T) < lengths[:, np.newaxis]
+
+        alpha = _ninf_array((B, T, N))
+        if T:
+            alpha[:, 0] = P + outputs[:, 0]
+        for t in range(1, T):
+            summand = alpha[:, t-1, :, np.newaxis] + X
+            alpha[:, t] = _logsumexp2(summand, axis=1) + outputs[:, t]
+        alpha[~valid] = -np.inf
+        if not backward:
+            return alpha, None
+
+        beta = _ninf_array((B, T, N))
+        for t in range(T-1, -1, -1):
+            if t < T-1:
+                summand = X + (outputs[:, t+1] + beta[:, t+1])[:, np.newaxis, :]
+                beta[:, t] = _logsumexp2(summand, axis=2)
+            beta[lengths == t + 1, t] = np.log2(1)
+        beta[~valid] = -np.inf
+        return alpha, beta
+
+    def _forward_probabilities(self, unlabeled_sequences):
+        """
+        Return the forward probability matrices of a batch of sequences, a
+        B by T by N array of log-probabilities, where B is the number of
+        sequences, T is the length of the longest sequence and N is the
+        number of states.  Entry (b, t, s) is entry (t, s) of
+        ``_forward_probability(unlabeled_sequences[b])``, up to floating
+        point rounding; entries past the end of a sequence are -inf.
+
+        :param unlabeled_sequences: the sequences of unlabeled symbols
+        :type unlabeled_sequences: list(list)
+        :return: the forward log probability matrices
+        :rtype: array
+        """
+        sequences = [[token[_TEXT] for token in sequence]
+                     for sequence in unlabeled_sequences]
+        tables = self._log_tables(itertools.chain(*sequences))
+        symbols, lengths = self._encode_batch(sequences, tables[3])
+        return self._forward_backward_batch(symbols, lengths, tables,
+                                            backward=False)[0]
+
+    def _backward_probabilities(self, unlabeled_sequences):
+        """
+        Return the backward probability matrices of a batch of sequences, a
+        B by T by N array of log-probabilities laid out as for
+        ``_forward_probabilities()``.
+
+        :param unlabeled_sequences: the sequences of unlabeled symbols
+        :type unlabeled_sequences: list(list)
+        :return: the backward log probability matrices
+        :rtype: array
+        """
+        sequences = [[token[_TEXT] for token in sequence]
+                     for sequence in unlabeled_sequences]
+        tables = self._log_tables(itertools.chain(*sequences))
+        symbols, lengths = self._encode_batch(sequences, tables[3])
+        return self._forward_backward_batch(symbols, lengths, tables)[1]
+
     def test(self, test_sequence, verbose=False, **kwargs):
         """
         Tests the HiddenMarkovModelTagger instance.
@@ -898,6 +1096,53 @@ class HiddenMarkovModelTrainer(object):
 
         return lpk, A_numer, A_denom, B_numer, B_denom
 
+    def _baum_welch_batch(self, sequences, model, symbol_to_number):
+        """
+        Compute the expected counts of a batch of sequences with the batched
+        forward-backward algorithm.  The counts are those ``_baum_welch_step``
+        computes for each sequence, already divided by the probability of
+        their sequence and summed over the batch.
+        """
+        N = len(model._states)
+        M = len(symbol_to_number)
+
+        sequences = [[token[_TEXT] for token in sequence]
+                     for sequence in sequences]
+        tables = model._log_tables(itertools.chain(*sequences))
+        P, O, X, S = tables
+        symbols, lengths = model._encode_batch(sequences, S)
+        B, T = symbols.shape
+        alpha, beta = model._forward_backward_batch(symbols, lengths, tables)
+
+        # the log probability of each sequence
+        lpk = _logsumexp2(alpha[np.arange(B), lengths - 1], axis=1)
+
+        # gamma[b, t, i] is the log of the expected count of state i at t
+        gamma = alpha + beta - lpk[:, np.newaxis, np.newaxis]
+        valid = np.arange(T) < lengths[:, np.newaxis]
+        not_last = np.arange(T) < (lengths - 1)[:, np.newaxis]
+
+        A_numer = _ninf_array((N, N))
+        outputs = O.T[symbols]
+        for t in range(T - 1):
+            rows = not_last[:, t]
+            if not rows.any():
+                break
+            xi = (alpha[rows, t, :, np.newaxis] + X +
+                  (outputs[rows, t+1] + beta[rows, t+1])[:, np.newaxis, :] -
+                  lpk[rows, np.newaxis, np.newaxis])
+            A_numer = np.logaddexp2(A_numer, _logsumexp2(xi, axis=0))
+
+        A_denom = _logsumexp2(gamma[not_last], axis=0)
+        B_denom = _logsumexp2(gamma[valid], axis=0)
+
+        # symbols outside the model's alphabet are dropped, as they have no
+        # output probabilities to update
+        B_numer = _ninf_array((max(M, len(S)), N))
+        np.logaddexp2.at(B_numer, symbols[valid], gamma[valid])
+
+        return lpk.sum(), A_numer, A_denom, B_numer[:M].T, B_denom
+
     def train_unsupervised(self, unlabeled_sequences, update_outputs=True,
                            **kwargs):
         """
@@ -921,6 +1166,10 @@ class HiddenMarkovModelTrainer(object):
         :param max_iterations: the maximum number of EM iterations
         :param convergence_logprob: the maximum change in log probability to
             allow convergence
+        :param batch_size: if given, compute the expected counts for this
+            many sequences at a time, using precomputed log probability
+            matrices and the batched forward-backward algorithm, rather than
+            one sequence at a time
         """
 
         # create a uniform HMM, which will be iteratively refined, unless
@@ -964,6 +1213,7 @@ class HiddenMarkovModelTrainer(object):
         iteration = 0
         max_iterations = kwargs.get('max_iterations', 1000)
         epsilon = kwargs.get('convergence_logprob', 1e-6)
+        batch_size = kwargs.get('batch_size')
 
         while not converged and iteration < max_iterations:
             A_numer = _ninf_array((N, N))
@@ -972,23 +1222,37 @@ class HiddenMarkovModelTrainer(object):
             B_denom = _ninf_array(N)
 
             logprob = 0
-            for sequence in unlabeled_sequences:
-                sequence = list(sequence)
-                if not sequence:
-                    continue
+            if batch_size:
+                # the tables must reflect the current model parameters
+                model.reset_cache()
+                for batch in _batches(unlabeled_sequences, batch_size):
+                    (batch_logprob, batch_A_numer, batch_A_denom,
+                    batch_B_numer, batch_B_denom) = self._baum_welch_batch(batch, model, symbol_numbers)
+
+                    A_numer = np.logaddexp2(A_numer, batch_A_numer)
+                    B_numer = np.logaddexp2(B_numer, batch_B_numer)
+                    A_denom = np.logaddexp2(A_denom, batch_A_denom)
+                    B_denom = np.logaddexp2(B_denom, batch_B_denom)
+
+                    logprob += batch_logprob
+            else:
+                for sequence in unlabeled_sequences:
+                    sequence = list(sequence)
+                    if not sequence:
+                        continue
 
-                (lpk, seq_A_numer, seq_A_denom,
-                seq_B_numer, seq_B_denom) = self._baum_welch_step(sequence, model, symbol_numbers)
+                    (lpk, seq_A_numer, seq_A_denom,
+                    seq_B_numer, seq_B_denom) = self._baum_welch_step(sequence, model, symbol_numbers)
 
-                # add these sums to the global A and B values
-                for i in range(N):
-                    A_numer[i] = np.logaddexp2(A_numer[i], seq_A_numer[i]-lpk)
-                    B_numer[i] = np.logaddexp2(B_numer[i], seq_B_numer[i]-lpk)
+                    # add these sums to the global A and B values
+                    for i in range(N):
+                        A_numer[i] = np.logaddexp2(A_numer[i], seq_A_numer[i]-lpk)
+                        B_numer[i] = np.logaddexp2(B_numer[i], seq_B_numer[i]-lpk)
 
-                A_denom = np.logaddexp2(A_denom, seq_A_denom-lpk)
-                B_denom = np.logaddexp2(B_denom, seq_B_denom-lpk)
+                    A_denom = np.logaddexp2(A_denom, seq_A_denom-lpk)
+                    B_denom = np.logaddexp2(B_denom, seq_B_denom-lpk)
 
-                logprob += lpk
+                    logprob += lpk
 
             # use the calculated values to update the transition and output
             # probability values
@@ -1101,6 +1365,35 @@ def logsumexp2(arr):
     return np.log2(np.sum(2**(arr - max_))) + max_
 
 
+def _logsumexp2(arr, axis):
+    """
+    Like ``logsumexp2``, but reduces along the given axis, and gives -inf
+    rather than nan where all the values being added are -inf.
+    """
+    max_ = arr.max(axis=axis)
+    max_ = np.where(np.isfinite(max_), max_, 0)
+    with np.errstate(divide='ignore'):
+        return np.log2(np.sum(2**(arr - np.expand_dims(max_, axis)),
+                              axis=axis)) + max_
+
+
+def _batches(sequences, size):
+    """
+    Yield lists of up to *size* non-empty sequences from *sequences*.
+    """
+    batch = []
+    for sequence in sequences:
+        sequence = list(sequence)
+        if not sequence:
+            continue
+        batch.append(sequence)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
 def _log_add(*values):
     """
     Adds the logged values, returning the logarithm of the addition.
@@ -0,0 +1,490 @@
+# -*- coding: utf-8 -*-
+# Natural Language Toolkit: Tokenizer and Stemmer Benchmarks
+#
+# Copyright (C) 2001-2017 NLTK Project
+# URL: <http://nltk.org/>
+# For license information, see LICENSE.TXT
+
+"""
+Benchmarks for NLTK's tokenizers and stemmers.
+
+Each benchmark runs a tokenizer or stemmer over a text, which is either
+a synthetic text generated from a fixed seed, or one or more text files
+given on the command line, so that it runs offline and reproducibly.  It
+reports the time taken by each of its stages, the throughput of each in
+(whitespace-separated) tokens of the benchmark's text per second, and
+its peak memory allocation.  The results are written as JSON, and can be
+compared with those of another run, e.g. of an earlier commit::
+
+    python -m nltk.test.benchmark --output before.json
+    (update NLTK)
+    python -m nltk.test.benchmark --output after.json --compare before.json
+
+The comparison exits with status 1 if any stage of a benchmark became
+slower by more than the ``--threshold`` fraction.  Benchmarks whose
+models or data are not installed (e.g. the Punkt models used by
+``word_tokenize()``) are reported as skipped.
+"""
+from __future__ import print_function, division, unicode_literals
+
+import argparse
+import io
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+from collections import OrderedDict
+from timeit import default_timer
+
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+
+import nltk
+
+######################################################################
+#{ Synthetic text
+######################################################################
+
+_STEMS = ('time person year way day thing man world life hand part child '
+          'eye woman place work week case point government company number '
+          'group problem fact be have do say get make go know take see '
+          'come think look want give use find tell ask work seem feel try '
+          'leave call good new first last long great little own other old '
+          'right big high different small large next early young important '
+          'few public bad same able nation walk talk market price run '
+          'develop consider rule open happen connect govern argue').split()
+_SUFFIXES = ['', '', '', 's', 'ed', 'ing', 'er', 'ly', 'ness', 'ment',
+             'ation', 'ful', 'less', 'ize', 'izing', 'ies']
+_FUNCTION_WORDS = ('the of and to a in that is was he for it with as his '
+                   'on be at by I this had not are but from or have an '
+                   'they which one you were her all she there would').split()
+_ABBREVIATIONS = ['Mr.', 'Mrs.', 'Dr.', 'Prof.', 'Inc.', 'Jan.', 'etc.',
+                  'e.g.', 'U.S.', 'St.']
+_CONTRACTIONS = ["don't", "can't", "it's", "they'll", "we've", "I'm",
+                 "won't", "she'd", "cannot", "gonna"]
+_PUNCTUATION = [',', ',', ';', ':', ' --', '!', '?']
+_TWEET_TOKENS = ['@nltk_org', '#nlp', '#python', ':-)', ';)', '<3', ':D',
+                 'http://nltk.org/book', 'sooooo', 'LOL', '...', '!!!']
+
+
+def synthetic_text(n_sentences=2000, seed=0, tweets=False):
+    """
+    Return a list of ``n_sentences`` English-like sentences, whose words
+    follow a Zipfian distribution, with abbreviations, contractions,
+    quotes, numbers and punctuation.  If *tweets* is true, the sentences
+    also contain handles, hashtags, emoticons and URLs.  The same
+    arguments always give the same text.
+
+    :rtype: list(str)
+    """
+    rand = random.Random(seed)
+    words = _FUNCTION_WORDS + [stem + suffix for suffix in _SUFFIXES
+                               for stem in _STEMS]
+    weights = [1.0 / rank for rank in range(1, len(words) + 1)]
+    total = sum(weights)
+    cumulative = []
+    for weight in weights:
+        cumulative.append((cumulative[-1] if cumulative else 0) + weight / total)
+
+    def word():
+        roll = rand.random()
+        if roll < 0.03:
+            return rand.choice(_ABBREVIATIONS)
+        if roll < 0.06:
+            return rand.choice(_CONTRACTIONS)
+        if roll < 0.08:
+            return '%d.%02d' % (rand.randint(0, 999), rand.randint(0, 99))
+        if tweets and roll < 0.14:
+            return rand.choice(_TWEET_TOKENS)
+        point = rand.random()
+        lo, hi = 0, len(cumulative) - 1
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if cumulative[mid] < point:
+                lo = mid + 1
+            else:
+                hi = mid
+        return words[lo]
+
+    sentences = []
+    for i in range(n_sentences):
+        tokens = [word() for j in range(rand.randint(3, 30))]
+        tokens[0] = tokens[0][:1].upper() + tokens[0][1:]
+        for j in range(1, len(tokens) - 1):
+            if rand.random() < 0.08:
+                tokens[j] += rand.choice(_PUNCTUATION)
+        sentence = ' '.join(tokens)
+        if rand.random() < 0.1:
+            sentence = '"%s," he said' % sentence
+        elif rand.random() < 0.05:
+            sentence = '(%s)' % sentence
+        sentences.append(sentence + rand.choice('...?!'))
+    return sentences
+
+######################################################################
+#{ Benchmarks
+######################################################################
+
+#: The registered benchmarks, as (name, function, tweets) triples.  Each
+#: function takes a ``Corpus``, and returns a list of (stage name,
+#: function) pairs.  The stages are run in order, each function
+#: receiving the result of the previous stage (None for the first).
+#: ``tweets`` is true if the benchmark runs on the corpus's tweets
+#: rather than its sentences.
+BENCHMARKS = []
+
+def benchmark(name, tweets=False):
+    """
+    A decorator that registers a function as the benchmark *name*, which
+    runs on the tweets of the corpus if *tweets* is true, and otherwise
+    on its sentences.
+    """
+    def register(function):
+        BENCHMARKS.append((name, function, tweets))
+        return function
+    return register
+
+
+class Corpus(object):
+    """
+    The text a benchmark is run on: its sentences, the whole text, and
+    its whitespace-separated words; and a text of tweets, and its words.
+    """
+    def __init__(self, sentences, tweets):
+        self.sentences = sentences
+        self.tweets = tweets
+        self.text = '  '.join(sentences)
+        self.words = self.text.split()
+        self.tweet_words = ' '.join(tweets).split()
+
+
+@benchmark('treebank')
+def _treebank(corpus):
+    from nltk.tokenize import TreebankWordTokenizer
+    tokenize = TreebankWordTokenizer().tokenize
+    return [('tokenize', lambda _: [tokenize(s) for s in corpus.sentences])]
+
+
+@benchmark('word_tokenize')
+def _word_tokenize(corpus):
+    from nltk.tokenize import sent_tokenize, word_tokenize
+    sent_tokenize('Warm up.')  # Load the model, or raise LookupError.
+    return [('sent_tokenize', lambda _: sent_tokenize(corpus.text)),
+            ('word_tokenize', lambda sents: [word_tokenize(s) for s in sents])]
+
+
+@benchmark('punkt')
+def _punkt(corpus):
+    from nltk.tokenize.punkt import PunktTrainer, PunktSentenceTokenizer
+
+    def train(_):
+        trainer = PunktTrainer(corpus.text)
+        return PunktSentenceTokenizer(trainer.get_params())
+    return [('train', train),
+            ('tokenize', lambda tokenizer: tokenizer.tokenize(corpus.text))]
+
+
+@benchmark('tweet', tweets=True)
+def _tweet(corpus):
+    from nltk.tokenize import TweetTokenizer
+    tokenize = TweetTokenizer(reduce_len=True).tokenize
+    return [('tokenize', lambda _: [tokenize(s) for s in corpus.tweets])]
+
+
+@benchmark('moses')
+def _moses(corpus):
+    from nltk.tokenize.moses import MosesTokenizer
+    tokenize = MosesTokenizer().tokenize
+    return [('tokenize', lambda _: [tokenize(s) for s in corpus.sentences])]
+
+
+@benchmark('toktok')
+def _toktok(corpus):
+    from nltk.tokenize import ToktokTokenizer
+    tokenize = ToktokTokenizer().tokenize
+    return [('tokenize', lambda _: [tokenize(s) for s in corpus.sentences])]
+
+
+@benchmark('mwe')
+def _mwe(corpus):
+    from nltk.tokenize import MWETokenizer
+    # A lexicon of n-grams of the text, so that most words begin an
+    # expression, and of place names that do not occur in it, as in a
+    # large gazetteer.
+    rand = random.Random(0)
+    words = corpus.words
+    mwes = [tuple(words[i:i + rand.randint(2, 4)])
+            for i in rand.sample(range(len(words) - 4), len(words) // 4)]
+    mwes += [(rand.choice(['New', 'North', 'Port', 'San']), 'Place%d' % i)
+             for i in range(50000)]
+    sentences = [sentence.split() for sentence in corpus.sentences]
+
+    def compile(_):
+        tokenizer = MWETokenizer(mwes)
+        tokenizer.tokenize([])  # Compile the lexicon, where that is lazy.
+        return tokenizer
+    return [('compile', compile),
+            ('tokenize', lambda tokenizer: [tokenizer.tokenize(s)
+                                            for s in sentences])]
+
+
+def _stemmer_benchmark(name, make_stemmer):
+    def stemmer_benchmark(corpus):
+        stemmer = make_stemmer()
+        words = [word.strip('.,;:!?"()').lower() for word in corpus.words]
+        return [('stem', lambda _: [stemmer.stem(word) for word in words]),
+                ('stem_many', lambda _: stemmer.stem_many(words))]
+    benchmark(name)(stemmer_benchmark)
+
+def _porter():
+    from nltk.stem import PorterStemmer
+    return PorterStemmer()
+
+def _lancaster():
+    from nltk.stem import LancasterStemmer
+    return LancasterStemmer()
+
+_stemmer_benchmark('porter', _porter)
+_stemmer_benchmark('lancaster', _lancaster)
+for _language in ['english', 'german', 'french', 'spanish', 'dutch',
+                  'russian']:
+    def _snowball(language=_language):
+        from nltk.stem import SnowballStemmer
+        return SnowballStemmer(language)
+    _stemmer_benchmark('snowball-' + _language, _snowball)
+
+######################################################################
+#{ Running benchmarks
+######################################################################
+
+def _run_stages(stages):
+    """
+    Run the stages once, and return the time taken by each.
+    """
+    times = []
+    result = None
+    for name, function in stages:
+        start = default_timer()
+        result = function(result)
+        times.append(default_timer() - start)
+    return times
+
+
+def _peak_memory(stages):
+    """
+    Run the stages once, and return the peak number of bytes allocated
+    while doing so, or None if that cannot be measured.
+    """
+    if tracemalloc is None:
+        return None
+    started = tracemalloc.is_tracing()
+    if not started:
+        tracemalloc.start()
+    try:
+        if hasattr(tracemalloc, 'reset_peak'):
+            tracemalloc.reset_peak()
+        else:
+            tracemalloc.clear_traces()
+        baseline = tracemalloc.get_traced_memory()[0]
+        _run_stages(stages)
+        return max(tracemalloc.get_traced_memory()[1] - baseline, 0)
+    finally:
+        if not started:
+            tracemalloc.stop()
+
+
+def run_benchmarks(corpus, names=None, repeat=3, memory=True):
+    """
+    Run the benchmarks in *names* (by default, all of them) on *corpus*,
+    and return their results as a dict from benchmark names to dicts
+    with the keys:
+
+      - ``tokens``: the number of words of the text the benchmark runs
+        on, the corpus's sentences or its tweets.
+      - ``seconds``: the total time of the stages.
+      - ``stages``: a dict from each stage to a dict of its time in
+        ``seconds``, and its throughput in ``tokens_per_sec``, the
+        number of words divided by that time.
+      - ``peak_memory``: the peak number of bytes allocated, or None.
+
+    Times are the minimum over *repeat* runs.  Memory is measured in a
+    separate run, as tracing allocations slows down the code.  The
+    result for a benchmark whose data is not installed is a dict with
+    the single key ``skipped``, giving the reason.
+
+    :rtype: dict(str, dict)
+    """
+    results = OrderedDict()
+    for name, function, tweets in BENCHMARKS:
+        if names is not None and name not in names:
+            continue
+        try:
+            stages = function(corpus)
+        except LookupError as e:
+            reason = [line.strip() for line in str(e).splitlines()
+                      if line.strip('* ')]
+            results[name] = {'skipped': reason[0] if reason else 'missing data'}
+            continue
+        runs = [_run_stages(stages) for i in range(repeat)]
+        stage_times = [min(times) for times in zip(*runs)]
+        tokens = len(corpus.tweet_words if tweets else corpus.words)
+        results[name] = OrderedDict([
+            ('tokens', tokens),
+            ('seconds', sum(stage_times)),
+            ('stages', OrderedDict(
+                (stage, OrderedDict([
+                    ('seconds', seconds),
+                    ('tokens_per_sec', tokens / seconds if seconds else None),
+                ])) for (stage, _), seconds in zip(stages, stage_times))),
+            ('peak_memory', _peak_memory(stages) if memory else None),
+        ])
+    return results
+
+
+def _git_commit():
+    try:
+        root = os.path.dirname(os.path.dirname(os.path.abspath(nltk.__file__)))
+        with open(os.devnull, 'w') as devnull:
+            commit = subprocess.check_output(['git', 'rev-parse', 'HEAD'],
+                                             cwd=root, stderr=devnull)
+        return commit.decode('ascii').strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def benchmark_report(results, config):
+    """
+    Return a JSON-serializable report of the *results* of
+    ``run_benchmarks()``, with the *config* they were run with and a
+    description of the environment.
+    """
+    return OrderedDict([
+        ('nltk_version', nltk.__version__),
+        ('git_commit', _git_commit()),
+        ('python', platform.python_version()),
+        ('implementation', platform.python_implementation()),
+        ('platform', platform.platform()),
+        ('time', time.strftime('%Y-%m-%dT%H:%M:%S%z')),
+        ('config', config),
+        ('benchmarks', results),
+    ])
+
+
+def compare_reports(old, new, threshold=0.1):
+    """
+    Compare the throughput of each stage of the benchmarks in two
+    reports, and return a list of lines describing the changes, and a
+    list of the stages, as ``'benchmark.stage'``, whose throughput fell
+    by more than *threshold*.
+
+    :rtype: tuple(list(str), list(str))
+    """
+    lines, regressions = [], []
+    if old.get('config') != new.get('config'):
+        lines.append('Warning: the runs were configured differently.')
+    for name, result in new['benchmarks'].items():
+        old_stages = old['benchmarks'].get(name, {}).get('stages', {})
+        for stage, stage_result in result.get('stages', {}).items():
+            before = old_stages.get(stage, {}).get('tokens_per_sec')
+            after = stage_result['tokens_per_sec']
+            if not before or not after:
+                continue
+            stage = '%s.%s' % (name, stage)
+            change = after / before - 1
+            flag = ''
+            if change < -threshold:
+                regressions.append(stage)
+                flag = '  REGRESSION'
+            lines.append('%-28s %12.0f -> %12.0f tokens/sec  %+6.1f%%%s' %
+                         (stage, before, after, 100 * change, flag))
+    return lines, regressions
+
+
+def _format_results(results):
+    lines = []
+    for name, result in results.items():
+        if 'skipped' in result:
+            lines.append('%-20s skipped: %s' % (name, result['skipped']))
+            continue
+        memory = result['peak_memory']
+        lines.append('%-20s %8d tokens  %8.3fs  %s' % (
+            name, result['tokens'], result['seconds'],
+            '%7.1f MiB' % (memory / 2**20) if memory is not None else '    n/a'))
+        for stage, stage_result in result['stages'].items():
+            lines.append('  %-18s %12.0f tokens/sec  %8.3fs' % (
+                stage, stage_result['tokens_per_sec'] or 0,
+                stage_result['seconds']))
+    return lines
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description='Benchmark NLTK tokenizers and stemmers.')
+    parser.add_argument('benchmarks', nargs='*', metavar='BENCHMARK',
+                        help='the benchmarks to run (default: all of: %s)'
+                        % ', '.join(name for name, _, _ in BENCHMARKS))
+    parser.add_argument('--text', action='append', metavar='FILE',
+                        help='benchmark on the lines of FILE (UTF-8) instead '
+                        'of a synthetic text; may be repeated')
+    parser.add_argument('--sentences', type=int, default=2000,
+                        help='the number of synthetic sentences (default: 2000)')
+    parser.add_argument('--seed', type=int, default=0,
+                        help='the seed of the synthetic text (default: 0)')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='time the best of this many runs (default: 3)')
+    parser.add_argument('--no-memory', action='store_true',
+                        help='do not measure peak memory')
+    parser.add_argument('--output', metavar='FILE',
+                        help='write the results to FILE as JSON')
+    parser.add_argument('--compare', metavar='FILE',
+                        help='compare the results with those in FILE')
+    parser.add_argument('--threshold', type=float, default=0.1,
+                        help='the fractional slowdown reported as a '
+                        'regression by --compare (default: 0.1)')
+    args = parser.parse_args(argv)
+
+    if args.text:
+        sentences = []
+        for path in args.text:
+            with io.open(path, encoding='utf8') as infile:
+                sentences.extend(line.strip() for line in infile if line.strip())
+        corpus = Corpus(sentences, sentences)
+    else:
+        corpus = Corpus(synthetic_text(args.sentences, args.seed),
+                        synthetic_text(args.sentences, args.seed, tweets=True))
+
+    config = OrderedDict([
+        ('text', args.text or 'synthetic'),
+        ('sentences', len(corpus.sentences)),
+        ('words', len(corpus.words)),
+        ('seed', None if args.text else args.seed),
+        ('repeat', args.repeat),
+    ])
+    results = run_benchmarks(corpus, args.benchmarks or None, args.repeat,
+                             not args.no_memory)
+    for line in _format_results(results):
+        print(line)
+
+    report = benchmark_report(results, config)
+    if args.output:
+        with open(args.output, 'w') as outfile:
+            json.dump(report, outfile, indent=2)
+    if args.compare:
+        with open(args.compare) as infile:
+            old = json.load(infile)
+        lines, regressions = compare_reports(old, report, args.threshold)
+        print()
+        for line in lines:
+            print(line)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the tokenizer and stemmer benchmark harness.
+"""
+from __future__ import absolute_import, unicode_literals
+import json
+import unittest
+
+from nltk.test.benchmark import (Corpus, synthetic_text, run_benchmarks,
+                                 benchmark_report, compare_reports)
+
+
+class TestBenchmark(unittest.TestCase):
+
+    def test_synthetic_text_is_reproducible(self):
+        self.assertEqual(synthetic_text(50, seed=1), synthetic_text(50, seed=1))
+        self.assertNotEqual(synthetic_text(50, seed=1), synthetic_text(50, seed=2))
+
+    def test_run_benchmarks(self):
+        corpus = Corpus(synthetic_text(20), synthetic_text(20, tweets=True))
+        results = run_benchmarks(corpus, ['treebank', 'tweet', 'porter'],
+                                 repeat=1)
+        self.assertEqual(list(results), ['treebank', 'tweet', 'porter'])
+        self.assertEqual(list(results['porter']['stages']), ['stem', 'stem_many'])
+        self.assertEqual(results['treebank']['tokens'], len(corpus.words))
+        self.assertEqual(results['tweet']['tokens'], len(corpus.tweet_words))
+        for result in results.values():
+            for stage in result['stages'].values():
+                self.assertEqual(stage['tokens_per_sec'],
+                                 result['tokens'] / stage['seconds'])
+
+        report = json.loads(json.dumps(benchmark_report(results, {})))
+        slower = json.loads(json.dumps(report))
+        slower['benchmarks']['porter']['stages']['stem_many'][
+            'tokens_per_sec'] /= 2
+        lines, regressions = compare_reports(report, slower)
+        self.assertEqual(regressions, ['porter.stem_many'])
+        self.assertEqual(len(lines), 4)
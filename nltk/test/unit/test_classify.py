@@ -3,6 +3,7 @@
 Unit tests for nltk.classify. See also: nltk/test/classify.doctest
 """
 from __future__ import absolute_import
+import os
 from nose import SkipTest
 from nltk import classify
 
@@ -51,3 +52,213 @@ def test_megam():
 
 def test_tadm():
     assert_classifier_correct('TADM')
+
+def test_lbfgs():
+    assert_classifier_correct('LBFGS')
+
+def test_lbfgs_l1_penalty():
+    classifier = classify.MaxentClassifier.train(
+        TRAIN, 'LBFGS', trace=0, l1_penalty=0.5
+    )
+    weights = classifier.weights()
+    assert (weights == 0).sum() > len(weights) // 2, weights
+    assert classifier.classify(dict(a=1,b=0,c=1)) == 'y'
+
+def test_penalty_requires_lbfgs():
+    for algorithm in ['GIS', 'IIS', 'MEGAM']:
+        try:
+            classify.MaxentClassifier.train(TRAIN, algorithm, trace=0,
+                                            l2_penalty=0.5)
+        except TypeError:
+            pass
+        else:
+            raise AssertionError('%s accepted l2_penalty' % algorithm)
+
+class _ConstantClassifier(classify.ClassifierI):
+    def classify(self, featureset):
+        return 'y'
+    def prob_classify(self, featureset):
+        from nltk.probability import DictionaryProbDist
+        return DictionaryProbDist({'x': 0.1, 'y': 0.9})
+
+def test_cutoff_checker_accuracy():
+    # Without an accuracy from the trainer, max_acc is checked against the
+    # accuracy of the classifier, not its log likelihood.
+    from nltk.classify.util import CutoffChecker
+    train_toks = [(dict(a=1), 'y'), (dict(a=0), 'y')]
+    checker = CutoffChecker(dict(max_acc=0.9))
+    assert checker.check(_ConstantClassifier(), train_toks)
+    assert checker.acc is None
+    checker = CutoffChecker(dict(max_acc=0.9))
+    assert not checker.check(_ConstantClassifier(), TRAIN)
+    assert checker.acc == 5.0 / 9
+
+def test_decision_tree_stump_errors():
+    # The stumps chosen from the contingency tables have the lowest
+    # error of all stumps, and training in worker processes gives the
+    # same tree.
+    import random
+    from nltk.classify import DecisionTreeClassifier
+    rand = random.Random(0)
+    data = [(dict((f, rand.choice([0, 1, 2])) for f in 'abcd'
+                  if rand.random() < 0.8), rand.choice('xyz'))
+            for i in range(200)]
+    feature_names = set('abcd')
+    stump = DecisionTreeClassifier.best_stump(feature_names, data)
+    errors = [DecisionTreeClassifier.stump(f, data).error(data)
+              for f in feature_names]
+    assert stump.error(data) == min(errors)
+    feature_values = dict((f, set([0, 1, 2, None])) for f in feature_names)
+    stump = DecisionTreeClassifier.best_binary_stump(feature_names, data,
+                                                     feature_values)
+    errors = [DecisionTreeClassifier.binary_stump(f, v, data).error(data)
+              for f in feature_names for v in feature_values[f]]
+    assert stump.error(data) == min(errors)
+
+    data = [(dict((f, rand.choice([0, 1, 2])) for f in 'abcd'),
+             rand.choice('xyz')) for i in range(200)]
+    for binary in [False, True]:
+        tree = DecisionTreeClassifier.train(data, binary=binary,
+                                            support_cutoff=5)
+        parallel = DecisionTreeClassifier.train(data, binary=binary,
+                                                support_cutoff=5, workers=2)
+        assert parallel.pretty_format(depth=100) == tree.pretty_format(depth=100)
+
+def _last_letter_features(word):
+    return dict(last_letter=word[-1], length=len(word))
+
+class _LastLetterExtractor(object):
+    def features(self, word):
+        return _last_letter_features(word)
+
+def test_feature_cache():
+    import shutil
+    import tempfile
+    from nltk.classify.util import apply_features, FeatureCache
+    words = [('Gertrude', 'f'), ('Rupert', 'm'), ('Ann', 'f'), ('Gertrude', 'f')]
+    expected = list(apply_features(_last_letter_features, words))
+    directory = tempfile.mkdtemp()
+    try:
+        cache = FeatureCache(_last_letter_features, directory)
+        featuresets = apply_features(_last_letter_features, words, cache=cache)
+        assert list(featuresets) == expected
+        assert list(featuresets) == expected
+        assert (cache.hits, cache.misses) == (5, 3)
+        cache.close()
+
+        # Another cache in the same directory reuses the featuresets,
+        # unless the version of the extractor is different.
+        cache = FeatureCache(_last_letter_features, directory)
+        assert list(apply_features(_last_letter_features, words,
+                                   cache=cache)) == expected
+        assert (cache.hits, cache.misses) == (4, 0)
+        cache = FeatureCache(_last_letter_features, directory, version='2')
+        assert list(apply_features(_last_letter_features, words,
+                                   cache=cache)) == expected
+        assert cache.misses == 3
+
+        # A bound method is the same extractor at each attribute access.
+        extractor = _LastLetterExtractor()
+        cache = FeatureCache(extractor.features, directory)
+        assert list(apply_features(extractor.features, words,
+                                   cache=cache)) == expected
+    finally:
+        shutil.rmtree(directory)
+
+def _structured_features(tok):
+    word, tags = tok
+    return {'word': word, 'tags': tags, ('suffix', 1): word[-1:],
+            'upper': word.isupper(), 'length': float(len(word)),
+            'seen': None, 'pairs': [(word, tag) for tag in sorted(tags)]}
+
+def test_feature_cache_encoding():
+    import json
+    import shutil
+    import sqlite3
+    import tempfile
+    import zlib
+    from nltk.classify.util import FeatureCache
+    toks = [('Ann', frozenset(['NNP', 'NN'])), ('IT', frozenset(['PRP']))]
+    directory = tempfile.mkdtemp()
+    try:
+        cache = FeatureCache(_structured_features, directory)
+        for tok in toks:
+            cache(tok)
+        cache.close()
+        cache = FeatureCache(_structured_features, directory)
+        for tok in toks:
+            featureset = cache(tok)
+            assert featureset == _structured_features(tok)
+            assert type(featureset['tags']) is frozenset
+            assert type(featureset['pairs'][0]) is tuple
+        assert (cache.hits, cache.misses) == (2, 0)
+        # The featuresets are stored as JSON.
+        connection = sqlite3.connect(cache._path)
+        rows = connection.execute('SELECT featureset FROM featuresets')
+        for (data,) in rows:
+            json.loads(zlib.decompress(bytes(data)).decode('utf8'))
+        connection.close()
+        cache.close()
+    finally:
+        shutil.rmtree(directory)
+
+def test_token_digest_is_canonical():
+    # The digest of a token does not depend on the order of its sets and
+    # dicts, which can change from one run to the next.
+    import subprocess
+    import sys
+    import nltk
+    from nltk.classify.util import _token_digest
+    assert (_token_digest({'a': 1, 'b': set('xyz')}) ==
+            _token_digest({'b': set('zyx'), 'a': 1}))
+    assert _token_digest(('a', 1)) != _token_digest(['a', 1])
+    assert _token_digest(1) != _token_digest(True)
+    assert _token_digest(object()) is None
+    code = ('from nltk.classify.util import _token_digest; '
+            'import binascii; print(binascii.hexlify(_token_digest('
+            '(set(str(i) for i in range(50)), {"a": 1}))))')
+    digests = set()
+    for seed in ['1', '2', '3']:
+        env = dict(os.environ, PYTHONHASHSEED=seed, PYTHONPATH=os.path.dirname(
+            os.path.dirname(nltk.__file__)))
+        digests.add(subprocess.check_output([sys.executable, '-c', code],
+                                            env=env))
+    assert len(digests) == 1
+
+def test_sklearn_train_stream():
+    try:
+        from sklearn.linear_model import SGDClassifier
+        from sklearn.naive_bayes import MultinomialNB
+    except ImportError:
+        raise SkipTest('scikit-learn is not installed')
+    from nltk.classify.scikitlearn import SklearnClassifier
+
+    def labeled_featuresets():
+        for i in range(200):
+            yield dict(color='red', size=i % 3), 'x'
+            yield dict(color='blue', size=i % 3), 'y'
+
+    classifier = SklearnClassifier(SGDClassifier(random_state=0),
+                                   n_features=2**10)
+    classifier.train_stream(labeled_featuresets(), labels=['x', 'y'],
+                            batch_size=32)
+    assert classifier.labels() == ['x', 'y']
+    assert classifier.classify_many([dict(color='red'),
+                                     dict(color='blue')]) == ['x', 'y']
+
+    # The labels cannot change once the estimator knows its classes.
+    classifier.train_stream(labeled_featuresets(), labels=['y', 'x'])
+    try:
+        classifier.train_stream(labeled_featuresets(), labels=['x', 'y', 'z'])
+    except ValueError:
+        pass
+    else:
+        assert False, 'train_stream() accepted new labels'
+
+    # Hashed columns are non-negative, as MultinomialNB requires.
+    classifier = SklearnClassifier(MultinomialNB(), n_features=2**10)
+    classifier.train_stream(labeled_featuresets(), labels=['x', 'y'],
+                            batch_size=32)
+    assert classifier.classify_many([dict(color='red'),
+                                     dict(color='blue')]) == ['x', 'y']
+
@@ -43,3 +43,167 @@ class TestCorpusViews(unittest.TestCase):
 
             v = StreamBackedCorpusView(f, read_line_block)
             self.assertEqual(len(v), len(self.linetok.tokenize(file_data)))
+
+
+class TestBlockIndex(unittest.TestCase):
+
+    def setUp(self):
+        import sys, tempfile
+        # nltk.corpus.reader.util is shadowed by nltk.tokenize.util
+        util = sys.modules[StreamBackedCorpusView.__module__]
+        self.util = util
+        self.saved_dir = util.BLOCK_INDEX_DIR
+        self.tmpdir = tempfile.mkdtemp()
+        util.BLOCK_INDEX_DIR = self.tmpdir + '/index'
+        self.path = self.tmpdir + '/corpus.txt'
+        with open(self.path, 'w') as fp:
+            for i in range(2000):
+                fp.write('line %d has some words\n' % i)
+
+    def tearDown(self):
+        import shutil
+        self.util.BLOCK_INDEX_DIR = self.saved_dir
+        shutil.rmtree(self.tmpdir)
+
+    def test_saved_index_is_reused(self):
+        v = StreamBackedCorpusView(self.path, read_whitespace_block)
+        words = list(v)
+        self.assertEqual(len(v), 10000)
+
+        v = StreamBackedCorpusView(self.path, read_whitespace_block)
+        v._load_block_index()
+        self.assertEqual(v._len, 10000)
+        self.assertEqual(v[9998], words[9998])
+        self.assertEqual(list(v), words)
+
+    def test_stale_index_is_ignored(self):
+        v = StreamBackedCorpusView(self.path, read_whitespace_block)
+        len(v)
+        with open(self.path, 'a') as fp:
+            fp.write('one more line\n')
+
+        v = StreamBackedCorpusView(self.path, read_whitespace_block)
+        v._load_block_index()
+        self.assertEqual(v._len, None)
+        self.assertEqual(len(v), 10003)
+
+    def test_index_is_json(self):
+        import json
+        v = StreamBackedCorpusView(self.path, read_whitespace_block)
+        len(v)
+        with open(v._index_path()) as fp:
+            index = json.load(fp)
+        self.assertEqual(index['toknum'], v._toknum)
+        self.assertEqual(index['filepos'], v._filepos)
+
+        # An index file that is not a valid mapping is ignored.
+        index['toknum'] = ['x'] * len(index['toknum'])
+        with open(v._index_path(), 'w') as fp:
+            json.dump(index, fp)
+        v = StreamBackedCorpusView(self.path, read_whitespace_block)
+        v._load_block_index()
+        self.assertEqual(v._len, None)
+        self.assertEqual(len(v), 10000)
+
+
+class TestBlockCache(unittest.TestCase):
+
+    def setUp(self):
+        import tempfile
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = self.tmpdir + '/corpus.txt'
+        with open(self.path, 'w') as fp:
+            for i in range(2000):
+                fp.write('line %d has some words\n' % i)
+        self.words = list(StreamBackedCorpusView(self.path,
+                                                 read_whitespace_block))
+
+    def tearDown(self):
+        import shutil
+        shutil.rmtree(self.tmpdir)
+
+    def test_lru_cache(self):
+        v = StreamBackedCorpusView(self.path, read_whitespace_block)
+        v.cache_size = 3
+        # read_whitespace_block reads 20 lines (100 tokens) per block.
+        for i in [0, 150, 250, 50, 150, 350, 0]:
+            self.assertEqual(v[i], self.words[i])
+        hits, misses, maxsize, currsize = v.cache_info()
+        self.assertEqual((hits, misses, maxsize, currsize), (3, 4, 3, 3))
+        self.assertEqual(list(v), self.words)
+
+    def test_read_ahead(self):
+        v = StreamBackedCorpusView(self.path, read_whitespace_block)
+        v.cache_size = 4
+        v.read_ahead = 3
+        self.assertEqual(list(v[:400]), self.words[:400])
+        # The first block read also read the next three into the cache.
+        self.assertEqual(v.cache_info().misses, 1)
+        self.assertEqual(v.cache_info().currsize, 4)
+        v.clear_cache()
+        self.assertEqual(v.cache_info(), (0, 0, 4, 0))
+        self.assertEqual(v[-1], self.words[-1])
+
+    def test_repeated_access_not_counted(self):
+        v = StreamBackedCorpusView(self.path, read_whitespace_block)
+        for i in range(10):
+            self.assertEqual(v[i], self.words[i])
+        self.assertEqual(v.cache_info()[:2], (0, 1))
+
+    def test_read_ahead_block_numbers(self):
+        # Blank lines are blocks without tokens, which do not advance the
+        # block number.
+        with open(self.path, 'w') as fp:
+            fp.write('\na b\nc\n\n\nd e\nf\n')
+
+        class View(StreamBackedCorpusView):
+            def read_block(self, stream):
+                pos = stream.tell()
+                self.blocknums[pos] = self._current_blocknum
+                return stream.readline().split()
+
+        expected = View(self.path)
+        expected.blocknums = {}
+        list(expected)
+        v = View(self.path)
+        v.blocknums = {}
+        v.cache_size = 8
+        v.read_ahead = 7
+        self.assertEqual(list(v), ['a', 'b', 'c', 'd', 'e', 'f'])
+        self.assertEqual(v.cache_info().misses, 1)
+        self.assertEqual(v.blocknums, expected.blocknums)
+
+    def test_concatenated_cache_info(self):
+        from nltk.corpus.reader.util import concat
+        views = [StreamBackedCorpusView(self.path, read_whitespace_block)
+                 for i in range(2)]
+        c = concat(views)
+        self.assertEqual(len(c), 2 * len(self.words))
+        self.assertEqual(c.cache_info().misses, 2 * len(self.words) // 100)
+
+
+class TestIterParallel(unittest.TestCase):
+
+    def setUp(self):
+        import tempfile
+        from nltk.corpus.reader import TaggedCorpusReader
+        self.tmpdir = tempfile.mkdtemp()
+        for i in range(6):
+            with open('%s/doc%d.pos' % (self.tmpdir, i), 'w') as fp:
+                for j in range(50 * (i + 1)):
+                    fp.write('file/NN %d/CD line/NN %d/CD ./.\n' % (i, j))
+        self.reader = TaggedCorpusReader(self.tmpdir, r'doc\d\.pos')
+
+    def tearDown(self):
+        import shutil
+        shutil.rmtree(self.tmpdir)
+
+    def test_ordered(self):
+        sents = list(self.reader.iter_parallel('tagged_sents', workers=2))
+        self.assertEqual(sents, list(self.reader.tagged_sents()))
+
+    def test_unordered(self):
+        fileids = ['doc5.pos', 'doc0.pos', 'doc3.pos']
+        words = self.reader.iter_parallel('words', fileids, workers=3,
+                                          ordered=False)
+        self.assertEqual(sorted(words), sorted(self.reader.words(fileids)))
@@ -80,6 +80,29 @@ def test_backward_probability():
     assert_array_almost_equal(wikipedia_results, bp, 4)
 
 
+def test_batched_forward_backward_probability():
+    from numpy.testing import assert_array_almost_equal
+
+    model, states, symbols, seq = _wikipedia_example_hmm()
+    seqs = [seq, seq[:2], seq[1:]]
+    fps = model._forward_probabilities(seqs)
+    bps = model._backward_probabilities(seqs)
+
+    for i, s in enumerate(seqs):
+        assert_array_almost_equal(fps[i, :len(s)], model._forward_probability(s))
+        assert_array_almost_equal(bps[i, :len(s)], model._backward_probability(s))
+    assert (fps[1, 2:] == float('-inf')).all()
+
+
+def test_batched_best_paths():
+    model, states, symbols = hmm._market_hmm_example()
+    seqs = [['up', 'up', 'down'], ['unchanged'], [], ['down', 'up', 'up', 'up']]
+    expected = [model.best_path(s) if s else [] for s in seqs]
+
+    assert model.best_paths(seqs) == expected
+    assert model.tag_sents(seqs) == [list(zip(s, p)) for s, p in zip(seqs, expected)]
+
+
 def setup_module(module):
     from nose import SkipTest
     try:
@@ -24,3 +24,60 @@ class NaiveBayesClassifierTest(unittest.TestCase):
         result = classifier.prob_classify({'bad': True})
         self.assertTrue(result.prob('positive') < result.prob('negative'))
         self.assertEqual(result.max(), 'negative')
+
+    def test_prob_classify_many(self):
+        import random
+        rand = random.Random(0)
+
+        def featuresets(n):
+            return [dict(('f%d' % rand.randint(0, 12), rand.choice('abc'))
+                         for i in range(rand.randint(0, 6)))
+                    for j in range(n)]
+
+        training_features = [(fs, rand.choice(['x', 'y', 'z']))
+                             for fs in featuresets(100)]
+        classifier = NaiveBayesClassifier.train(training_features)
+        test = featuresets(50) + [{}, {'unseen': 'a'}, {'f1': 'unseen'}]
+
+        results = classifier.prob_classify_many(test)
+        for featureset, result in zip(test, results):
+            expected = classifier.prob_classify(featureset)
+            for label in classifier.labels():
+                self.assertEqual(result.prob(label), expected.prob(label))
+        self.assertEqual(classifier.classify_many(test),
+                         [classifier.classify(fs) for fs in test])
+
+    def test_train_matches_loop(self):
+        import random
+        import sys
+        rand = random.Random(0)
+
+        for trial in range(10):
+            training_features = [
+                (dict(('f%d' % rand.randint(0, 15), rand.choice('abc'))
+                      for i in range(rand.randint(0, 6))),
+                 rand.choice(['x', 'y', 'z']))
+                for j in range(rand.randint(1, 60))]
+            classifier = NaiveBayesClassifier.train(training_features)
+
+            # Train without numpy and scipy, by counting in a loop.
+            modules = dict((name, sys.modules.get(name))
+                           for name in ['numpy', 'scipy.sparse'])
+            sys.modules.update(dict.fromkeys(modules))
+            try:
+                expected = NaiveBayesClassifier.train(training_features)
+            finally:
+                for name, module in modules.items():
+                    if module is None:
+                        del sys.modules[name]
+                    else:
+                        sys.modules[name] = module
+
+            self.assertEqual(list(classifier._feature_probdist),
+                             list(expected._feature_probdist))
+            for key, probdist in expected._feature_probdist.items():
+                self.assertEqual(
+                    list(classifier._feature_probdist[key].samples()),
+                    list(probdist.samples()))
+            self.assertEqual(classifier.most_informative_features(),
+                             expected.most_informative_features())
@@ -105,3 +105,40 @@ class PorterTest(unittest.TestCase):
         Ensures that 'oed' can be stemmed without throwing an error.
         """
         assert PorterStemmer().stem('oed') == 'o'
+
+
+class CachedStemmerTest(unittest.TestCase):
+
+    def test_cached_stemmer(self):
+        from nltk.stem import CachedStemmer, LancasterStemmer
+        words = 'the cats were running and the dog runs to the cats'.split()
+        stemmer = LancasterStemmer()
+        cached = CachedStemmer(stemmer, maxsize=3)
+        expected = [stemmer.stem(word) for word in words]
+        self.assertEqual([cached.stem(word) for word in words], expected)
+        info = cached.cache_info()
+        self.assertEqual(info.hits + info.misses, len(words))
+        self.assertEqual((info.maxsize, info.currsize), (3, 3))
+
+        cached.clear_cache()
+        self.assertEqual(cached.stem_many(words), expected)
+        self.assertEqual(cached.cache_info().misses, len(set(words)))
+
+    def test_cached_lemmatizer(self):
+        from nltk.stem import CachedLemmatizer
+
+        class Lemmatizer(object):
+            calls = 0
+            def lemmatize(self, word, pos='n'):
+                self.calls += 1
+                return word.rstrip('s') if pos == 'n' else word
+
+        lemmatizer = Lemmatizer()
+        cached = CachedLemmatizer(lemmatizer, maxsize=10)
+        words = ['dogs', 'cats', 'dogs', 'runs', 'dogs']
+        self.assertEqual(cached.lemmatize_many(words),
+                         ['dog', 'cat', 'dog', 'run', 'dog'])
+        self.assertEqual(cached.lemmatize('runs', 'v'), 'runs')
+        self.assertEqual(cached.lemmatize('runs'), 'run')
+        self.assertEqual(lemmatizer.calls, 4)
+        self.assertEqual(cached.cache_info().hits, 1)
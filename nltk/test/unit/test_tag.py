@@ -12,6 +12,53 @@ def test_basic():
                       ('.', '.')]
 
 
+def test_perceptron_compiled_tag_sents():
+    from nltk.tag.perceptron import PerceptronTagger
+
+    train = [[('today', 'NN'), ('is', 'VBZ'), ('good', 'JJ'), ('day', 'NN')],
+             [('yes', 'NNS'), ('it', 'PRP'), ('beautiful', 'JJ')],
+             [('the', 'DT'), ('day', 'NN'), ('is', 'VBZ'), ('long', 'JJ')]]
+    tagger = PerceptronTagger(load=False)
+    tagger.train(train)
+    sents = [['today', 'is', 'a', 'beautiful', 'day'], [],
+             ['yes', '1999', 'well-known', 'day', '42'], ['it']]
+    expected = [tagger.tag(sent) for sent in sents]
+
+    tagger.compile()
+    assert tagger.tag_sents(sents) == expected
+    assert tagger.tag_sents(sents, batch_size=2) == expected
+    assert tagger.tag_sents(sents, batch_size=2, workers=2,
+                            chunksize=3) == expected
+
+
+def test_parallel_tag_sents():
+    from nltk.tag import UnigramTagger, DefaultTagger
+
+    train = [[('the', 'DT'), ('dog', 'NN'), ('barks', 'VBZ')],
+             [('a', 'DT'), ('cat', 'NN'), ('sleeps', 'VBZ')]]
+    tagger = UnigramTagger(train, backoff=DefaultTagger('NN'))
+    sents = [['the', 'cat', 'barks'], ['a', 'bird'], []] * 50
+
+    expected = tagger.tag_sents(sents)
+    assert tagger.tag_sents(sents, workers=2, chunksize=7) == expected
+    assert tagger.tag_sents(iter(sents), workers=3) == expected
+
+
+class _BatchSizeTagger(object):
+    """Tags each word with the batch size given to tag_sents()."""
+    def tag_sents(self, sentences, batch_size=None):
+        return [[(word, batch_size) for word in sent] for sent in sentences]
+
+
+def test_parallel_tag_sents_kwargs():
+    from nltk.tag.api import parallel_tag_sents
+
+    sents = [['a', 'b'], ['c']] * 10
+    expected = _BatchSizeTagger().tag_sents(sents, batch_size=5)
+    assert parallel_tag_sents(_BatchSizeTagger(), sents, 2, chunksize=3,
+                              batch_size=5) == expected
+
+
 def setup_module(module):
     from nose import SkipTest
     try:
@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import, division, unicode_literals
+
+from math import log
+
+from nose import SkipTest
+
+from nltk.text import TextCollection
+
+
+def _scan_tf(term, text):
+    return text.count(term) / len(text)
+
+
+def _scan_idf(term, texts):
+    matches = len([True for text in texts if term in text])
+    return log(len(texts) / matches) if matches else 0.0
+
+
+def _assert_weights(collection, texts):
+    vocab = set(term for text in texts for term in text) | set(['missing'])
+    for text in texts:
+        for term in vocab:
+            assert abs(collection.tf(term, text) - _scan_tf(term, text)) < 1e-12
+    for term in vocab:
+        assert abs(collection.idf(term) - _scan_idf(term, texts)) < 1e-12
+
+
+def test_tf_idf_index():
+    texts = [['a', 'b', 'a'], ['b', 'c'], ['c', 'd', 'e', 'a']]
+    collection = TextCollection(texts)
+    _assert_weights(collection, texts)
+
+    # Texts added after the index is built are indexed incrementally.
+    extra = ['e', 'e', 'f']
+    collection.add_text(extra)
+    texts.append(extra)
+    _assert_weights(collection, texts)
+    assert list(collection) == [term for text in texts for term in text]
+
+
+def test_tf_equal_text_uses_fallback():
+    texts = [['a', 'b', 'a'], ['b', 'c']]
+    collection = TextCollection(texts)
+    collection.idf('a')  # Build the index.
+    equal = ['a', 'b', 'a']
+    assert equal == texts[0] and equal is not texts[0]
+    assert collection._text_ids.get(id(equal)) is None
+    assert collection.tf('a', equal) == _scan_tf('a', equal)
+    # A different text, even of the same length, must not read the index.
+    other = ['c', 'c', 'c']
+    assert collection.tf('c', other) == 1.0
+    assert collection.tf('a', other) == 0.0
+
+
+def test_tf_idf_rows():
+    texts = [['a', 'b', 'a'], ['b', 'c'], ['c', 'd']]
+    collection = TextCollection(texts)
+    collection.add_text(['d', 'a', 'a'])
+    texts.append(['d', 'a', 'a'])
+    rows = collection.tf_idf_rows()
+    assert len(rows) == len(texts)
+    for row, text in zip(rows, texts):
+        assert set(row) == set(text)
+        for term in text:
+            expected = _scan_tf(term, text) * _scan_idf(term, texts)
+            assert abs(row[term] - expected) < 1e-12
+
+
+def test_tf_idf_matrix():
+    try:
+        import scipy.sparse
+    except ImportError:
+        raise SkipTest('scipy is not installed')
+    texts = [['a', 'b', 'a'], ['b', 'c']]
+    collection = TextCollection(texts)
+    matrix, terms = collection.tf_idf_matrix()
+    assert matrix.shape == (2, 3)
+    # 'b' occurs in every text, so its zero weights are not stored.
+    assert matrix.nnz == 2
+    for i, text in enumerate(texts):
+        for j, term in enumerate(terms):
+            expected = _scan_tf(term, text) * _scan_idf(term, texts)
+            assert abs(matrix[i, j] - expected) < 1e-12
@@ -75,3 +75,341 @@ class TestTokenize(unittest.TestCase):
         expected = ['u', '@abcde', '@abcdefghijklmnopqrst', '@abcde', '_', '@abcde', '5', '@abcde']
         result = tokenizer.tokenize(test7)
         self.assertEqual(result, expected)
+
+    def test_treebank_span_tokenize(self):
+        """
+        Test that the spans of the Treebank tokenizer point at its tokens,
+        or at the quotes that they were rewritten from.
+        """
+        from nltk.tokenize import TreebankWordTokenizer
+
+        tokenizer = TreebankWordTokenizer()
+        texts = ['"Gimme the cannot," she said... (lemme see) -- I\'d gotta go.',
+                 "''Tis 5:30, isn't it?'' \"A\",\"b\" `` 'twas: $3.50; ok!",
+                 'Good muffins cost $3.88\nin New York.  Please buy me two.',
+                 '', '   ']
+        expected = ['``', 'Gim', 'me', 'the', 'can', 'not', ',', "''", 'she',
+                    'said', '...', '(', 'lem', 'me', 'see', ')', '--', 'I',
+                    "'d", 'got', 'ta', 'go', '.']
+        self.assertEqual(tokenizer.tokenize(texts[0]), expected)
+        for text in texts:
+            tokens = tokenizer.tokenize(text)
+            spans = list(tokenizer.span_tokenize(text))
+            self.assertEqual(len(spans), len(tokens))
+            for token, (start, end) in zip(tokens, spans):
+                if token in ('``', "''") and text[start:end] == '"':
+                    continue
+                self.assertEqual(text[start:end], token)
+
+    def test_punkt_stream(self):
+        """
+        Test that streaming Punkt finds the same sentences as Punkt on the
+        whole text, however the text is split into chunks.
+        """
+        import io
+        import random
+        from nltk.tokenize.punkt import PunktSentenceTokenizer
+
+        text = ('Mr. Smith went to Washington D.C. on Jan. 5th.  He said: '
+                '"This is it." (And then left.) Next!  Is it?  "Yes," said '
+                'Dr. J. Doe -- at 5 p.m. on\nthe 3rd. Prof. X. agreed... '
+                'The U.S.A. is big.) Done. ') * 5 + 'No end. e.g. lower.  \n '
+        tokenizer = PunktSentenceTokenizer(text)
+        rand = random.Random(0)
+        for realign_boundaries in [True, False]:
+            spans = tokenizer.span_tokenize(text, realign_boundaries)
+            for size in [1, 2, 3, 7, 50, len(text)]:
+                chunks = [text[i:i+size] for i in range(0, len(text), size)]
+                result = tokenizer.span_tokenize_stream(chunks,
+                                                        realign_boundaries)
+                self.assertEqual(list(result), spans)
+            for trial in range(20):
+                cuts = sorted(rand.sample(range(len(text)), 40))
+                chunks = [text[i:j] for i, j in zip([0] + cuts, cuts + [None])]
+                result = tokenizer.span_tokenize_stream(chunks,
+                                                        realign_boundaries)
+                self.assertEqual(list(result), spans)
+
+        sentences = tokenizer.tokenize_stream(io.StringIO(text))
+        self.assertEqual(list(sentences), tokenizer.tokenize(text))
+
+    def test_punkt_train_parallel(self):
+        """
+        Test that PunktTrainer.train_parallel() learns the same parameters
+        from shards of a text as PunktTrainer.train() from the whole text.
+        """
+        import io
+        import os
+        import random
+        import shutil
+        import tempfile
+        from nltk.tokenize.punkt import PunktTrainer
+
+        rand = random.Random(0)
+        words = ('Mr. Smith went to Washington D.C. on Jan. 5th and met '
+                 'Dr. Jones of U.S.A. corp. at 5 p.m. The end. Then he left. '
+                 'e.g. this is it. etc. and so on. Ltd. was here.').split()
+        text = '\n'.join(' '.join(rand.choice(words)
+                                  for i in range(rand.randint(0, 14)))
+                         for j in range(300))
+
+        def statistics(trainer):
+            params = trainer.get_params()
+            return (params.abbrev_types, params.collocations,
+                    params.sent_starters, dict(params.ortho_context),
+                    trainer._type_fdist, trainer._collocation_fdist,
+                    trainer._sent_starter_fdist, trainer._sentbreak_count)
+
+        trainer = PunktTrainer()
+        trainer.INCLUDE_ALL_COLLOCS = True
+        trainer.train(text)
+        expected = statistics(trainer)
+
+        cuts = sorted(rand.sample(range(len(text)), 20))
+        shards = [text[i:j] for i, j in zip([0] + cuts, cuts + [None])]
+        trainer = PunktTrainer()
+        trainer.INCLUDE_ALL_COLLOCS = True
+        trainer.train_parallel(shards, workers=2)
+        self.assertEqual(statistics(trainer), expected)
+
+        # Shards read from files, including one without a line break.
+        cuts = sorted(rand.sample(range(len(text)), 5))
+        shards = [text[i:j] for i, j in zip([0] + cuts, cuts + [None])]
+        shards.insert(3, 'Mr. Smith')
+        text = ''.join(shards)
+        trainer = PunktTrainer()
+        trainer.INCLUDE_ALL_COLLOCS = True
+        trainer.train(text)
+        expected = statistics(trainer)
+
+        root = tempfile.mkdtemp()
+        try:
+            paths = []
+            for i, shard in enumerate(shards):
+                paths.append(os.path.join(root, '%d.txt' % i))
+                with io.open(paths[-1], 'w', encoding='utf8') as stream:
+                    stream.write(shard)
+            trainer = PunktTrainer()
+            trainer.INCLUDE_ALL_COLLOCS = True
+            trainer.train_files(paths, workers=2)
+            self.assertEqual(statistics(trainer), expected)
+        finally:
+            shutil.rmtree(root)
+
+    def test_punkt_shard_statistics(self):
+        """
+        Test that PunktShardStatistics collected from line-aligned shards,
+        serialized and merged, train the same parameters as train().
+        """
+        from nltk.tokenize.punkt import PunktShardStatistics, PunktTrainer
+
+        text = ('Mr. Smith went to Washington D.C. on Jan. 5th.  He met\n'
+                'Dr. J. Doe at 5 p.m. on the 3rd.  The U.S.A. is big.\n'
+                '\nand so on. etc. is it.\n') * 20
+        lines = text.splitlines(True)
+        shards = [''.join(lines[i:i+7]) for i in range(0, len(lines), 7)]
+        contexts = [''] + [shard.rstrip('\n').rsplit('\n', 1)[-1] + '\n'
+                           for shard in shards[:-1]]
+
+        trainer = PunktTrainer()
+        trainer.train(text)
+        expected = trainer.get_params()
+
+        trainer = PunktTrainer()
+        type_counts = PunktShardStatistics()
+        for shard in shards:
+            stats = trainer.count_types(shard)
+            type_counts.merge(PunktShardStatistics.from_json(stats.to_json()))
+        trainer.add_type_counts(type_counts)
+        merged = PunktShardStatistics()
+        for context, shard in zip(contexts, shards):
+            stats = trainer.collect_statistics(shard, context)
+            merged.merge(PunktShardStatistics.from_json(stats.to_json()))
+        trainer.add_statistics(merged)
+        params = trainer.get_params()
+
+        self.assertEqual(params.abbrev_types, expected.abbrev_types)
+        self.assertEqual(params.collocations, expected.collocations)
+        self.assertEqual(params.sent_starters, expected.sent_starters)
+        self.assertEqual(dict(params.ortho_context),
+                         dict(expected.ortho_context))
+
+    def test_punkt_model_format(self):
+        """
+        Test that a Punkt model saved with save_punkt() and read back with
+        load_punkt() or nltk.data.load() has the same parameters.
+        """
+        import os
+        import pickle
+        import shutil
+        import tempfile
+        import nltk.data
+        from nltk.tokenize.punkt import (PunktSentenceTokenizer, PunktTrainer,
+                                         convert_punkt_pickle)
+
+        text = ('Mr. Smith went to Washington D.C. on Jan. 5th.  He met '
+                'Dr. J. Doe at 5 p.m. on the 3rd.  The U.S.A. is big. ') * 20
+        trainer = PunktTrainer()
+        trainer.INCLUDE_ALL_COLLOCS = True
+        trainer.train(text)
+        tokenizer = PunktSentenceTokenizer(trainer.get_params())
+
+        root = tempfile.mkdtemp()
+        try:
+            path = os.path.join(root, 'english.pickle')
+            with open(path, 'wb') as stream:
+                pickle.dump(tokenizer, stream)
+            path = convert_punkt_pickle(path)
+            self.assertEqual(path, os.path.join(root, 'english.punkt'))
+            loaded = nltk.data.load('file:' + path, cache=False)
+        finally:
+            shutil.rmtree(root)
+
+        params, expected = loaded._params, tokenizer._params
+        self.assertEqual(params.abbrev_types, expected.abbrev_types)
+        self.assertEqual(params.collocations, expected.collocations)
+        self.assertEqual(params.sent_starters, expected.sent_starters)
+        self.assertEqual(dict(params.ortho_context.items()),
+                         dict((typ, flags) for typ, flags
+                              in expected.ortho_context.items() if flags))
+        for typ in list(expected.ortho_context) + ['unseen']:
+            self.assertEqual(params.ortho_context[typ],
+                             expected.ortho_context.get(typ, 0))
+        self.assertEqual(loaded.tokenize(text), tokenizer.tokenize(text))
+
+    def test_mwe_automaton(self):
+        """
+        Test that MWETokenizer finds the leftmost-longest expressions, from
+        a lexicon compiled in memory or loaded from a file.
+        """
+        import os
+        import random
+        import shutil
+        import tempfile
+        from nltk.tokenize import MWETokenizer
+        from nltk.tokenize.mwe import MWEAutomaton
+
+        def leftmost_longest(mwes, tokens):
+            entry_ids = {}
+            for entry_id, mwe in enumerate(mwes):
+                entry_ids.setdefault(tuple(mwe), entry_id)
+            start = 0
+            while start < len(tokens):
+                for i in range(start, len(tokens)):
+                    ends = [j for j in range(i + 1, len(tokens) + 1)
+                            if tuple(tokens[i:j]) in entry_ids]
+                    if ends:
+                        yield i, ends[-1], entry_ids[tuple(tokens[i:ends[-1]])]
+                        start = ends[-1]
+                        break
+                else:
+                    return
+
+        rand = random.Random(0)
+        root = tempfile.mkdtemp()
+        try:
+            for trial in range(200):
+                mwes = [tuple(rand.choice('abcd')
+                              for i in range(rand.randint(1, 4)))
+                        for j in range(rand.randint(1, 6))]
+                tokens = [rand.choice('abcde') for i in range(20)]
+                expected = list(leftmost_longest(mwes, tokens))
+                self.assertEqual(list(MWETokenizer(mwes).mwe_spans(tokens)),
+                                 expected)
+                path = os.path.join(root, 'lexicon')
+                MWEAutomaton(mwes).save(path)
+                tokenizer = MWETokenizer(automaton=MWEAutomaton.load(path))
+                self.assertEqual(list(tokenizer.mwe_spans(tokens)), expected)
+        finally:
+            shutil.rmtree(root)
+
+        tokenizer = MWETokenizer([('a', 'b'), ('a', 'b', 'c', 'd')])
+        self.assertEqual(tokenizer.tokenize('a b c x'.split()),
+                         ['a_b', 'c', 'x'])
+
+    def test_texttiling_vectorized(self):
+        """
+        Test that vectorized TextTiling finds the same scores and sections
+        as TextTiling over the token table, and that streaming TextTiling
+        returns the whole text.
+        """
+        try:
+            import scipy.sparse
+        except ImportError:
+            raise unittest.SkipTest("scipy is required")
+        import random
+        from nltk.tokenize.texttiling import TextTilingTokenizer
+
+        rand = random.Random(0)
+        topics = [('cat', 'dog', 'fur', 'paw', 'tail', 'pet', 'vet'),
+                  ('ship', 'sea', 'port', 'sail', 'crew', 'wave', 'deck'),
+                  ('code', 'bug', 'test', 'loop', 'file', 'disk', 'byte')]
+        paragraphs = []
+        for topic in [0, 0, 1, 1, 1, 2, 2, 0, 0, 2, 1, 1]:
+            words = [rand.choice(topics[topic] + ('the', 'a', 'was'))
+                     for i in range(rand.randint(40, 90))]
+            paragraphs.append(' '.join(words) + '.')
+        text = '\n\n'.join(paragraphs)
+
+        for k in [3, 6, 10]:
+            loop = TextTilingTokenizer(w=10, k=k, stopwords=['the', 'a'],
+                                       demo_mode=True)
+            vectorized = TextTilingTokenizer(w=10, k=k, stopwords=['the', 'a'],
+                                             demo_mode=True, vectorized=True)
+            for expected, result in zip(loop.tokenize(text),
+                                        vectorized.tokenize(text)):
+                self.assertEqual(list(result), list(expected))
+            loop.demo_mode = vectorized.demo_mode = False
+            self.assertEqual(vectorized.tokenize(text), loop.tokenize(text))
+
+        sections = vectorized.tokenize_stream(text.splitlines(True), window=200)
+        self.assertEqual(''.join(sections), text)
+
+    def test_moses_tokenize_lines(self):
+        """
+        Test that MosesTokenizer.tokenize_lines() gives the same results as
+        tokenizing each line, in a pool of workers or not.
+        """
+        try:
+            from nltk.tokenize.moses import MosesTokenizer
+            tokenizer = MosesTokenizer()
+        except LookupError as e:
+            raise unittest.SkipTest(str(e))
+        lines = ["This ain't funny. It's actually hillarious, yet double Ls.",
+                 "| [] < > [ ] & You're gonna shake it off? Don't?",
+                 'Is 9.5 or 525,600 my favorite number...  e.g. Mr. X?\n',
+                 '', '  \t', 'and/or well-known -- "quoted" text!'] * 5
+        for return_str in [False, True]:
+            expected = [tokenizer.tokenize(line, True, return_str)
+                        for line in lines]
+            for workers in [1, 2]:
+                result = tokenizer.tokenize_lines(iter(lines), True, return_str,
+                                                  workers=workers, chunksize=4)
+                self.assertEqual(list(result), expected)
+
+    def test_tweet_span_tokenize(self):
+        """
+        Test that the spans of TweetTokenizer point at the text that its
+        tokens were made from, also after entities were replaced, and that
+        tokenize_many() gives the same tokens as tokenize().
+        """
+        tokenizer = TweetTokenizer(strip_handles=True, reduce_len=True)
+        text = "@remy: I &lt;3 caaaaake &amp; pie!!!!!! &#39;Yes&#39; :-)"
+        self.assertEqual(tokenizer.tokenize(text),
+                         [':', 'I', '<3', 'caaake', '&', 'pie', '!', '!', '!',
+                          "'", 'Yes', "'", ':-)'])
+        spans = list(tokenizer.span_tokenize(text))
+        self.assertEqual([text[start:end] for start, end in spans],
+                         [':', 'I', '&lt;3', 'caaaaake', '&amp;', 'pie', '!',
+                          '!', '!!!!', '&#39;', 'Yes', '&#39;', ':-)'])
+
+        raw = 'résumé &amp; café'.encode('utf-8')
+        spans = list(TweetTokenizer().span_tokenize(raw))
+        self.assertEqual([raw[start:end] for start, end in spans],
+                         ['résumé'.encode('utf-8'), b'&amp;',
+                          'café'.encode('utf-8')])
+
+        texts = [text, 'RT @remy: hi', text, 'hi', 'hi', text]
+        expected = [tokenizer.tokenize(t) for t in texts]
+        self.assertEqual(tokenizer.tokenize_many(texts), expected)
+        self.assertEqual(tokenizer.tokenize_many(texts, cache_size=1), expected)
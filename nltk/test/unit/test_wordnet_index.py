@@ -0,0 +1,179 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the WordNet corpus reader, on a tiny WordNet.
+"""
+from __future__ import absolute_import, unicode_literals
+import os
+import shutil
+import tempfile
+import unittest
+
+from nltk.corpus.reader.wordnet import WordNetCorpusReader, _CompiledLemmaIndex
+
+# (pos, lexname index, lemmas, hypernyms, instance hypernyms, gloss) for
+# each synset of a tiny WordNet; hypernyms are indices into SYNSETS.
+SYNSETS = [
+    ('n', 1, ['entity'], [], [], 'that which exists'),
+    ('n', 1, ['animal'], [0], [], 'a living organism'),
+    ('n', 1, ['pet'], [0], [], 'a domesticated animal'),
+    ('n', 1, ['dog', 'domestic_dog'], [1, 2], [], 'a member of the genus Canis'),
+    ('n', 1, ['cat'], [1, 2], [], 'feline mammal'),
+    ('n', 1, ['puppy'], [3], [], 'a young dog'),
+    ('n', 1, ['dog', 'frump'], [7], [], 'a dull unattractive unpleasant girl or woman'),
+    ('n', 1, ['person'], [0], [], 'a human being'),
+    ('n', 1, ['rover'], [], [3], 'a famous dog'),
+    ('v', 2, ['move'], [], [], 'change position'),
+    ('v', 2, ['run'], [9], [], 'move fast by using one\'s feet'),
+    ('v', 2, ['walk'], [9], [], 'use one\'s feet to advance'),
+    ('v', 2, ['think'], [], [], 'judge or regard'),
+    ('v', 2, ['ponder'], [12], [], 'reflect deeply on a subject'),
+    ('a', 0, ['big', 'large'], [], [], 'above average in size'),
+    ('r', 3, ['fast'], [], [], 'quickly or rapidly'),
+]
+EXCEPTIONS = {'noun': 'dogs dog\n', 'verb': 'ran run\n',
+              'adj': 'bigger big\n', 'adv': ''}
+FILEMAP = {'n': 'noun', 'v': 'verb', 'a': 'adj', 'r': 'adv'}
+LICENSE = '  1 license line\n'
+
+
+def write_wordnet(root):
+    with open(os.path.join(root, 'lexnames'), 'w') as fp:
+        fp.write('00\tadj.all\t3\n01\tnoun.animal\t1\n'
+                 '02\tverb.motion\t2\n03\tadv.all\t4\n')
+
+    def line(i, offsets):
+        pos, lexname, lemmas, hypernyms, instances, gloss = SYNSETS[i]
+        words = ' '.join('%s 0' % lemma for lemma in lemmas)
+        pointers = ['@ %08d %s 0000' % (offsets[j], pos) for j in hypernyms]
+        pointers += ['@i %08d %s 0000' % (offsets[j], pos) for j in instances]
+        frames = ' 01 + 02 00' if pos == 'v' else ''
+        return '%08d %02d %s %02x %s %03d %s%s | %s  \n' % (
+            offsets[i], lexname, pos, len(lemmas), words, len(pointers),
+            ' '.join(pointers), frames, gloss)
+
+    # Offsets are all eight digits wide, so the line lengths (and so the
+    # offsets) can be computed from lines with dummy offsets.
+    offsets = [0] * len(SYNSETS)
+    sizes = dict((pos, len(LICENSE)) for pos in FILEMAP)
+    for i, synset in enumerate(SYNSETS):
+        offsets[i] = sizes[synset[0]]
+        sizes[synset[0]] += len(line(i, [0] * len(SYNSETS)))
+
+    for pos, suffix in FILEMAP.items():
+        index = {}
+        with open(os.path.join(root, 'data.' + suffix), 'w') as fp:
+            fp.write(LICENSE)
+            for i, synset in enumerate(SYNSETS):
+                if synset[0] == pos:
+                    fp.write(line(i, offsets))
+                    for lemma in synset[2]:
+                        index.setdefault(lemma, []).append(offsets[i])
+        with open(os.path.join(root, 'index.' + suffix), 'w') as fp:
+            fp.write(LICENSE)
+            for lemma, lemma_offsets in sorted(index.items()):
+                fp.write('%s %s %d 0 %d 0 %s  \n' % (
+                    lemma, pos, len(lemma_offsets), len(lemma_offsets),
+                    ' '.join('%08d' % offset for offset in lemma_offsets)))
+        with open(os.path.join(root, suffix + '.exc'), 'w') as fp:
+            fp.write(EXCEPTIONS[suffix])
+    for fileid in ['cntlist.rev', 'index.sense']:
+        open(os.path.join(root, fileid), 'w').close()
+
+
+class TestCompiledIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        write_wordnet(self.root)
+        self.text = WordNetCorpusReader(self.root, None)
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def test_compiled_index(self):
+        path = WordNetCorpusReader(self.root, None).compile_index()
+        self.assertTrue(os.path.exists(path))
+        wn = WordNetCorpusReader(self.root, None)
+        self.assertTrue(isinstance(wn._lemma_pos_offset_map, _CompiledLemmaIndex))
+
+        self.assertEqual(sorted(wn.all_lemma_names()),
+                         sorted(self.text.all_lemma_names()))
+        for form in ['dogs', 'dog', 'ran', 'bigger', 'large', 'fast', 'cats']:
+            self.assertEqual(wn.synsets(form), self.text.synsets(form))
+            self.assertEqual(wn.morphy(form), self.text.morphy(form))
+        self.assertEqual(wn.synset('dog.n.02').lemma_names(),
+                         ['dog', 'frump'])
+        self.assertEqual(wn.synset('large.a.01'), self.text.synset('big.a.01'))
+        self.assertEqual(wn.synsets('unknown'), [])
+
+    def test_stale_index_is_ignored(self):
+        WordNetCorpusReader(self.root, None).compile_index()
+        with open(os.path.join(self.root, 'noun.exc'), 'a') as fp:
+            fp.write('cats cat\n')
+        wn = WordNetCorpusReader(self.root, None)
+        self.assertFalse(isinstance(wn._lemma_pos_offset_map, _CompiledLemmaIndex))
+        self.assertEqual(wn.morphy('cats'), 'cat')
+
+    def test_same_size_edit_is_detected(self):
+        WordNetCorpusReader(self.root, None).compile_index()
+        path = os.path.join(self.root, 'verb.exc')
+        with open(path, 'w') as fp:
+            fp.write('ram run\n')
+        stat = os.stat(path)
+        os.utime(path, (stat.st_atime, stat.st_mtime + 10))
+        wn = WordNetCorpusReader(self.root, None)
+        self.assertFalse(isinstance(wn._lemma_pos_offset_map, _CompiledLemmaIndex))
+        self.assertEqual(wn.morphy('ram', 'v'), 'run')
+
+
+class TestPairwiseSimilarity(unittest.TestCase):
+
+    def setUp(self):
+        from nose import SkipTest
+        try:
+            import numpy
+        except ImportError:
+            raise SkipTest('numpy is not installed')
+        self.root = tempfile.mkdtemp()
+        write_wordnet(self.root)
+        self.wn = WordNetCorpusReader(self.root, None)
+        self.wn.get_version = lambda: '3.0'
+        self.synsets = list(self.wn.all_synsets())
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def assertMatchesSynsetMethod(self, metric, *args):
+        from nltk.corpus.reader.wordnet import WordNetError
+        matrix = self.wn.pairwise_similarity(self.synsets, self.synsets,
+                                             metric, *args)
+        self.assertEqual(matrix.shape, (len(self.synsets),) * 2)
+        for i, synset1 in enumerate(self.synsets):
+            for j, synset2 in enumerate(self.synsets):
+                method = getattr(synset1, metric + '_similarity')
+                try:
+                    expected = method(synset2, *args)
+                except WordNetError:
+                    expected = None
+                if expected is None:
+                    self.assertTrue(matrix[i, j] != matrix[i, j])
+                else:
+                    self.assertAlmostEqual(matrix[i, j], expected)
+
+    def test_path_similarity(self):
+        self.assertMatchesSynsetMethod('path')
+
+    def test_lch_similarity(self):
+        self.assertMatchesSynsetMethod('lch')
+
+    def test_wup_similarity(self):
+        self.assertMatchesSynsetMethod('wup')
+
+    def test_ic_similarity(self):
+        ic = {'n': {0: 20.0}, 'v': {0: 10.0}}
+        for i, synset in enumerate(self.synsets):
+            if synset.pos() in ic:
+                ic[synset.pos()][synset.offset()] = float(i % 4)
+        for metric in ['res', 'jcn', 'lin']:
+            self.assertMatchesSynsetMethod(metric, ic)
+
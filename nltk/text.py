@@ -550,35 +550,147 @@ class TextCollection(Text):
 
     Iterating over a TextCollection produces all the tokens of all the
     texts in order.
+
+    The ``tf``, ``idf`` and ``tf_idf`` weights are computed from an
+    inverted index, mapping each term to the number of times it occurs
+    in each text, which is built the first time one of them is called.
+    Texts can be added to the collection with ``add_text()``, and the
+    weights of every term in every text can be exported at once with
+    ``tf_idf_rows()`` or ``tf_idf_matrix()``.
+
+    >>> docs = TextCollection([['a', 'b', 'a'], ['b', 'c']])
+    >>> docs.tf('a', docs.text(0)), docs.idf('c')
+    (0.6666666666666666, 0.6931471805599453)
+    >>> docs.add_text(['c', 'd'])
+    >>> docs.idf('c') == log(3 / 2)
+    True
     """
     def __init__(self, source):
         if hasattr(source, 'words'): # bridge to the text corpus reader
             source = [source.words(f) for f in source.fileids()]
 
-        self._texts = source
-        Text.__init__(self, LazyConcatenation(source))
-        self._idf_cache = {}
+        self._texts = list(source)
+        Text.__init__(self, LazyConcatenation(self._texts))
+        self._postings = None
+
+    def _build_index(self):
+        """
+        Build the inverted index: ``_postings[i]`` maps the number of
+        each text containing the term ``_terms[i]`` to the number of
+        times it occurs in that text.
+        """
+        self._terms = []
+        self._term_ids = {}
+        self._postings = []
+        self._lengths = []
+        self._text_ids = {}
+        for text in self._texts:
+            self._index_text(text)
+
+    def _index_text(self, text):
+        doc = len(self._lengths)
+        self._text_ids.setdefault(id(text), doc)
+        self._lengths.append(len(text))
+        for term, count in Counter(text).items():
+            term_id = self._term_ids.get(term)
+            if term_id is None:
+                term_id = self._term_ids[term] = len(self._terms)
+                self._terms.append(term)
+                self._postings.append({})
+            self._postings[term_id][doc] = count
+
+    def add_text(self, text):
+        """
+        Add a text to the end of the collection, updating the inverted
+        index rather than rebuilding it.
+
+        :param text: The tokens of the text.
+        :type text: sequence of str
+        """
+        self._texts.append(text)
+        if self._COPY_TOKENS:
+            self.tokens.extend(text)
+        # Any analyses of the concatenated tokens are now out of date.
+        for attr in ('_concordance_index', '_collocations',
+                     '_word_context_index', '_vocab', '_token_searcher'):
+            self.__dict__.pop(attr, None)
+        if self._postings is not None:
+            self._index_text(text)
+
+    def text(self, i):
+        """ The ``i``-th text of the collection. """
+        return self._texts[i]
 
     def tf(self, term, text):
         """ The frequency of the term in text. """
-        return text.count(term) / len(text)
+        if self._postings is None:
+            self._build_index()
+        doc = self._text_ids.get(id(text))
+        if doc is None or self._texts[doc] is not text:
+            return text.count(term) / len(text)
+        term_id = self._term_ids.get(term)
+        if term_id is None:
+            return 0.0
+        return self._postings[term_id].get(doc, 0) / self._lengths[doc]
 
     def idf(self, term):
         """ The number of texts in the corpus divided by the
         number of texts that the term appears in.
         If a term does not appear in the corpus, 0.0 is returned. """
-        # idf values are cached for performance.
-        idf = self._idf_cache.get(term)
-        if idf is None:
-            matches = len([True for text in self._texts if term in text])
-            # FIXME Should this raise some kind of error instead?
-            idf = (log(len(self._texts) / matches) if matches else 0.0)
-            self._idf_cache[term] = idf
-        return idf
+        if self._postings is None:
+            self._build_index()
+        term_id = self._term_ids.get(term)
+        matches = len(self._postings[term_id]) if term_id is not None else 0
+        # FIXME Should this raise some kind of error instead?
+        return (log(len(self._texts) / matches) if matches else 0.0)
 
     def tf_idf(self, term, text):
         return self.tf(term, text) * self.idf(term)
 
+    def tf_idf_rows(self):
+        """
+        Return the tf-idf weights of every text in the collection, as a
+        list with one dictionary per text, mapping each term of the text
+        to its weight.  This makes a single pass over the inverted index.
+
+        :rtype: list(dict)
+        """
+        if self._postings is None:
+            self._build_index()
+        rows = [{} for text in self._texts]
+        n = len(self._texts)
+        for term, postings in zip(self._terms, self._postings):
+            idf = log(n / len(postings))
+            for doc, count in postings.items():
+                rows[doc][term] = count / self._lengths[doc] * idf
+        return rows
+
+    def tf_idf_matrix(self):
+        """
+        Return the tf-idf weights of every text in the collection as a
+        sparse matrix with one row per text and one column per term, and
+        the list of terms labelling the columns.  Terms that occur in
+        every text have a weight of zero, which is not stored.  Requires
+        scipy.
+
+        :rtype: tuple(scipy.sparse.csr_matrix, list)
+        """
+        from scipy.sparse import csc_matrix
+
+        if self._postings is None:
+            self._build_index()
+        n = len(self._texts)
+        data, indices, indptr = [], [], [0]
+        for postings in self._postings:
+            idf = log(n / len(postings))
+            if idf:
+                for doc in sorted(postings):
+                    indices.append(doc)
+                    data.append(postings[doc] / self._lengths[doc] * idf)
+            indptr.append(len(indices))
+        matrix = csc_matrix((data, indices, indptr), shape=(n, len(self._terms)))
+        return matrix.tocsr(), list(self._terms)
+
 def demo():
     from nltk.corpus import brown
     text = Text(brown.words(categories='news'))
@@ -38,6 +38,7 @@ domains and tasks. The basic logic is this:
 
 from __future__ import unicode_literals
 import re
+from collections import OrderedDict
 from nltk.compat import htmlentitydefs, int2byte, unichr
 
 
@@ -186,6 +187,10 @@ EMOTICON_RE = re.compile(EMOTICONS, re.VERBOSE | re.I | re.UNICODE)
 # These are for regularizing HTML entities to Unicode:
 ENT_RE = re.compile(r'&(#?(x?))([^&;\s]+);')
 
+# These are for the normalization functions below:
+LENGTHENING_RE = re.compile(r"(.)\1{2,}")
+HANDLES_RE = re.compile(r"(?<![A-Za-z0-9_!@#\$%&*])@(([A-Za-z0-9_]){20}(?!@))|(?<![A-Za-z0-9_!@#\$%&*])@(([A-Za-z0-9_]){1,19})(?![A-Za-z0-9_]*@)")
+
 
 ######################################################################
 # Functions for converting html entities
@@ -226,6 +231,15 @@ def _replace_html_entities(text, keep=(), remove_illegal=True, encoding='utf-8')
         >>>
     """
 
+    return ENT_RE.sub(_entity_converter(keep, remove_illegal),
+                      _str_to_unicode(text, encoding))
+
+
+def _entity_converter(keep=(), remove_illegal=True):
+    """
+    Return the function that ``_replace_html_entities()`` replaces each
+    match of ``ENT_RE`` with.
+    """
     def _convert_entity(match):
         entity_body = match.group(3)
         if match.group(1):
@@ -255,7 +269,51 @@ def _replace_html_entities(text, keep=(), remove_illegal=True, encoding='utf-8')
 
         return "" if remove_illegal else match.group(0)
 
-    return ENT_RE.sub(_convert_entity, _str_to_unicode(text, encoding))
+    return _convert_entity
+
+
+def _sub_with_offsets(regexp, repl, text, offsets):
+    """
+    Return ``regexp.sub(repl, text)``, with the offsets of its characters
+    in the original text, given the *offsets* of those of *text*.  The
+    offsets are a pair of lists: the start and the end of each character.
+    A replacement that is a prefix of the text it replaces, such as a
+    shortened run of characters, keeps the offsets of that prefix, except
+    that its last character extends to the end of the replaced text;
+    every character of any other replacement spans the whole replaced
+    text.  If *offsets* is None, each character of *text* is at its own
+    position, and the offsets stay None if nothing is replaced.
+    """
+    matches = list(regexp.finditer(text))
+    if not matches:
+        return text, offsets
+    if offsets is None:
+        offsets = list(range(len(text))), list(range(1, len(text) + 1))
+    old_starts, old_ends = offsets
+    pieces, starts, ends = [], [], []
+    pos = 0
+    for match in matches:
+        start, end = match.span()
+        if callable(repl):
+            replacement = repl(match)
+        else:
+            replacement = match.expand(repl)
+        pieces.append(text[pos:start])
+        pieces.append(replacement)
+        starts.extend(old_starts[pos:start])
+        ends.extend(old_ends[pos:start])
+        if replacement and text.startswith(replacement, start):
+            starts.extend(old_starts[start:start + len(replacement)])
+            ends.extend(old_ends[start:start + len(replacement) - 1])
+            ends.append(old_ends[end - 1])
+        else:
+            starts.extend([old_starts[start]] * len(replacement))
+            ends.extend([old_ends[end - 1]] * len(replacement))
+        pos = end
+    pieces.append(text[pos:])
+    starts.extend(old_starts[pos:])
+    ends.extend(old_ends[pos:])
+    return ''.join(pieces), (starts, ends)
 
 
 ######################################################################
@@ -276,6 +334,15 @@ class TweetTokenizer:
         >>> s1 = '@remy: This is waaaaayyyy too much for you!!!!!!'
         >>> tknzr.tokenize(s1)
         [':', 'This', 'is', 'waaayyy', 'too', 'much', 'for', 'you', '!', '!', '!']
+
+    The offsets of the tokens in the original text, before entities were
+    replaced and sequences of characters shortened:
+
+        >>> s2 = 'Hmmmmm &amp; hmm &lt;3'
+        >>> list(tknzr.span_tokenize(s2))
+        [(0, 6), (7, 12), (13, 16), (17, 22)]
+        >>> tknzr.tokenize(s2)
+        ['Hmmm', '&', 'hmm', '<3']
     """
 
     def __init__(self, preserve_case=True, reduce_len=False, strip_handles=False):
@@ -291,9 +358,11 @@ class TweetTokenizer:
         the original string if `preserve_case=False`
         """
         # Fix HTML character entities:
-        text = _replace_html_entities(text)
+        text = _str_to_unicode(text)
+        if '&' in text:
+            text = _replace_html_entities(text)
         # Remove username handles
-        if self.strip_handles:
+        if self.strip_handles and '@' in text:
             text = remove_handles(text)
         # Normalize word lengthening
         if self.reduce_len:
@@ -308,6 +377,72 @@ class TweetTokenizer:
                               x.lower()), words))
         return words
 
+    def span_tokenize(self, text):
+        """
+        Return the offsets ``(start, end)`` of the tokens of ``tokenize()``
+        in *text*, such that ``text[start:end]`` is what each token was
+        made from, before HTML entities were replaced and sequences of
+        characters shortened.  If *text* is a byte string, the offsets are
+        into its bytes.
+
+        :param text: str
+        :rtype: iter(tuple(int, int))
+        """
+        decoded = _str_to_unicode(text)
+        offsets = None
+        if '&' in decoded:
+            decoded, offsets = _sub_with_offsets(ENT_RE, _entity_converter(),
+                                                 decoded, offsets)
+        if self.strip_handles and '@' in decoded:
+            decoded, offsets = _sub_with_offsets(HANDLES_RE, ' ', decoded,
+                                                 offsets)
+        if self.reduce_len:
+            decoded, offsets = _sub_with_offsets(LENGTHENING_RE, r'\1\1\1',
+                                                 decoded, offsets)
+        decoded, offsets = _sub_with_offsets(HANG_RE, r'\1\1\1', decoded,
+                                             offsets)
+
+        positions = None
+        if isinstance(text, bytes):
+            positions = [0]
+            for char in _str_to_unicode(text):
+                positions.append(positions[-1] + len(char.encode('utf-8')))
+        for match in WORD_RE.finditer(decoded):
+            start, end = match.span()
+            if offsets is not None:
+                start, end = offsets[0][start], offsets[1][end - 1]
+            if positions is not None:
+                start, end = positions[start], positions[end]
+            yield start, end
+
+    def tokenize_many(self, texts, cache_size=0):
+        """
+        Return a tokenized copy of each of *texts*, as ``tokenize()`` would.
+        If *cache_size* is positive, the tokens of that many of the most
+        recently seen distinct texts are kept, so that a text that recurs,
+        such as a retweet, is only tokenized once.
+
+        :param texts: the texts to tokenize
+        :type texts: iter(str)
+        :param cache_size: the number of distinct texts to remember
+        :type cache_size: int
+        :rtype: list(list(str))
+        """
+        tokenize = self.tokenize
+        if cache_size < 1:
+            return [tokenize(text) for text in texts]
+        cache = OrderedDict()
+        result = []
+        for text in texts:
+            words = cache.pop(text, None)
+            if words is None:
+                words = tokenize(text)
+                if len(cache) >= cache_size:
+                    cache.popitem(last=False)
+            cache[text] = words
+            result.append(list(words))
+        return result
+
 ######################################################################
 # Normalization Functions
 ######################################################################
@@ -317,16 +452,14 @@ def reduce_lengthening(text):
     Replace repeated character sequences of length 3 or greater with sequences
     of length 3.
     """
-    pattern = re.compile(r"(.)\1{2,}")
-    return pattern.sub(r"\1\1\1", text)
+    return LENGTHENING_RE.sub(r"\1\1\1", text)
 
 def remove_handles(text):
     """
     Remove Twitter username handles from text.
     """
-    pattern = re.compile(r"(?<![A-Za-z0-9_!@#\$%&*])@(([A-Za-z0-9_]){20}(?!@))|(?<![A-Za-z0-9_!@#\$%&*])@(([A-Za-z0-9_]){1,19})(?![A-Za-z0-9_]*@)")
     # Substitute hadnles with ' ' to ensure that text on either side of removed handles are tokenized correctly
-    return pattern.sub(' ', text)
+    return HANDLES_RE.sub(' ', text)
 
 ######################################################################
 # Tokenization Function
@@ -12,11 +12,49 @@ from __future__ import print_function
 import re
 from six import text_type
 
+from nltk.internals import process_imap, pool_shared, iter_chunks
 from nltk.tokenize.api import TokenizerI
 from nltk.tokenize.util import is_cjk
 from nltk.corpus import perluniprops, nonbreaking_prefixes
 
 
+def _literal_substitution(rules):
+    """
+    Return a function that applies *rules*, a list of (regexp, substitution)
+    pairs that each replace a literal string with a literal string, in a
+    single pass.  This is the same as applying them in turn, provided that
+    no rule can match within or create a match of a later rule.
+    """
+    mapping = dict((re.sub(r'\\(.)', r'\1', regexp), substitution)
+                   for regexp, substitution in rules)
+    regexp = re.compile('|'.join(re.escape(literal) for literal in
+                                 sorted(mapping, key=len, reverse=True)))
+    replace = lambda match: mapping[match.group()]
+    return lambda text: regexp.sub(replace, text)
+
+
+class _CompiledRules(object):
+    """
+    The compiled regexps of a MosesTokenizer or MosesDetokenizer class for
+    one language, which are shared by all its instances.
+    """
+    _cache = {}
+
+    @classmethod
+    def get(cls, tokenizer):
+        key = (type(tokenizer), tokenizer.lang)
+        if key not in cls._cache:
+            rules = cls()
+            tokenizer._compile_rules(rules)
+            cls._cache[key] = rules
+        return cls._cache[key]
+
+
+def _compile(*rules):
+    return [(re.compile(regexp), substitution)
+            for regexp, substitution in rules]
+
+
 class MosesTokenizer(TokenizerI):
     """
     This is a Python port of the Moses Tokenizer from
@@ -223,29 +261,60 @@ class MosesTokenizer(TokenizerI):
                                 ESCAPE_LEFT_SQUARE_BRACKET,
                                 ESCAPE_RIGHT_SQUARE_BRACKET]
 
+    # The nonbreaking prefixes of each language, read once from the corpus.
+    _nonbreaking_prefixes = {}
+
     def __init__(self, lang='en'):
         # Initialize the object.
         super(MosesTokenizer, self).__init__()
         self.lang = lang
         # Initialize the language specific nonbreaking prefixes.
-        self.NONBREAKING_PREFIXES = nonbreaking_prefixes.words(lang)
-        self.NUMERIC_ONLY_PREFIXES = [w.rpartition(' ')[0] for w in
-                                      self.NONBREAKING_PREFIXES if
-                                      self.has_numeric_only(w)]
-
-
+        if lang not in self._nonbreaking_prefixes:
+            prefixes = nonbreaking_prefixes.words(lang)
+            numeric_only = [w.rpartition(' ')[0] for w in prefixes
+                            if self.has_numeric_only(w)]
+            self._nonbreaking_prefixes[lang] = prefixes, numeric_only
+        prefixes, numeric_only = self._nonbreaking_prefixes[lang]
+        self.NONBREAKING_PREFIXES = list(prefixes)
+        self.NUMERIC_ONLY_PREFIXES = list(numeric_only)
+
+    @property
+    def _rules(self):
+        return _CompiledRules.get(self)
+
+    def _compile_rules(self, rules):
+        rules.clean = _compile(self.DEDUPLICATE_SPACE, self.ASCII_JUNK)
+        rules.deduplicate_space = _compile(self.DEDUPLICATE_SPACE)[0]
+        rules.pad_not_isalnum = _compile(self.PAD_NOT_ISALNUM)[0]
+        rules.aggressive_hyphen_split = _compile(self.AGGRESSIVE_HYPHEN_SPLIT)[0]
+        rules.multidots = _compile((r'\.([\.]+)', r' DOTMULTI\1'),
+                                   (r'DOTMULTI\.([^\.])', r'DOTDOTMULTI \1'),
+                                   (r'DOTMULTI\.', 'DOTDOTMULTI'))
+        rules.comma_separate = _compile(self.COMMA_SEPARATE_1,
+                                        self.COMMA_SEPARATE_2)
+        if self.lang == 'en':
+            rules.apostrophe = _compile(*self.ENGLISH_SPECIFIC_APOSTROPHE)
+        elif self.lang in ['fr', 'it']:
+            rules.apostrophe = _compile(*self.FR_IT_SPECIFIC_APOSTROPHE)
+        else:
+            rules.apostrophe = _compile(self.NON_SPECIFIC_APOSTROPHE)
+        rules.token_ends_with_period = re.compile(r'^(\S+)\.$')
+        # None of the escapes contains a character escaped by a later one.
+        rules.escape_xml = _literal_substitution(self.MOSES_ESCAPE_XML_REGEXES)
 
     def replace_multidots(self, text):
-        text = re.sub(r'\.([\.]+)', r' DOTMULTI\1', text)
-        while re.search(r'DOTMULTI\.', text):
-            text = re.sub(r'DOTMULTI\.([^\.])', r'DOTDOTMULTI \1', text)
-            text = re.sub(r'DOTMULTI\.', 'DOTDOTMULTI', text)
+        if '..' in text:
+            regexp, substitution = self._rules.multidots[0]
+            text = regexp.sub(substitution, text)
+        while 'DOTMULTI.' in text:
+            for regexp, substitution in self._rules.multidots[1:]:
+                text = regexp.sub(substitution, text)
         return text
 
     def restore_multidots(self, text):
-        while re.search(r'DOTDOTMULTI', text):
-            text = re.sub(r'DOTDOTMULTI', r'DOTMULTI.', text)
-        return re.sub(r'DOTMULTI', r'.', text)
+        while 'DOTDOTMULTI' in text:
+            text = text.replace('DOTDOTMULTI', 'DOTMULTI.')
+        return text.replace('DOTMULTI', '.')
 
     def islower(self, text):
         return not set(text).difference(set(IsLower))
@@ -260,9 +329,12 @@ class MosesTokenizer(TokenizerI):
         # Splits the text into tokens to check for nonbreaking prefixes.
         tokens = text.split()
         num_tokens = len(tokens)
+        # Checks if token ends with a fullstop.  As this checks the whole
+        # text, it can only match a text of one token.
+        token_ends_with_period = self._rules.token_ends_with_period.search(text)
+        if not token_ends_with_period:
+            return " ".join(tokens)
         for i, token in enumerate(tokens):
-            # Checks if token ends with a fullstop.
-            token_ends_with_period = re.search(r'^(\S+)\.$', text)
             if token_ends_with_period:
                 prefix = token_ends_with_period.group(0)
                 # Checks for 3 conditions if
@@ -286,9 +358,7 @@ class MosesTokenizer(TokenizerI):
         return " ".join(tokens) # Stitch the tokens back.
 
     def escape_xml(self, text):
-        for regexp, substitution in self.MOSES_ESCAPE_XML_REGEXES:
-            text = re.sub(regexp, substitution, text)
-        return text
+        return self._rules.escape_xml(text)
 
     def penn_tokenize(self, text, return_str=False):
         """
@@ -330,41 +400,37 @@ class MosesTokenizer(TokenizerI):
         """
         # Converts input string into unicode.
         text = text_type(text)
+        rules = self._rules
 
         # De-duplicate spaces and clean ASCII junk
-        for regexp, substitution in [self.DEDUPLICATE_SPACE, self.ASCII_JUNK]:
-            text = re.sub(regexp, substitution, text)
+        for regexp, substitution in rules.clean:
+            text = regexp.sub(substitution, text)
         # Strips heading and trailing spaces.
         text = text.strip()
         # Separate special characters outside of IsAlnum character set.
-        regexp, substitution = self.PAD_NOT_ISALNUM
-        text = re.sub(regexp, substitution, text)
+        regexp, substitution = rules.pad_not_isalnum
+        text = regexp.sub(substitution, text)
         # Aggressively splits dashes
-        if agressive_dash_splits:
-            regexp, substitution = self.AGGRESSIVE_HYPHEN_SPLIT
-            text = re.sub(regexp, substitution, text)
+        if agressive_dash_splits and '-' in text:
+            regexp, substitution = rules.aggressive_hyphen_split
+            text = regexp.sub(substitution, text)
         # Replaces multidots with "DOTDOTMULTI" literal strings.
         text = self.replace_multidots(text)
         # Separate out "," except if within numbers e.g. 5,300
-        for regexp, substitution in [self.COMMA_SEPARATE_1, self.COMMA_SEPARATE_2]:
-            text = re.sub(regexp, substitution, text)
+        if ',' in text:
+            for regexp, substitution in rules.comma_separate:
+                text = regexp.sub(substitution, text)
 
         # (Language-specific) apostrophe tokenization.
-        if self.lang == 'en':
-            for regexp, substitution in self.ENGLISH_SPECIFIC_APOSTROPHE:
-                 text = re.sub(regexp, substitution, text)
-        elif self.lang in ['fr', 'it']:
-            for regexp, substitution in self.FR_IT_SPECIFIC_APOSTROPHE:
-                text = re.sub(regexp, substitution, text)
-        else:
-            regexp, substitution = self.NON_SPECIFIC_APOSTROPHE
-            text = re.sub(regexp, substitution, text)
+        if "'" in text:
+            for regexp, substitution in rules.apostrophe:
+                text = regexp.sub(substitution, text)
 
         # Handles nonbreaking prefixes.
         text = self.handles_nonbreaking_prefixes(text)
         # Cleans up extraneous spaces.
-        regexp, substitution = self.DEDUPLICATE_SPACE
-        text = re.sub(regexp,substitution, text).strip()
+        regexp, substitution = rules.deduplicate_space
+        text = regexp.sub(substitution, text).strip()
         # Restore multidots.
         text = self.restore_multidots(text)
         # Escape XML symbols.
@@ -372,6 +438,45 @@ class MosesTokenizer(TokenizerI):
 
         return text if return_str else text.split()
 
+    def tokenize_lines(self, lines, agressive_dash_splits=False,
+                       return_str=False, workers=1, chunksize=1000):
+        """
+        Tokenize each of *lines*, such as the lines of a file, and yield
+        the results in order; each is the same as ``tokenize()`` returns
+        for the line.  *lines* is read lazily, so it may be of any size.
+
+        If *workers* is more than 1, chunks of *chunksize* lines are
+        tokenized in a ``nltk.internals.process_pool()`` of that many
+        processes.  Where the platform supports it, the workers are forked
+        from the current process, and share the tokenizer's compiled rules
+        instead of receiving a pickled copy.  At most ``2 * workers``
+        chunks are queued at any time.
+
+        :param lines: The texts to tokenize.
+        :type lines: iter(str)
+        :param workers: The number of worker processes.
+        :type workers: int
+        :param chunksize: The number of lines sent to a worker at a time.
+        :type chunksize: int
+        :rtype: iter(list(str)) or iter(str)
+        """
+        if workers <= 1:
+            for line in lines:
+                yield self.tokenize(line, agressive_dash_splits, return_str)
+            return
+
+        tasks = ((chunk, agressive_dash_splits, return_str)
+                 for chunk in iter_chunks(lines, chunksize))
+        for results in process_imap(_tokenize_chunk, tasks, workers, self):
+            for result in results:
+                yield result
+
+
+def _tokenize_chunk(task):
+    chunk, agressive_dash_splits, return_str = task
+    return [pool_shared().tokenize(line, agressive_dash_splits, return_str)
+            for line in chunk]
+
 
 class MosesDetokenizer(TokenizerI):
     """
@@ -460,11 +565,25 @@ class MosesDetokenizer(TokenizerI):
         super(MosesDetokenizer, self).__init__()
         self.lang = lang
 
+    @property
+    def _rules(self):
+        return _CompiledRules.get(self)
+
+    def _compile_rules(self, rules):
+        rules.aggressive_hyphen_split = _compile(self.AGGRESSIVE_HYPHEN_SPLIT)[0]
+        # Each escape starts with "&" and ends with the first ";" after it.
+        rules.unescape_xml = _literal_substitution(
+            self.MOSES_UNESCAPE_XML_REGEXES)
+        rules.punctuation = re.compile(r'^[\,\.\?\!\:\;\\\%\}\]\)]+$')
+        rules.fr_punctuation = re.compile(r'^[\?\!\:\;\\\%]$')
+        rules.en_contraction = re.compile(u"^[\'][{}]".format(self.IsAlpha))
+        rules.alpha_apostrophe = re.compile(u'[{}][\']$'.format(self.IsAlpha))
+        rules.alpha = re.compile(u'^[{}]$'.format(self.IsAlpha))
+        rules.quotes = re.compile(r'''^[\'\"„“`]+$''')
+        rules.finnish = re.compile(self.FINNISH_REGEX)
 
     def unescape_xml(self, text):
-        for regexp, substitution in self.MOSES_UNESCAPE_XML_REGEXES:
-            text = re.sub(regexp, substitution, text)
-        return text
+        return self._rules.unescape_xml(text)
 
 
     def tokenize(self, tokens, return_str=False):
@@ -479,9 +598,10 @@ class MosesDetokenizer(TokenizerI):
         text = u" {} ".format(" ".join(tokens))
         # Converts input string into unicode.
         text = text_type(text)
+        rules = self._rules
         # Detokenize the agressive hyphen split.
-        regexp, substitution = self.AGGRESSIVE_HYPHEN_SPLIT
-        text = re.sub(regexp, substitution, text)
+        regexp, substitution = rules.aggressive_hyphen_split
+        text = regexp.sub(substitution, text)
         # Unescape the XML symbols.
         text = self.unescape_xml(text)
         # Keep track of no. of quotation marks.
@@ -512,16 +632,16 @@ class MosesDetokenizer(TokenizerI):
                 detokenized_text += prepend_space + token
                 prepend_space = ""
 
-            elif re.search(r'^[\,\.\?\!\:\;\\\%\}\]\)]+$', token):
+            elif rules.punctuation.search(token):
                 # In French, these punctuations are prefixed with a non-breakable space.
-                if self.lang == 'fr' and re.search(r'^[\?\!\:\;\\\%]$', token):
+                if self.lang == 'fr' and rules.fr_punctuation.search(token):
                     detokenized_text += " "
                 # Perform left shift on punctuation items.
                 detokenized_text += token
                 prepend_space = " "
 
             elif (self.lang == 'en' and i > 0
-                  and re.search(u"^[\'][{}]".format(self.IsAlpha), token)):
+                  and rules.en_contraction.search(token)):
                   #and re.search(u'[{}]$'.format(self.IsAlnum), tokens[i-1])):
                 # For English, left-shift the contraction.
                 detokenized_text += token
@@ -536,14 +656,14 @@ class MosesDetokenizer(TokenizerI):
                 prepend_space = " "
 
             elif (self.lang in ['fr', 'it'] and i <= len(tokens)-2
-                  and re.search(u'[{}][\']$'.format(self.IsAlpha), token)
-                  and re.search(u'^[{}]$'.format(self.IsAlpha), tokens[i+1])): # If the next token is alpha.
+                  and rules.alpha_apostrophe.search(token)
+                  and rules.alpha.search(tokens[i+1])): # If the next token is alpha.
                 # For French and Italian, right-shift the contraction.
                 detokenized_text += prepend_space + token
                 prepend_space = ""
 
             elif (self.lang == 'cs' and i <= len(tokens)-3
-                  and re.search(u'[{}][\']$'.format(self.IsAlpha), token)
+                  and rules.alpha_apostrophe.search(token)
                   and re.search(u'^[-–]$', tokens[i+1])
                   and re.search(u'^li$|^mail.*', tokens[i+2], re.IGNORECASE)): # In Perl, ($words[$i+2] =~ /^li$|^mail.*/i)
                 # In Czech, right-shift "-li" and a few Czech dashed words (e.g. e-mail)
@@ -552,7 +672,7 @@ class MosesDetokenizer(TokenizerI):
                 prepend_space = ""
 
             # Combine punctuation smartly.
-            elif re.search(r'''^[\'\"„“`]+$''', token):
+            elif rules.quotes.search(token):
                 normalized_quo = token
                 if re.search(r'^[„“”]+$', token):
                     normalized_quo = '"'
@@ -583,7 +703,7 @@ class MosesDetokenizer(TokenizerI):
                     quote_counts[normalized_quo] += 1
 
             elif (self.lang == 'fi' and re.search(r':$', tokens[i-1])
-                  and re.search(self.FINNISH_REGEX, token)):
+                  and rules.finnish.search(token)):
                 # Finnish : without intervening space if followed by case suffix
                 # EU:N EU:n EU:ssa EU:sta EU:hun EU:iin ...
                 detokenized_text += prepend_space + token
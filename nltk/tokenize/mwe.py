@@ -27,8 +27,28 @@ of MWEs:
     >>> tokenizer.tokenize('In a little or a little bit or a lot in spite of'.split())
     ['In', 'a_little', 'or', 'a_little_bit', 'or', 'a_lot', 'in_spite_of']
 
+The expressions are matched leftmost-longest, by a compiled word trie
+(see ``MWEAutomaton``), which ``mwe_spans()`` reports as
+``(start, end, entry_id)`` spans of token indices, where ``entry_id`` is
+the position of the expression in the lexicon:
+
+    >>> list(tokenizer.mwe_spans('In a little or a lot'.split()))
+    [(1, 3, 0), (4, 6, 2)]
+
+For large lexicons, the automaton can be compiled once, saved, and then
+memory-mapped by each process that uses it:
+
+    >>> from nltk.tokenize.mwe import MWEAutomaton
+    >>> automaton = MWEAutomaton([('New', 'York'), ('New', 'York', 'City')])
+    >>> MWETokenizer(automaton=automaton).tokenize('New York City is in New York'.split())
+    ['New_York_City', 'is', 'in', 'New_York']
+
 """
-from nltk.util import Trie
+import mmap
+import sys
+from array import array
+from bisect import bisect_left
+from zlib import crc32
 
 from nltk.tokenize.api import TokenizerI
 
@@ -38,7 +58,7 @@ class MWETokenizer(TokenizerI):
     into single tokens.
     """
 
-    def __init__(self, mwes=None, separator='_'):
+    def __init__(self, mwes=None, separator='_', automaton=None):
         """Initialize the multi-word tokenizer with a list of expressions and a
         separator
 
@@ -48,20 +68,25 @@ class MWETokenizer(TokenizerI):
         :type separator: str
         :param separator: String that should be inserted between words in a multi-word
             expression token. (Default is '_')
+        :type automaton: MWEAutomaton
+        :param automaton: A compiled lexicon to use instead of *mwes*, for
+            instance one loaded with ``MWEAutomaton.load()``.
 
         """
-        if not mwes:
-            mwes = []
-        self._mwes = Trie(mwes)
+        if automaton is not None:
+            if mwes:
+                raise ValueError('Specify either mwes or an automaton.')
+            self._mwes = None
+        else:
+            self._mwes = [tuple(mwe) for mwe in mwes or []]
+        self._automaton = automaton
         self._separator = separator
 
     def add_mwe(self, mwe):
-        """Add a multi-word expression to the lexicon (stored as a word trie)
+        """Add a multi-word expression to the lexicon.  The lexicon is
+        compiled again the next time it is used.
 
-        We use ``util.Trie`` to represent the trie. Its form is a dict of dicts. 
-        The key True marks the end of a valid MWE.
-
-        :param mwe: The multi-word expression we're adding into the word trie
+        :param mwe: The multi-word expression we're adding into the lexicon
         :type mwe: tuple(str) or list(str)
 
         :Example:
@@ -70,12 +95,37 @@ class MWETokenizer(TokenizerI):
         >>> tokenizer.add_mwe(('a', 'b'))
         >>> tokenizer.add_mwe(('a', 'b', 'c'))
         >>> tokenizer.add_mwe(('a', 'x'))
-        >>> expected = {'a': {'x': {True: None}, 'b': {True: None, 'c': {True: None}}}}
-        >>> tokenizer._mwes.as_dict() == expected
-        True
+        >>> tokenizer.tokenize('a b c a x a b a'.split())
+        ['a_b_c', 'a_x', 'a_b', 'a']
+
+        """
+        if self._mwes is None:
+            raise ValueError('Cannot add expressions to a compiled MWEAutomaton.')
+        self._mwes.append(tuple(mwe))
+        self._automaton = None
 
+    def automaton(self):
+        """
+        Return the ``MWEAutomaton`` that matches the lexicon, compiling
+        it if the lexicon has changed.
+
+        :rtype: MWEAutomaton
+        """
+        if self._automaton is None:
+            self._automaton = MWEAutomaton(self._mwes)
+        return self._automaton
+
+    def mwe_spans(self, text):
+        """
+        Return the leftmost-longest matches of the lexicon in *text*, as
+        ``(start, end, entry_id)`` tuples, where ``text[start:end]`` is the
+        ``entry_id``-th expression of the lexicon.
+
+        :param text: A list containing tokenized text
+        :type text: list(str)
+        :rtype: list(tuple(int, int, int))
         """
-        self._mwes.insert(mwe)
+        return self.automaton().spans(text)
 
     def tokenize(self, text):
         """
@@ -92,29 +142,297 @@ class MWETokenizer(TokenizerI):
         ['An', "hors+d'oeuvre", 'tonight,', 'sir?']
         
         """
-        i = 0
-        n = len(text)
         result = []
+        i = 0
+        for start, end, entry_id in self.automaton().spans(text):
+            result += text[i:start]
+            result.append(self._separator.join(text[start:end]))
+            i = end
+        result += text[i:]
+        return result
 
-        while i < n:
-            if text[i] in self._mwes:
-                # possible MWE match
-                j = i
-                trie = self._mwes
-                while j < n and text[j] in trie:
-                    trie = trie[text[j]]
-                    j = j + 1
-                else:
-                    if Trie.LEAF in trie:
-                        # success!
-                        result.append(self._separator.join(text[i:j]))
-                        i = j
-                    else:
-                        # no match, so backtrack
-                        result.append(text[i])
-                        i += 1
-            else:
-                result.append(text[i])
+
+######################################################################
+#{ Compiled Lexicon
+######################################################################
+
+_MWE_MAGIC = b'NLTKMWE2'
+
+# The arrays of an MWEAutomaton, in the order in which they are saved.
+_MWE_ARRAYS = ('_word_offsets', '_word_slots', '_root_next', '_label',
+               '_first_child', '_depth', '_entry', '_match')
+
+class MWEAutomaton(object):
+    """
+    A compiled word trie that finds the leftmost-longest matches of a
+    lexicon of multi-word expressions in a list of tokens.  Only the
+    tokens that begin an expression start a walk down the trie, and each
+    walk is at most as long as the longest expression, so matching takes
+    time linear in the number of tokens for a given lexicon.  Each state
+    of the trie records the longest expression that ends at it or at one
+    of its ancestors, so that a walk only needs to look at the state
+    where it stops.
+
+    An automaton compiled in memory keeps the trie as nested dicts from
+    words to child states, which are the fastest to walk.  ``save()``
+    numbers the states breadth-first, so the children of each state are
+    numbered consecutively, in the order of their word ids, and writes
+    the trie as flat arrays of 32-bit integers.  ``load()`` memory-maps
+    these where the platform allows, so processes can share one copy of
+    a large lexicon; a loaded automaton finds word ids with an
+    open-addressing hash table over the saved words, and child states by
+    bisection, so that nothing but the arrays needs to be read.
+    """
+
+    def __init__(self, mwes):
+        """
+        Compile a lexicon.
+
+        :param mwes: The multi-word expressions, each a sequence of
+            strings.  The position of each in *mwes* is its entry id; the
+            entry id of a repeated expression is that of its first
+            occurrence.  Empty expressions are ignored.
+        :type mwes: iter(tuple(str))
+        """
+        # The key None of a state gives the length and entry id of the
+        # expression that ends there, and once the trie is complete, of
+        # the longest expression that ends at or above it.
+        self._trie = {}
+        for entry_id, mwe in enumerate(mwes):
+            mwe = tuple(mwe)
+            if not mwe:
+                continue
+            node = self._trie
+            for word in mwe:
+                child = node.get(word)
+                if child is None:
+                    child = node[word] = {}
+                node = child
+            node.setdefault(None, (len(mwe), entry_id))
+        stack = [(node, None) for node in self._trie.values()]
+        while stack:
+            node, match = stack.pop()
+            if None in node:
+                match = node[None]
+            elif match is not None:
+                node[None] = match
+            for word, child in node.items():
+                if word is not None:
+                    stack.append((child, match))
+
+    def _compile(self):
+        """
+        Number the states of the trie breadth-first, and set the arrays
+        that ``save()`` writes.
+        """
+        nodes = [self._trie]
+        words = set()
+        for node in nodes:
+            words.update(word for word in node if word is not None)
+            nodes.extend(child for word, child in node.items()
+                         if word is not None)
+        words = sorted(words)
+        word_ids = dict((word, i) for i, word in enumerate(words))
+        self._build_vocabulary(words)
+
+        label, depth, entry, match = [-1], [0], [-1], [-1]
+        first_child = []
+        nodes = [self._trie]
+        for state, node in enumerate(nodes):
+            first_child.append(len(label))
+            for word_id, child in sorted((word_ids[word], child)
+                                         for word, child in node.items()
+                                         if word is not None):
+                found = child.get(None)
+                own = found is not None and found[0] == depth[state] + 1
+                label.append(word_id)
+                depth.append(depth[state] + 1)
+                entry.append(found[1] if own else -1)
+                match.append(len(nodes) if own else match[state])
+                nodes.append(child)
+        first_child.append(len(label))
+        root_next = [0] * len(words)
+        for state in range(first_child[0], first_child[1]):
+            root_next[label[state]] = state
+
+        self._label = array('i', label)
+        self._first_child = array('i', first_child)
+        self._root_next = array('i', root_next)
+        self._depth = array('i', depth)
+        self._entry = array('i', entry)
+        self._match = array('i', match)
+
+    def _build_vocabulary(self, words):
+        encoded = [word.encode('utf8') for word in words]
+        offsets = [0]
+        for word in encoded:
+            offsets.append(offsets[-1] + len(word))
+        size = 8
+        while size < 2 * len(words):
+            size *= 2
+        slots = [-1] * size
+        for word_id, word in enumerate(encoded):
+            slot = crc32(word) & (size - 1)
+            while slots[slot] >= 0:
+                slot = (slot + 1) & (size - 1)
+            slots[slot] = word_id
+        self._word_offsets = array('i', offsets)
+        self._word_slots = array('i', slots)
+        self._words = b''.join(encoded)
+        self._words_start = 0
+
+    def _word_id(self, word):
+        """
+        Return the id of ``word``, or ``len(self._root_next)`` if it is
+        in no expression, using the hash table of the saved words.
+        """
+        word = word.encode('utf8')
+        slots = self._word_slots
+        mask = len(slots) - 1
+        slot = crc32(word) & mask
+        while True:
+            word_id = slots[slot]
+            if word_id < 0:
+                return len(self._root_next)
+            start = self._words_start + self._word_offsets[word_id]
+            end = self._words_start + self._word_offsets[word_id + 1]
+            if self._words[start:end] == word:
+                return word_id
+            slot = (slot + 1) & mask
+
+    def _child(self, key):
+        """
+        Return the child of a state on a word, or None if it has none,
+        using bisection over the arrays.  ``key`` is
+        ``state * (len(self._root_next) + 1) + word_id``.
+        """
+        state, word_id = divmod(key, len(self._root_next) + 1)
+        label = self._label
+        lo, hi = self._first_child[state], self._first_child[state + 1]
+        i = bisect_left(label, word_id, lo, hi)
+        if i < hi and label[i] == word_id:
+            return i
+        return None
+
+    def spans(self, tokens):
+        """
+        Return the leftmost-longest, non-overlapping matches in *tokens*
+        as ``(start, end, entry_id)`` tuples, where ``tokens[start:end]``
+        is the expression with id ``entry_id``.
+
+        :type tokens: list(str)
+        :rtype: list(tuple(int, int, int))
+        """
+        root = self._trie
+        if root is None:
+            return list(self._array_spans(tokens))
+        spans = []
+        n = len(tokens)
+        end = 0
+        for start, node in enumerate(map(root.get, tokens)):
+            if node is None or start < end:
+                continue
+            # Walk down the trie as far as the tokens allow; the longest
+            # expression starting here ends at or above that node.
+            i = start + 1
+            while i < n:
+                next_node = node.get(tokens[i])
+                if next_node is None:
+                    break
+                node = next_node
                 i += 1
+            match = node.get(None)
+            if match is not None:
+                end = start + match[0]
+                spans.append((start, end, match[1]))
+        return spans
 
-        return result
+    def _array_spans(self, tokens):
+        """``spans()``, walking the arrays of a loaded automaton."""
+        # Words in no expression get the id n_words, which has no state.
+        # Each distinct token is only looked up once.
+        n_words = len(self._root_next)
+        known = {}
+        word_ids = []
+        for token in tokens:
+            word_id = known.get(token)
+            if word_id is None:
+                word_id = known[token] = self._word_id(token)
+            word_ids.append(word_id)
+        word_ids.append(n_words)
+        root_next, child = self._root_next, self._child
+        depth, entry, match = self._depth, self._entry, self._match
+        end = 0
+        for start, word_id in enumerate(word_ids):
+            if word_id == n_words or start < end:
+                continue
+            state = root_next[word_id]
+            if not state:
+                continue
+            i = start + 1
+            while True:
+                next_state = child(state * (n_words + 1) + word_ids[i])
+                if next_state is None:
+                    break
+                state = next_state
+                i += 1
+            if match[state] >= 0:
+                end = start + depth[match[state]]
+                yield start, end, entry[match[state]]
+
+    def save(self, path):
+        """
+        Write the automaton to the file *path*, for ``load()``.
+        """
+        if self._trie is not None:
+            self._compile()
+        arrays = [getattr(self, name) for name in _MWE_ARRAYS]
+        with open(path, 'wb') as outfile:
+            outfile.write(_MWE_MAGIC)
+            header = array('i', [len(a) for a in arrays] + [len(self._words)])
+            for a in [header] + arrays:
+                if sys.byteorder == 'big':
+                    a = array('i', a)
+                    a.byteswap()
+                outfile.write(a.tostring() if sys.version_info[0] < 3
+                              else a.tobytes())
+            start = self._words_start
+            outfile.write(self._words[start:start + self._word_offsets[-1]])
+
+    @classmethod
+    def load(cls, path):
+        """
+        Return the automaton saved to the file *path* by ``save()``.  Its
+        arrays are memory-mapped where the platform supports it, and
+        read into memory otherwise.
+
+        :rtype: MWEAutomaton
+        """
+        with open(path, 'rb') as infile:
+            data = mmap.mmap(infile.fileno(), 0, access=mmap.ACCESS_READ)
+        if data[:len(_MWE_MAGIC)] != _MWE_MAGIC:
+            raise ValueError('%s is not a compiled MWE lexicon.' % path)
+
+        def read_array(pos, size):
+            if sys.byteorder == 'little' and hasattr(memoryview, 'cast'):
+                return memoryview(data)[pos:pos + 4 * size].cast('i')
+            result = array('i')
+            if sys.version_info[0] < 3:
+                result.fromstring(data[pos:pos + 4 * size])
+            else:
+                result.frombytes(data[pos:pos + 4 * size])
+            if sys.byteorder == 'big':
+                result.byteswap()
+            return result
+
+        pos = len(_MWE_MAGIC)
+        sizes = read_array(pos, len(_MWE_ARRAYS) + 1)
+        pos += 4 * len(sizes)
+        automaton = cls.__new__(cls)
+        automaton._trie = None
+        for name, size in zip(_MWE_ARRAYS, sizes):
+            setattr(automaton, name, read_array(pos, size))
+            pos += 4 * size
+        automaton._words = data
+        automaton._words_start = pos
+        return automaton
@@ -106,10 +106,13 @@ from __future__ import print_function, unicode_literals, division
 # FIXME: Problem with ending string with e.g. '!!!' -> '!! !'
 
 import re
+import json
 import math
+from bisect import bisect_left
 from collections import defaultdict
 
 from nltk.compat import unicode_repr, python_2_unicode_compatible, string_types
+from nltk.internals import process_imap, pool_shared
 from nltk.probability import FreqDist
 from nltk.tokenize.api import TokenizerI
 
@@ -300,6 +303,11 @@ numeric tokens are changed to ##number## and hence contain alpha.)"""
 #{ Helper Functions
 #////////////////////////////////////////////////////////////
 
+# Matches a token and the whole token after it: the most text that the
+# decision about a candidate sentence break at the end of the first token
+# can depend on.
+_COMPLETE_CONTEXT_RE = re.compile(r'\S*\s+\S+\s', re.UNICODE)
+
 def _pair_iter(it):
     """
     Yields pairs of tokens from the given iterator such that each input
@@ -313,6 +321,37 @@ def _pair_iter(it):
         prev = el
     yield (prev, None)
 
+def _iter_chunks(stream, chunk_size=65536):
+    """
+    Yields the chunks of text in ``stream``, which may be a string, a
+    file-like object, or an iterable of strings.
+    """
+    if isinstance(stream, string_types):
+        yield stream
+    elif hasattr(stream, 'read'):
+        while True:
+            chunk = stream.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+    else:
+        for chunk in stream:
+            yield chunk
+
+class _StreamText(object):
+    """
+    The text of a stream that is being segmented, of which only the part
+    that starts at the absolute character offset ``start`` is kept in
+    ``text``.  It is sliced by absolute offsets, like the whole text.
+    """
+    def __init__(self):
+        self.text = ''
+        self.start = 0
+
+    def __getitem__(self, sl):
+        assert sl.start >= self.start
+        return self.text[sl.start - self.start:sl.stop - self.start]
+
 ######################################################################
 #{ Punkt Parameters
 ######################################################################
@@ -370,6 +409,101 @@ class PunktParameters(object):
         if c & _ORTHO_UNK_LC:
             yield 'UNK-LC'
 
+######################################################################
+#{ Punkt Shard Statistics
+######################################################################
+
+class PunktShardStatistics(object):
+    """
+    Stores the statistics that ``PunktTrainer`` collects from a shard of
+    its training text, so that shards can be processed separately, even
+    on different machines, and their statistics merged.  The statistics
+    of a shard are collected in two passes: ``PunktTrainer.count_types()``
+    counts its word types, and, once the merged counts of every shard
+    have been added to the trainer with ``PunktTrainer.add_type_counts()``,
+    ``PunktTrainer.collect_statistics()`` collects the rest, which are in
+    turn merged and added with ``PunktTrainer.add_statistics()``.
+    """
+
+    def __init__(self):
+        self.type_fdist = FreqDist()
+        """The frequency of each case-normalized token type."""
+
+        self.num_period_toks = 0
+        """The number of words ending in period."""
+
+        self.ortho_context = defaultdict(int)
+        """The orthographic contexts of each word type."""
+
+        self.sentbreak_count = 0
+        """The number of sentence breaks."""
+
+        self.sent_starter_fdist = FreqDist()
+        """The frequency of each potential sentence starter."""
+
+        self.collocation_fdist = FreqDist()
+        """The frequency of each potential collocation."""
+
+        self.rare_abbrevs = set()
+        """The candidate rare abbreviations, as (type, type of the next
+        word) pairs, where the type of the next word is None if it is an
+        internal punctuation mark."""
+
+    def merge(self, other):
+        """
+        Add the statistics of *other* to these, and return them.
+
+        :type other: PunktShardStatistics
+        :rtype: PunktShardStatistics
+        """
+        self.type_fdist.update(other.type_fdist)
+        self.num_period_toks += other.num_period_toks
+        for typ, flag in other.ortho_context.items():
+            self.ortho_context[typ] |= flag
+        self.sentbreak_count += other.sentbreak_count
+        self.sent_starter_fdist.update(other.sent_starter_fdist)
+        self.collocation_fdist.update(other.collocation_fdist)
+        self.rare_abbrevs.update(other.rare_abbrevs)
+        return self
+
+    def to_json(self):
+        """
+        Return these statistics as a JSON string, which ``from_json()``
+        reads back.
+        """
+        return json.dumps({
+            'type_fdist': self.type_fdist,
+            'num_period_toks': self.num_period_toks,
+            'ortho_context': self.ortho_context,
+            'sentbreak_count': self.sentbreak_count,
+            'sent_starter_fdist': self.sent_starter_fdist,
+            'collocation_fdist': [[typ1, typ2, count] for (typ1, typ2), count
+                                  in self.collocation_fdist.items()],
+            'rare_abbrevs': sorted(self.rare_abbrevs,
+                                   key=lambda pair: (pair[0], pair[1] or '')),
+        }, sort_keys=True)
+
+    @classmethod
+    def from_json(cls, text):
+        """
+        Return the statistics in the JSON string *text*, written by
+        ``to_json()``.
+
+        :rtype: PunktShardStatistics
+        """
+        data = json.loads(text)
+        stats = cls()
+        stats.type_fdist.update(data['type_fdist'])
+        stats.num_period_toks = data['num_period_toks']
+        stats.ortho_context.update(data['ortho_context'])
+        stats.sentbreak_count = data['sentbreak_count']
+        stats.sent_starter_fdist.update(data['sent_starter_fdist'])
+        for typ1, typ2, count in data['collocation_fdist']:
+            stats.collocation_fdist[(typ1, typ2)] = count
+        stats.rare_abbrevs.update((typ, next_typ) for typ, next_typ
+                                  in data['rare_abbrevs'])
+        return stats
+
 ######################################################################
 #{ PunktToken
 ######################################################################
@@ -737,20 +871,7 @@ class PunktTrainer(PunktBaseClass):
                 self._num_period_toks += 1
 
         # Look for new abbreviations, and for types that no longer are
-        unique_types = self._unique_types(tokens)
-        for abbr, score, is_add in self._reclassify_abbrev_types(unique_types):
-            if score >= self.ABBREV:
-                if is_add:
-                    self._params.abbrev_types.add(abbr)
-                    if verbose:
-                        print(('  Abbreviation: [%6.4f] %s' %
-                               (score, abbr)))
-            else:
-                if not is_add:
-                    self._params.abbrev_types.remove(abbr)
-                    if verbose:
-                        print(('  Removed abbreviation: [%6.4f] %s' %
-                               (score, abbr)))
+        self._update_abbrev_types(self._unique_types(tokens), verbose)
 
         # Make a preliminary pass through the document, marking likely
         # sentence breaks, abbreviations, and ellipsis tokens.
@@ -784,6 +905,201 @@ class PunktTrainer(PunktBaseClass):
                 self._collocation_fdist[
                     (aug_tok1.type_no_period, aug_tok2.type_no_sentperiod)] += 1
 
+    def _update_abbrev_types(self, unique_types, verbose):
+        """
+        Adds the abbreviations among ``unique_types``, and removes the
+        types among them that are no longer abbreviations.
+        """
+        for abbr, score, is_add in self._reclassify_abbrev_types(unique_types):
+            if score >= self.ABBREV:
+                if is_add:
+                    self._params.abbrev_types.add(abbr)
+                    if verbose:
+                        print(('  Abbreviation: [%6.4f] %s' %
+                               (score, abbr)))
+            else:
+                if not is_add:
+                    self._params.abbrev_types.remove(abbr)
+                    if verbose:
+                        print(('  Removed abbreviation: [%6.4f] %s' %
+                               (score, abbr)))
+
+    def train_parallel(self, shards, workers=None, verbose=False,
+                       finalize=True, encoding='utf8'):
+        """
+        Collects training data from a text given as a sequence of
+        consecutive shards, in a pool of worker processes.  The resulting
+        parameters are identical to those of ``train()`` on the
+        concatenation of the shards.
+
+        Each shard is a string; a ``PathPointer``, or another picklable
+        object whose ``open(encoding)`` method returns a stream of its
+        text; or a picklable, re-iterable source of lines that keep their
+        line breaks.  Each shard is sent to a worker and read there, once
+        in each of the two passes described by ``PunktShardStatistics``,
+        so a training text given as files need not fit in the memory of
+        this process, nor be copied between processes (see also
+        ``train_files()``).  A shard may end in the middle of a line; the
+        parts of a line split between shards are joined here, so that the
+        tokens and their contexts are the same as in the concatenated
+        text.
+
+        :param shards: The consecutive parts of the training text.
+        :type shards: list(str or PathPointer or iter(str))
+        :param workers: The number of worker processes.  Defaults to the
+            number of CPUs.
+        :param encoding: The encoding used to open the shards that are
+            not strings or sequences of lines.
+        """
+        shards = list(shards)
+
+        # Count the word types of the lines in each shard, and collect
+        # the lines that are split between shards.
+        type_counts = PunktShardStatistics()
+        tasks = []
+        joint = context = ''
+        results = process_imap(_shard_type_counts,
+                               ((shard, encoding) for shard in shards),
+                               workers, self)
+        for shard, (line_counts, head, tail, last_line) in zip(shards,
+                                                               results):
+            joint += head
+            if line_counts is None:
+                # The shard is part of a line.
+                continue
+            type_counts.merge(self.count_types(joint)).merge(line_counts)
+            tasks.append((shard, context, joint, encoding))
+            context = _last_line(context + joint + last_line)
+            joint = tail
+        if joint or not tasks:
+            type_counts.merge(self.count_types(joint))
+            tasks.append((None, context, joint, encoding))
+        self.add_type_counts(type_counts, verbose)
+
+        # Collect the statistics that depend on the abbreviations.
+        stats = PunktShardStatistics()
+        for shard_stats in process_imap(_shard_statistics, tasks, workers,
+                                        self, ordered=False):
+            stats.merge(shard_stats)
+        self.add_statistics(stats, verbose)
+
+        if finalize:
+            self.finalize_training(verbose)
+
+    def train_files(self, paths, workers=None, verbose=False, finalize=True,
+                    encoding='utf8'):
+        """
+        Collects training data from the concatenation of the files with
+        the given paths, with ``train_parallel()``.
+        """
+        from nltk.data import FileSystemPathPointer
+        self.train_parallel([FileSystemPathPointer(path) for path in paths],
+                            workers, verbose, finalize, encoding)
+
+    def count_types(self, text):
+        """
+        Returns the statistics of the first training pass over ``text``,
+        a shard of the training text that starts at the start of a line:
+        the frequency of each word type, and the number of words that end
+        in periods.
+
+        :rtype: PunktShardStatistics
+        """
+        stats = PunktShardStatistics()
+        for aug_tok in self._tokenize_words(text):
+            stats.type_fdist[aug_tok.type] += 1
+            if aug_tok.period_final:
+                stats.num_period_toks += 1
+        return stats
+
+    def add_type_counts(self, stats, verbose=False):
+        """
+        Adds the type counts of ``stats``, merged from ``count_types()``
+        of every shard of the training text, and finds the abbreviations
+        among the types.
+        """
+        self._finalized = False
+        self._type_fdist.update(stats.type_fdist)
+        self._num_period_toks += stats.num_period_toks
+        self._update_abbrev_types(set(stats.type_fdist), verbose)
+
+    def collect_statistics(self, text, context=''):
+        """
+        Returns the statistics of the second training pass, which needs
+        the abbreviations found by ``add_type_counts()``, over ``text``,
+        a shard of the training text that starts at the start of a line.
+        ``context`` is the text that precedes the shard, from the start
+        of its last line that is not blank.
+
+        :rtype: PunktShardStatistics
+        """
+        tokens = list(self._annotate_first_pass(
+            self._tokenize_words(context + text)))
+        num_context_toks = len(list(self._tokenize_words(context)))
+        stats = PunktShardStatistics()
+
+        flags = self._orthography_flags(tokens)
+        for i, (typ, flag) in enumerate(flags):
+            if flag and i >= num_context_toks:
+                stats.ortho_context[typ] |= flag
+
+        stats.sentbreak_count = self._get_sentbreak_count(
+            tokens[num_context_toks:])
+
+        pairs = _pair_iter(tokens[max(num_context_toks - 1, 0):])
+        for aug_tok1, aug_tok2 in pairs:
+            if not aug_tok1.period_final or not aug_tok2:
+                continue
+
+            # Is the first token a candidate rare abbreviation?
+            if not aug_tok1.abbr and aug_tok1.sentbreak:
+                typ = aug_tok1.type_no_sentperiod
+                if aug_tok2.tok[:1] in self._lang_vars.internal_punctuation:
+                    stats.rare_abbrevs.add((typ, None))
+                elif aug_tok2.first_lower:
+                    stats.rare_abbrevs.add((typ, aug_tok2.type_no_sentperiod))
+
+            if self._is_potential_sent_starter(aug_tok2, aug_tok1):
+                stats.sent_starter_fdist[aug_tok2.type] += 1
+
+            if self._is_potential_collocation(aug_tok1, aug_tok2):
+                stats.collocation_fdist[
+                    (aug_tok1.type_no_period, aug_tok2.type_no_sentperiod)] += 1
+
+        return stats
+
+    def add_statistics(self, stats, verbose=False):
+        """
+        Adds the statistics of ``stats``, merged from
+        ``collect_statistics()`` of every shard of the training text, and
+        finds the rare abbreviations.  The training is finalized by
+        ``get_params()`` or ``finalize_training()``.
+        """
+        self._finalized = False
+        for typ, flag in stats.ortho_context.items():
+            self._params.add_ortho_context(typ, flag)
+        self._sentbreak_count += stats.sentbreak_count
+        self._sent_starter_fdist.update(stats.sent_starter_fdist)
+        self._collocation_fdist.update(stats.collocation_fdist)
+
+        # Decide which candidates are rare abbreviations, now that their
+        # counts and the orthographic contexts of the following words are
+        # known (see _is_rare_abbrev_type()).
+        for typ, next_typ in sorted(stats.rare_abbrevs,
+                                    key=lambda pair: (pair[0], pair[1] or '')):
+            count = self._type_fdist[typ] + self._type_fdist[typ[:-1]]
+            if (typ in self._params.abbrev_types or
+                    count >= self.ABBREV_BACKOFF):
+                continue
+            if next_typ is not None:
+                next_ortho_context = self._params.ortho_context[next_typ]
+                if (not (next_ortho_context & _ORTHO_BEG_UC) or
+                        next_ortho_context & _ORTHO_MID_UC):
+                    continue
+            self._params.abbrev_types.add(typ)
+            if verbose:
+                print(('  Rare Abbrev: %s' % typ))
+
     def _unique_types(self, tokens):
         return set(aug_tok.type for aug_tok in tokens)
 
@@ -862,6 +1178,15 @@ class PunktTrainer(PunktBaseClass):
         sentence-initial positions, and (iii) at sentence-internal
         positions.
         """
+        for typ, flag in self._orthography_flags(tokens):
+            if flag:
+                self._params.add_ortho_context(typ, flag)
+
+    def _orthography_flags(self, tokens):
+        """
+        Generates the case-normalized type of each token, and the
+        orthographic context flag that it contributes (or 0).
+        """
         # 'initial' or 'internal' or 'unknown'
         context = 'internal'
         tokens = list(tokens)
@@ -884,9 +1209,7 @@ class PunktTrainer(PunktBaseClass):
             typ = aug_tok.type_no_sentperiod
 
             # Update the orthographic context table.
-            flag = _ORTHO_MAP.get((context, aug_tok.first_case), 0)
-            if flag:
-                self._params.add_ortho_context(typ, flag)
+            yield typ, _ORTHO_MAP.get((context, aug_tok.first_case), 0)
 
             # Decide whether the next word is at a sentence boundary.
             if aug_tok.sentbreak:
@@ -1067,8 +1390,6 @@ class PunktTrainer(PunktBaseClass):
         except ZeroDivisionError as e:
             p2 = 1
 
-        print (p, p1, p2, N, count_a, count_b, count_ab)
-
         try:
             summand1 = (count_ab * math.log(p) +
                         (count_a - count_ab) * math.log(1.0 - p))
@@ -1190,6 +1511,66 @@ class PunktTrainer(PunktBaseClass):
         return sum(1 for aug_tok in tokens if aug_tok.sentbreak)
 
 
+#////////////////////////////////////////////////////////////
+#{ Parallel training
+#////////////////////////////////////////////////////////////
+
+def _read_shard(shard, encoding):
+    """
+    Returns the text of a shard given to ``train_parallel()``.
+    """
+    if hasattr(shard, 'open'):
+        stream = shard.open(encoding)
+        try:
+            return stream.read()
+        finally:
+            stream.close()
+    if isinstance(shard, string_types):
+        return shard
+    return ''.join(shard)
+
+def _shard_type_counts(shard_and_encoding):
+    """
+    Returns the type counts of the lines that start in a shard, the text
+    before and after them, and the last line of them that is not blank
+    (see ``_last_line()``); or None and the whole text if the shard has
+    no line break.
+    """
+    text = _read_shard(*shard_and_encoding)
+    start = text.find('\n') + 1
+    if not start:
+        return None, text, '', ''
+    end = text.rfind('\n') + 1
+    lines = text[start:end]
+    return (pool_shared().count_types(lines), text[:start], text[end:],
+            _last_line(lines))
+
+def _shard_statistics(task):
+    """
+    Returns the statistics of the lines that start in a shard, preceded
+    by the ``joint`` text of the line split between it and the shards
+    before it.
+    """
+    shard, context, joint, encoding = task
+    lines = ''
+    if shard is not None:
+        text = _read_shard(shard, encoding)
+        lines = text[text.find('\n') + 1:text.rfind('\n') + 1]
+    return pool_shared().collect_statistics(joint + lines, context)
+
+def _last_line(text):
+    """
+    Returns the last line of ``text`` that is not blank, followed by
+    the rest of the text; or all of ``text`` if it is blank.
+    """
+    if not text.strip():
+        return text
+    lines = text.split('\n')
+    i = len(lines) - 1
+    while not lines[i].strip():
+        i -= 1
+    return '\n'.join(lines[i:])
+
 ######################################################################
 #{ Punkt Sentence Tokenizer
 ######################################################################
@@ -1284,6 +1665,78 @@ class PunktSentenceTokenizer(PunktBaseClass,TokenizerI):
         """
         return [text[s:e] for s, e in self.span_tokenize(text, realign_boundaries)]
 
+    def span_tokenize_stream(self, stream, realign_boundaries=True):
+        """
+        Given a stream of text, generates the (start, end) spans of the
+        sentences in it.  The stream may be a string, a file-like object,
+        or an iterable of strings (such as the lines of a file), and the
+        spans are character offsets in the concatenation of its chunks.
+        The spans are the same as those that ``span_tokenize()`` returns
+        for the whole text, but only the current sentence and the one
+        before it are held in memory.
+        """
+        text = _StreamText()
+        slices = self._slices_from_stream(stream, text)
+        if realign_boundaries:
+            slices = self._realign_boundaries(text, slices)
+        for sl in slices:
+            yield (sl.start, sl.stop)
+
+    def tokenize_stream(self, stream, realign_boundaries=True):
+        """
+        Given a stream of text, generates the sentences in it.  See
+        ``span_tokenize_stream()`` for the kinds of stream accepted.
+        """
+        text = _StreamText()
+        slices = self._slices_from_stream(stream, text)
+        if realign_boundaries:
+            slices = self._realign_boundaries(text, slices)
+        for sl in slices:
+            yield text[sl]
+
+    def _slices_from_stream(self, stream, text):
+        """
+        Generates the same slices as ``_slices_from_text()`` for the
+        concatenated chunks of ``stream``, buffering them in the
+        ``_StreamText`` ``text``.  A candidate sentence break is only
+        decided once the text that its decision depends on (the rest of
+        its token, and the following token) has been read, so that the
+        decision is the same as for the whole text.  The text is kept
+        from the start of the slice before the last one yielded, for
+        ``_realign_boundaries()``.
+        """
+        period_context_re = self._lang_vars.period_context_re()
+        last_break = scan = keep = 0
+        chunks = _iter_chunks(stream)
+        eof = False
+        while not eof:
+            chunk = next(chunks, None)
+            if chunk is None:
+                eof = True
+                chunk = ''
+            keep = min(keep, scan)
+            text.text = text.text[keep - text.start:] + chunk
+            text.start = keep
+
+            for match in period_context_re.finditer(text.text,
+                                                    scan - text.start):
+                if not eof and not _COMPLETE_CONTEXT_RE.match(text.text,
+                                                              match.start()):
+                    break
+                scan = text.start + match.end()
+                context = match.group() + match.group('after_tok')
+                if self.text_contains_sentbreak(context):
+                    yield slice(last_break, scan)
+                    keep = last_break
+                    if match.group('next_tok'):
+                        # next sentence starts after whitespace
+                        last_break = text.start + match.start('next_tok')
+                    else:
+                        # next sentence starts at following punctuation
+                        last_break = scan
+        # The last sentence should not contain trailing whitespace.
+        yield slice(last_break, text.start + len(text.text.rstrip()))
+
     def _slices_from_text(self, text):
         last_break = 0
         for match in self._lang_vars.period_context_re().finditer(text):
@@ -1586,6 +2039,151 @@ class PunktSentenceTokenizer(PunktBaseClass,TokenizerI):
         return 'unknown'
 
 
+######################################################################
+#{ Punkt Model Format
+######################################################################
+
+# A Punkt model is saved as UTF-8 text: a header line, then a section for
+# each set of parameters, introduced by a line holding its name and the
+# number of lines that follow.  Each section is sorted, and collocations
+# are tab-separated pairs.  The ortho_context section lists the types,
+# followed by a line with the flags of each type as two hex digits.  Word
+# types never contain whitespace, so loading is little more than a split
+# of the file into lines; the ortho_context, by far the largest section,
+# is then searched by bisection rather than hashed into a dict.
+_PUNKT_FORMAT = 'NLTK-PUNKT'
+_PUNKT_FORMAT_VERSION = 1
+
+def save_punkt(tokenizer, stream):
+    """
+    Write the parameters of a Punkt model to the binary *stream*, in a
+    format that ``load_punkt()`` reads far faster than unpickling, and
+    without running any code from the file.
+
+    :param tokenizer: The model to save.
+    :type tokenizer: PunktSentenceTokenizer or PunktParameters
+    :raise ValueError: If the tokenizer uses custom language variables
+        or token class, which this format does not record.
+    """
+    params = tokenizer
+    if isinstance(tokenizer, PunktSentenceTokenizer):
+        if (type(tokenizer._lang_vars) is not PunktLanguageVars or
+                tokenizer._Token is not PunktToken):
+            raise ValueError('The Punkt model format does not support '
+                             'custom language variables or token classes.')
+        params = tokenizer._params
+
+    ortho_context = sorted((typ, flags) for typ, flags
+                           in params.ortho_context.items() if flags)
+    sections = [('abbrev_types', sorted(params.abbrev_types)),
+                ('collocations', sorted('\t'.join(pair)
+                                        for pair in params.collocations)),
+                ('sent_starters', sorted(params.sent_starters)),
+                ('ortho_context', [typ for typ, flags in ortho_context])]
+
+    lines = ['%s %d' % (_PUNKT_FORMAT, _PUNKT_FORMAT_VERSION)]
+    for name, section in sections:
+        lines.append('%s %d' % (name, len(section)))
+        lines.extend(section)
+    lines.append(''.join('%02x' % flags for typ, flags in ortho_context))
+    stream.write(('\n'.join(lines) + '\n').encode('utf-8'))
+
+def load_punkt(stream, lang_vars=None, token_cls=PunktToken):
+    """
+    Read a Punkt model written by ``save_punkt()`` from the binary
+    *stream*, and return a sentence tokenizer that uses it.
+
+    :rtype: PunktSentenceTokenizer
+    :raise ValueError: If *stream* does not hold a Punkt model of a
+        supported version.
+    """
+    lines = stream.read().decode('utf-8').split('\n')
+    header = lines[0].split(' ')
+    if header[0] != _PUNKT_FORMAT or len(header) != 2:
+        raise ValueError('Not a Punkt model.')
+    if int(header[1]) > _PUNKT_FORMAT_VERSION:
+        raise ValueError('Unsupported Punkt model version: %s' % header[1])
+
+    params = PunktParameters()
+    i = 1
+    while lines[i]:
+        name, _, size = lines[i].rpartition(' ')
+        start, i = i + 1, i + 1 + int(size)
+        section = lines[start:i]
+        if name == 'abbrev_types':
+            params.abbrev_types = set(section)
+        elif name == 'collocations':
+            params.collocations = set(tuple(pair.split('\t'))
+                                      for pair in section)
+        elif name == 'sent_starters':
+            params.sent_starters = set(section)
+        elif name == 'ortho_context':
+            params.ortho_context = _SortedOrthoContext(section, lines[i])
+            i += 1
+        else:
+            raise ValueError('Unknown Punkt model section: %s' % name)
+
+    if lang_vars is None:
+        lang_vars = PunktLanguageVars()
+    return PunktSentenceTokenizer(params, lang_vars=lang_vars,
+                                  token_cls=token_cls)
+
+class _SortedOrthoContext(object):
+    """
+    The read-only ``ortho_context`` of a loaded Punkt model: a sorted list
+    of types, and a string with the flags of each as two hex digits.
+    Like the ``defaultdict`` it stands for, it maps unknown types to 0.
+    """
+    __slots__ = ('_types', '_flags')
+
+    def __init__(self, types, flags):
+        self._types = types
+        self._flags = flags
+
+    def __getitem__(self, typ):
+        i = bisect_left(self._types, typ)
+        if i < len(self._types) and self._types[i] == typ:
+            return int(self._flags[2*i:2*i+2], 16)
+        return 0
+
+    def get(self, typ, default=None):
+        return self[typ] if typ in self else default
+
+    def __contains__(self, typ):
+        i = bisect_left(self._types, typ)
+        return i < len(self._types) and self._types[i] == typ
+
+    def __len__(self):
+        return len(self._types)
+
+    def __iter__(self):
+        return iter(self._types)
+
+    def items(self):
+        return ((typ, int(self._flags[2*i:2*i+2], 16))
+                for i, typ in enumerate(self._types))
+
+def convert_punkt_pickle(pickle_path, punkt_path=None):
+    """
+    Convert a pickled Punkt model, such as those of the NLTK data
+    package, to the format of ``save_punkt()``.  Only convert pickles
+    from a trusted source: unpickling can run arbitrary code.
+
+    :param pickle_path: The path of the pickled ``PunktSentenceTokenizer``.
+    :param punkt_path: The path to write to; by default, *pickle_path*
+        with its extension replaced by ``.punkt``.
+    :return: The path written to.
+    """
+    import pickle
+    with open(pickle_path, 'rb') as stream:
+        tokenizer = pickle.load(stream)
+    if punkt_path is None:
+        punkt_path = re.sub(r'(\.pickle)?$', '.punkt', pickle_path, count=1)
+    with open(punkt_path, 'wb') as stream:
+        save_punkt(tokenizer, stream)
+    return punkt_path
+
+
 DEBUG_DECISION_FMT = '''Text: %(text)r (at offset %(period_index)d)
 Sentence break? %(break_decision)s (%(reason)s)
 Collocation? %(collocation)s
@@ -52,6 +52,11 @@ class TextTilingTokenizer(TokenizerI):
     :param cutoff_policy: The policy used to determine the number of boundaries:
       `HC` (default) or `LC`
     :type cutoff_policy: constant
+    :param vectorized: If true, compute the block comparison scores from a
+      sparse term-by-pseudosentence count matrix, and the depth scores with
+      array operations, instead of looping over the token table; this
+      requires scipy, and is much faster on long texts.
+    :type vectorized: bool
 
     >>> from nltk.corpus import brown
     >>> tt = TextTilingTokenizer(demo_mode=True)
@@ -72,7 +77,8 @@ class TextTilingTokenizer(TokenizerI):
                  smoothing_width=2,
                  smoothing_rounds=1,
                  cutoff_policy=HC,
-                 demo_mode=False):
+                 demo_mode=False,
+                 vectorized=False):
 
 
         if stopwords is None:
@@ -92,8 +98,7 @@ class TextTilingTokenizer(TokenizerI):
         # Tokenization step starts here
 
         # Remove punctuation
-        nopunct_text = ''.join(c for c in lowercase_text
-                               if re.match("[a-z\-\' \n\t]", c))
+        nopunct_text = re.sub("[^a-z\-\' \n\t]", '', lowercase_text)
         nopunct_par_breaks = self._mark_paragraph_breaks(nopunct_text)
 
         tokseqs = self._divide_to_tokensequences(nopunct_text)
@@ -106,16 +111,26 @@ class TextTilingTokenizer(TokenizerI):
         #words = _stem_words(words)
 
         # Filter stopwords
+        stopwords = set(self.stopwords)
         for ts in tokseqs:
             ts.wrdindex_list = [wi for wi in ts.wrdindex_list
-                                if wi[0] not in self.stopwords]
+                                if wi[0] not in stopwords]
 
-        token_table = self._create_token_table(tokseqs, nopunct_par_breaks)
+        if self.vectorized:
+            if len(nopunct_par_breaks) < 2:
+                raise ValueError(
+                    "No paragraph breaks were found(text too short perhaps?)"
+                    )
+        else:
+            token_table = self._create_token_table(tokseqs, nopunct_par_breaks)
         # End of the Tokenization step
 
         # Lexical score determination
         if self.similarity_method == BLOCK_COMPARISON:
-            gap_scores = self._block_comparison(tokseqs, token_table)
+            if self.vectorized:
+                gap_scores = self._block_comparison_vectorized(tokseqs)
+            else:
+                gap_scores = self._block_comparison(tokseqs, token_table)
         elif self.similarity_method == VOCABULARY_INTRODUCTION:
             raise NotImplementedError("Vocabulary introduction not implemented")
 
@@ -124,7 +139,10 @@ class TextTilingTokenizer(TokenizerI):
         # End of Lexical score Determination
 
         # Boundary identification
-        depth_scores = self._depth_scores(smooth_scores)
+        if self.vectorized:
+            depth_scores = self._depth_scores_vectorized(smooth_scores)
+        else:
+            depth_scores = self._depth_scores(smooth_scores)
         segment_boundaries = self._identify_boundaries(depth_scores)
 
         normalized_boundaries = self._normalize_boundaries(text,
@@ -150,6 +168,53 @@ class TextTilingTokenizer(TokenizerI):
             return gap_scores, smooth_scores, depth_scores, segment_boundaries
         return segmented_text
 
+    def tokenize_stream(self, chunks, window=2000):
+        """Segment a text that arrives in pieces, such as the lines of a
+        file, yielding each topical section as soon as it is found.
+
+        The text is buffered until it has at least *window* words, and
+        the buffer is segmented with ``tokenize()``; all its sections but
+        the last are yielded, and the last is kept to be continued by the
+        following text.  Since the boundaries are chosen by the depth
+        scores within each buffer, rather than within the whole text,
+        they may differ from those found by ``tokenize()``.
+
+        :param chunks: The pieces of the text, in order.
+        :type chunks: iter(str)
+        :param window: The number of words to buffer before segmenting.
+        :type window: int
+        :rtype: iter(str)
+        """
+        if self.demo_mode:
+            raise ValueError('tokenize_stream() does not support demo_mode')
+        buffer, buffered_words, needed_words = [], 0, window
+        for chunk in chunks:
+            buffer.append(chunk)
+            buffered_words += len(chunk.split())
+            if buffered_words < needed_words:
+                continue
+            # Segment again only after another window of words, so that
+            # a long last section is not segmented at every chunk.
+            text = ''.join(buffer)
+            try:
+                sections = self.tokenize(text)
+            except ValueError:
+                # No paragraph breaks yet.
+                sections = [text]
+            for section in sections[:-1]:
+                yield section
+            buffer = [sections[-1]]
+            buffered_words = len(sections[-1].split())
+            needed_words = buffered_words + window
+        text = ''.join(buffer)
+        if text:
+            try:
+                sections = self.tokenize(text)
+            except ValueError:
+                sections = [text]
+            for section in sections:
+                yield section
+
     def _block_comparison(self, tokseqs, token_table):
         "Implements the block comparison method"
         def blk_frq(tok, block):
@@ -191,6 +256,53 @@ class TextTilingTokenizer(TokenizerI):
 
         return gap_scores
 
+    def _block_comparison_vectorized(self, tokseqs):
+        """Implements the block comparison method with sparse matrices:
+        the term frequencies of the blocks on either side of every gap
+        are the products of band matrices, which select the blocks'
+        pseudosentences, with the term-by-pseudosentence count matrix."""
+        from scipy.sparse import csr_matrix
+
+        vocabulary = {}
+        rows, columns = [], []
+        for i, ts in enumerate(tokseqs):
+            for word, index in ts.wrdindex_list:
+                rows.append(i)
+                columns.append(vocabulary.setdefault(word, len(vocabulary)))
+        counts = csr_matrix((numpy.ones(len(rows)), (rows, columns)),
+                            shape=(len(tokseqs), len(vocabulary)))
+
+        #adjust window size for boundary conditions
+        numgaps = len(tokseqs) - 1
+        if numgaps < 1:
+            return []
+        gaps = numpy.arange(numgaps)
+        window_size = numpy.where(gaps < self.k - 1, gaps + 1,
+                                  numpy.where(gaps > numgaps - self.k,
+                                              numgaps - gaps, self.k))
+
+        def block_counts(starts, sizes):
+            offsets = numpy.cumsum(sizes) - sizes
+            gap_of = numpy.repeat(gaps, sizes)
+            columns = (numpy.repeat(starts - offsets, sizes) +
+                       numpy.arange(sizes.sum()))
+            blocks = csr_matrix((numpy.ones(len(columns)), (gap_of, columns)),
+                                shape=(numgaps, len(tokseqs)))
+            return blocks.dot(counts)
+
+        b1 = block_counts(gaps - window_size + 1, window_size)
+        b2 = block_counts(gaps + 1, numpy.minimum(window_size, numgaps - gaps))
+
+        def row_sums(matrix):
+            return numpy.asarray(matrix.sum(axis=1)).ravel()
+        score_dividend = row_sums(b1.multiply(b2))
+        score_divisor = row_sums(b1.multiply(b1)) * row_sums(b2.multiply(b2))
+        scores = numpy.zeros(numgaps)
+        nonzero = score_divisor != 0
+        scores[nonzero] = (score_dividend[nonzero] /
+                           numpy.sqrt(score_divisor[nonzero]))
+        return list(scores)
+
     def _smooth_scores(self, gap_scores):
         "Wraps the smooth function from the SciPy Cookbook"
         return list(smooth(numpy.array(gap_scores[:]),
@@ -295,12 +407,11 @@ class TextTilingTokenizer(TokenizerI):
         depth_tuples.reverse()
         hp = list(filter(lambda x:x[0]>cutoff, depth_tuples))
 
-        for dt in hp:
-            boundaries[dt[1]] = 1
-            for dt2 in hp: #undo if there is a boundary close already
-                if dt[1] != dt2[1] and abs(dt2[1]-dt[1]) < 4 \
-                       and boundaries[dt2[1]] == 1:
-                    boundaries[dt[1]] = 0
+        for depth, gap in hp:
+            #skip if there is a boundary close already
+            nearby = boundaries[max(gap-3, 0):gap+4]
+            if not any(nearby):
+                boundaries[gap] = 1
         return boundaries
 
     def _depth_scores(self, scores):
@@ -312,7 +423,7 @@ class TextTilingTokenizer(TokenizerI):
         #that a section shouldn't be smaller than at least 2
         #pseudosentences for small texts and around 5 for larger ones.
 
-        clip = min(max(len(scores)/10, 2), 5)
+        clip = min(max(len(scores)//10, 2), 5)
         index = clip
 
         for gapscore in scores[clip:-clip]:
@@ -333,6 +444,30 @@ class TextTilingTokenizer(TokenizerI):
 
         return depth_scores
 
+    def _depth_scores_vectorized(self, scores):
+        """Calculates the depth scores like ``_depth_scores()``.  Climbing
+        left from a gap stops at the nearest gap whose score is greater
+        than that of its left neighbour, and climbing right at the nearest
+        gap whose score is greater than that of its right neighbour, so the
+        peaks of all gaps are found with running maximum and minimum
+        indices of those gaps."""
+        scores = numpy.asarray(scores, dtype=float)
+        depth_scores = numpy.zeros(len(scores))
+        if len(scores) == 0:
+            return list(depth_scores)
+        positions = numpy.arange(len(scores))
+        left_stops = numpy.r_[True, scores[:-1] < scores[1:]]
+        lpeaks = scores[numpy.maximum.accumulate(
+            numpy.where(left_stops, positions, 0))]
+        right_stops = numpy.r_[scores[1:] < scores[:-1], True]
+        rpeaks = scores[numpy.minimum.accumulate(
+            numpy.where(right_stops, positions, len(scores))[::-1])[::-1]]
+
+        clip = min(max(len(scores)//10, 2), 5)
+        inner = slice(clip, max(len(scores) - clip, clip))
+        depth_scores[inner] = (lpeaks + rpeaks - 2 * scores)[inner]
+        return list(depth_scores)
+
     def _normalize_boundaries(self, text, boundaries, paragraph_breaks):
         """Normalize the boundaries identified to the original text's
         paragraph breaks"""
@@ -94,25 +94,31 @@ class TreebankWordTokenizer(TokenizerI):
                      re.compile(r"(?i)\b(wha)(t)(cha)\b")]
 
     def tokenize(self, text):
+        # Each pass is skipped when the text holds none of the substrings
+        # its regular expression needs (see _GUARDS), which leaves most
+        # passes out on ordinary sentences without changing the output.
         for regexp, substitution in self.STARTING_QUOTES:
-            text = regexp.sub(substitution, text)
+            text = _guarded_sub(regexp, substitution, text)
 
         for regexp, substitution in self.PUNCTUATION:
-            text = regexp.sub(substitution, text)
+            text = _guarded_sub(regexp, substitution, text)
 
         for regexp, substitution in self.PARENS_BRACKETS:
-            text = regexp.sub(substitution, text)
+            text = _guarded_sub(regexp, substitution, text)
 
         #add extra space to make things easier
         text = " " + text + " "
 
         for regexp, substitution in self.ENDING_QUOTES:
-            text = regexp.sub(substitution, text)
+            text = _guarded_sub(regexp, substitution, text)
 
+        # The contractions only insert spaces, which cannot create a new
+        # occurrence of a guard, so one lower-cased copy serves them all.
+        lower = text.lower()
         for regexp in self.CONTRACTIONS2:
-            text = regexp.sub(r' \1 \2 ', text)
+            text = _guarded_sub(regexp, r' \1 \2 ', text, lower)
         for regexp in self.CONTRACTIONS3:
-            text = regexp.sub(r' \1 \2 ', text)
+            text = _guarded_sub(regexp, r' \1 \2 ', text, lower)
 
         # We are not using CONTRACTIONS4 since
         # they are also commented out in the SED scripts
@@ -121,4 +127,81 @@ class TreebankWordTokenizer(TokenizerI):
 
         return text.split()
 
+    def span_tokenize(self, text):
+        """
+        Return the offsets of the tokens of ``tokenize(text)`` in *text*.
+        Double quotes that were rewritten to ````` `` ````` or ``''`` are
+        given the span of the original quote characters.
+
+            >>> s = 'He said, "I can not."'
+            >>> list(TreebankWordTokenizer().span_tokenize(s))
+            [(0, 2), (3, 7), (7, 8), (9, 10), (10, 11), (12, 15), (16, 19), (19, 20), (20, 21)]
+
+        :rtype: iter(tuple(int, int))
+        """
+        return _align_tokens(self.tokenize(text), text)
+
+
+# The substrings of which the text must contain at least one for each of
+# the regular expressions of TreebankWordTokenizer to match, keyed by
+# pattern.  Those of the case-insensitive patterns are looked up in the
+# lower-cased text, and avoid the letters i, s and k, which also match
+# some non-ASCII characters when ignoring case.  Patterns without an
+# entry (e.g. those added by a subclass) are always applied.
+_GUARDS = {
+    r'^\"': ('"',),
+    r'(``)': ('``',),
+    r'([ (\[{<])"': ('"',),
+    r'([:,])([^\d])': (':', ','),
+    r'([:,])$': (':', ','),
+    r'\.\.\.': ('...',),
+    r'[;@#$%&]': (';', '@', '#', '$', '%', '&'),
+    r'([^\.])(\.)([\]\)}>"\']*)\s*$': ('.',),
+    r'[?!]': ('?', '!'),
+    r"([^'])' ": ("' ",),
+    r'[\]\[\(\)\{\}\<\>]': ('[', ']', '(', ')', '{', '}', '<', '>'),
+    r'--': ('--',),
+    r'"': ('"',),
+    r'(\S)(\'\')': ("''",),
+    r"([^' ])('[sS]|'[mM]|'[dD]|') ": ("'",),
+    r"([^' ])('ll|'LL|'re|'RE|'ve|'VE|n't|N'T) ": ("'",),
+    r"(?i)\b(can)(not)\b": ('cannot',),
+    r"(?i)\b(d)('ye)\b": ("d'ye",),
+    r"(?i)\b(gim)(me)\b": ('mme',),
+    r"(?i)\b(gon)(na)\b": ('gonna',),
+    r"(?i)\b(got)(ta)\b": ('gotta',),
+    r"(?i)\b(lem)(me)\b": ('lemme',),
+    r"(?i)\b(mor)('n)\b": ("mor'n",),
+    r"(?i)\b(wan)(na) ": ('wanna',),
+    r"(?i) ('t)(is)\b": ("'t",),
+    r"(?i) ('t)(was)\b": ("'t",),
+}
+
+def _guarded_sub(regexp, substitution, text, lower=None):
+    guards = _GUARDS.get(regexp.pattern)
+    if guards is not None:
+        haystack = text if lower is None else lower
+        if not any(guard in haystack for guard in guards):
+            return text
+    return regexp.sub(substitution, text)
+
+
+_QUOTES = re.compile(r'"|``|\'\'')
+
+def _align_tokens(tokens, text):
+    """
+    Return the spans of *tokens* in *text*, where *tokens* are the
+    tokens of a tokenizer that only inserts whitespace into *text*,
+    apart from rewriting double quotes to ````` `` ````` or ``''``.
 
+    :rtype: iter(tuple(int, int))
+    """
+    point = 0
+    for token in tokens:
+        if token in ('``', "''"):
+            match = _QUOTES.search(text, point)
+            start, point = match.span()
+        else:
+            start = text.index(token, point)
+            point = start + len(token)
+        yield start, point